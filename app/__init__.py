@@ -25,10 +25,33 @@ api = Api(
     security='Bearer Auth'
 )
 
+def _engine_options(config):
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    options.setdefault('pool_pre_ping', config['DB_POOL_PRE_PING'])
+
+    # SQLite (desenvolvimento) usa pools próprios que não aceitam estes parâmetros
+    if (config.get('SQLALCHEMY_DATABASE_URI') or '').startswith('sqlite'):
+        return options
+
+    options.setdefault('pool_size', config['DB_POOL_SIZE'])
+    options.setdefault('max_overflow', config['DB_MAX_OVERFLOW'])
+    options.setdefault('pool_timeout', config['DB_POOL_TIMEOUT'])
+    options.setdefault('pool_recycle', config['DB_POOL_RECYCLE'])
+    if config['DB_POOL_METRICS_ENABLED']:
+        from app.services.pool_metrics_service import InstrumentedQueuePool
+        options.setdefault('poolclass', InstrumentedQueuePool)
+    return options
+
 def create_app():
     app = Flask(__name__)
     app.config.from_object('app.config.Config')
     app.config['JWT_HEADER_TYPE'] = 'Bearer'
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = _engine_options(app.config)
+
+    from app.services.json_service import FastJSONProvider, output_json
+    api.representations['application/json'] = output_json
+    if app.config['JSON_FAST_ENCODER']:
+        app.json = FastJSONProvider(app)
 
     CORS(app, resources={r"/api/*": {"origins": "*"}}, supports_credentials=True)
 
@@ -36,13 +59,30 @@ def create_app():
     jwt.init_app(app)
     api.init_app(app)
 
+    from app.services.mail_queue_service import mail_queue
+    mail_queue.init_app(app)
+
+    from app.services.query_cache_service import query_cache
+    query_cache.init_app(app)
+
+    from app.cli import register_commands
+    register_commands(app)
+
     from app.controllers.ator_controller import ator_ns
     from app.controllers.auth_controller import auth_ns
+    from app.controllers.internal_controller import internal_ns
 
     api.add_namespace(ator_ns, path='/api/ator')
     api.add_namespace(auth_ns, path='/api/auth')
+    api.add_namespace(internal_ns, path='/api/internal')
 
     with app.app_context():
+        if app.config['DB_POOL_METRICS_ENABLED']:
+            from app.services.pool_metrics_service import pool_metrics
+            pool_metrics.attach(db.engine)
+
+        from app.services.query_guard_service import query_guard
+        query_guard.init_app(app, db.engine)
         db.create_all()
 
     return app
\ No newline at end of file
@@ -0,0 +1,102 @@
+import re
+import sys
+
+import click
+from sqlalchemy import event
+
+from app import db
+from app.models.ator_model import Ator
+from app.repositories.ator_repository import AtorRepository
+
+# Consultas seletivas do repositório que precisam usar índice. Listagens completas (iter_all_atores,
+# combos sem filtro, carga do índice de papéis) ficam de fora porque percorrem a tabela inteira por definição.
+EXPLAIN_CHECKS = (
+    ('get_atores_page', lambda repo: repo.get_atores_page(50, after=('A', 0))),
+    ('get_ator_by_cpf', lambda repo: repo.get_ator_by_cpf('00000000000')),
+    ('get_unique_conflicts', lambda repo: repo.get_unique_conflicts('x@x.com', 'x', '00000000000')),
+    ('count_alunos', lambda repo: repo.count_alunos()),
+    ('get_all_students_di', lambda repo: repo.get_all_students_di()),
+    ('get_all_psychologists', lambda repo: repo.get_all_psychologists()),
+    ('get_all_professors', lambda repo: repo.get_all_professors()),
+    ('get_all_actors_by_unidade', lambda repo: repo.get_all_actors_by_unidade(1)),
+    ('get_students_by_unidade', lambda repo: repo.get_students_by_unidade(1)),
+    ('get_filtered_actors', lambda repo: repo.get_filtered_actors(
+        [Ator.status != 2, Ator.unidade_id == 1, Ator.profissao_id == 1], page=1, size=50)),
+    ('count_filtered_actors', lambda repo: repo.count_filtered_actors(
+        [Ator.status != 2, Ator.unidade_id == 1, Ator.profissao_id == 1])),
+    ('get_complete_ator_data', lambda repo: repo.get_complete_ator_data(1)),
+    ('get_student_by_responsible', lambda repo: repo.get_student_by_responsible(1)),
+    ('get_sec_user_by_cod_ordenacao', lambda repo: repo.get_sec_user_by_cod_ordenacao(1)),
+    ('get_psychologists_by_city', lambda repo: repo.get_psychologists_by_city(['Maceió'])),
+)
+
+# Subconsultas materializadas (anon_N) não são tabelas e não contam como varredura
+_SQLITE_FULL_SCAN = re.compile(r'^SCAN (?!\(|anon_\d)(\w+)(?: AS \w+)?$')
+
+
+def _capture_statements(check):
+    # Retorna (statements, erro); uma verificação que falha não pode passar como OK
+    statements = []
+    error = None
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        check(AtorRepository())
+    except Exception as e:
+        error = e
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+        db.session.rollback()
+    return statements, error
+
+
+def _full_scans(connection, statement, parameters):
+    if connection.dialect.name == 'sqlite':
+        rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+        return [row[-1] for row in rows if _SQLITE_FULL_SCAN.match(row[-1])]
+
+    rows = connection.exec_driver_sql(f'EXPLAIN {statement}', parameters).mappings().all()
+    return [
+        f"{row['table']} (type=ALL)" for row in rows
+        if row.get('type') == 'ALL' and row.get('table') and not row['table'].startswith('<')
+    ]
+
+
+def explain_problems(name, check, connection):
+    # Varreduras completas e erros da verificação, no formato do explain-check; vazio quando todas as consultas usam índice
+    statements, error = _capture_statements(check)
+    if error is not None or not statements:
+        motivo = str(error).splitlines()[0] if error is not None else 'nenhuma consulta executada'
+        return [f'ERRO  {name}: {motivo}']
+
+    problems = []
+    for statement, parameters in statements:
+        try:
+            scans = _full_scans(connection, statement, parameters)
+        except Exception as e:
+            problems.append(f'ERRO  {name}: {str(e).splitlines()[0]}')
+            continue
+        if scans:
+            problems.append(f'SCAN  {name}: {", ".join(scans)}')
+    return problems
+
+
+def register_commands(app):
+    @app.cli.command('explain-check', help='Falha se alguma consulta principal do repositório fizer varredura completa de tabela.')
+    def explain_check():
+        failures = 0
+        with db.engine.connect() as connection:
+            for name, check in EXPLAIN_CHECKS:
+                problems = explain_problems(name, check, connection)
+                for problem in problems:
+                    click.echo(problem)
+                if not problems:
+                    click.echo(f'OK    {name}')
+                failures += len(problems)
+
+        if failures:
+            click.echo(f'{failures} consulta(s) com varredura completa ou erro no EXPLAIN.')
+            sys.exit(1)
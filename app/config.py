@@ -5,12 +5,56 @@ load_dotenv()
 class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # As listagens sem limite em streaming (/api/ator sem "limit", /grid, /grid-filtro e
+    # /filtro-caderno-atividades com legado=true, exportação) seguram uma conexão do pool durante todo
+    # o download: DB_POOL_SIZE + DB_MAX_OVERFLOW precisa cobrir esses downloads simultâneos mais as demais
+    # requisições, senão elas esperam até DB_POOL_TIMEOUT por uma conexão.
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    # Abaixo do wait_timeout do MySQL para não reaproveitar conexões derrubadas pelo servidor
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 280))
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'True').lower() == 'true'
+    DB_POOL_METRICS_ENABLED = os.environ.get('DB_POOL_METRICS_ENABLED', 'True').lower() == 'true'
+    # 0 desativa; em desenvolvimento/CI use um limite (ex.: 20) com STRICT para falhar requisições N+1
+    SQL_QUERY_BUDGET = int(os.environ.get('SQL_QUERY_BUDGET', 0))
+    SQL_QUERY_BUDGET_STRICT = os.environ.get('SQL_QUERY_BUDGET_STRICT', 'False').lower() == 'true'
+    # Serializa as respostas com orjson (ou json com separadores compactos, se não instalado) e dispensa
+    # o marshal nas rotas cujos dados já saem no formato do model
+    JSON_FAST_ENCODER = os.environ.get('JSON_FAST_ENCODER', 'False').lower() == 'true'
     SECRET_KEY = os.environ.get('SECRET_KEY')
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY')
+    JWT_EMBED_GRUPO_USUARIO = os.environ.get('JWT_EMBED_GRUPO_USUARIO', 'False').lower() == 'true'
+    AUTH_GROUP_CACHE_SIZE = int(os.environ.get('AUTH_GROUP_CACHE_SIZE', 1024))
+    AUTH_GROUP_CACHE_TTL = int(os.environ.get('AUTH_GROUP_CACHE_TTL', 60))
+    REFERENCE_DATA_TTL = int(os.environ.get('REFERENCE_DATA_TTL', 300))
+    MEMBERSHIP_INDEX_TTL = int(os.environ.get('MEMBERSHIP_INDEX_TTL', 300))
+    SEARCH_INDEX_TTL = int(os.environ.get('SEARCH_INDEX_TTL', 600))
+    SEARCH_MAX_LIMIT = int(os.environ.get('SEARCH_MAX_LIMIT', 100))
+    STATS_TTL = int(os.environ.get('STATS_TTL', 300))
+    QUERY_CACHE_BACKEND = os.environ.get('QUERY_CACHE_BACKEND', 'memory')
+    QUERY_CACHE_REDIS_URL = os.environ.get('QUERY_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    QUERY_CACHE_SIZE = int(os.environ.get('QUERY_CACHE_SIZE', 256))
+    QUERY_CACHE_TTL = int(os.environ.get('QUERY_CACHE_TTL', 60))
+    FOTO_STORAGE_DIR = os.environ.get('FOTO_STORAGE_DIR')
+    FOTO_CACHE_MAX_AGE = int(os.environ.get('FOTO_CACHE_MAX_AGE', 86400))
+    ATOR_IMPORT_MAX_ROWS = int(os.environ.get('ATOR_IMPORT_MAX_ROWS', 10000))
+    ATOR_IMPORT_CHUNK_SIZE = int(os.environ.get('ATOR_IMPORT_CHUNK_SIZE', 500))
+    STREAM_BATCH_SIZE = int(os.environ.get('STREAM_BATCH_SIZE', 1000))
     MAIL_SERVER = os.environ.get('MAIL_SERVER')
     MAIL_PORT = int(os.environ.get('MAIL_PORT')) 
     MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS', 'False').lower() == 'true'
     MAIL_USE_SSL = os.environ.get('MAIL_USE_SSL', 'True').lower() == 'true'
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
-    MAIL_DEFAULT_SENDER = os.environ.get('MAIL_USERNAME')
\ No newline at end of file
+    MAIL_DEFAULT_SENDER = os.environ.get('MAIL_USERNAME')
+    MAIL_QUEUE_ENABLED = os.environ.get('MAIL_QUEUE_ENABLED', 'False').lower() == 'true'
+    MAIL_SPOOL_DIR = os.environ.get('MAIL_SPOOL_DIR')
+    MAIL_WORKERS = int(os.environ.get('MAIL_WORKERS', 2))
+    MAIL_BATCH_SIZE = int(os.environ.get('MAIL_BATCH_SIZE', 20))
+    MAIL_MAX_RETRIES = int(os.environ.get('MAIL_MAX_RETRIES', 5))
+    MAIL_RETRY_BACKOFF = int(os.environ.get('MAIL_RETRY_BACKOFF', 30))
+    MAIL_POLL_INTERVAL = int(os.environ.get('MAIL_POLL_INTERVAL', 5))
+    MAIL_SMTP_TIMEOUT = int(os.environ.get('MAIL_SMTP_TIMEOUT', 30))
+    MAIL_STALE_PROCESSING_SECONDS = int(os.environ.get('MAIL_STALE_PROCESSING_SECONDS', 600))
+    MAIL_FAILED_RETENTION_DAYS = int(os.environ.get('MAIL_FAILED_RETENTION_DAYS', 7))
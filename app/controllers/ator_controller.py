@@ -1,12 +1,22 @@
-from flask import request
+from flask import request, Response, stream_with_context, current_app, after_this_request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, marshal
+from datetime import date
+from functools import wraps
+import hashlib
+import json
 
 from app.exceptions.custom_exceptions import HttpNotFoundError
-from app.services.ator_service import AtorService
+from app.services.ator_service import AtorService, encode_ator_list_row, CADERNO_ATIVIDADES_EXPORT_MAPPER
 from app.services.auth_service import verify_token
+from app.services.foto_service import FotoService, foto_url
+from app.services.ator_import_service import AtorImportService
+from app.services.data_version_service import data_version
+from app.services.query_guard_service import query_budget, set_query_budget
+from app.services.json_service import fast_json_enabled, dumps as json_dumps
+from app.services.export_service import EXPORT_FORMATS, iter_csv, iter_xlsx
 from app.dtos.ator_dto import (
-    AtorBaseDTO, AtorCreateDTO, AtorResponseDTO, AtorIdNomeDTO, AtorTipoDTO, AtorAnoSessaoDTO,
+    AtorBaseDTO, AtorCreateDTO, AtorTipoDTO, AtorAnoSessaoDTO,
     AtorDadosMensageriaDTO, AtorDadosCompletosDTO, AtorFotoDTO, AtorByEmailDTO, AtorNomeImagemDTO,
     AtorNomeRsDTO, AtorEmailRawDTO, AtorAutorizadoDTO, AtorUnidadeDTO, AtorDadosPesquisaDTO,
     AtorDadosPesquisaAppDTO, AtorAlunoPorResponsavelDTO, AtorFilteredGridItemDTO, AtorGridItemDTO,
@@ -18,6 +28,128 @@ from werkzeug.exceptions import HTTPException, BadRequest, Conflict, NotFound, I
 ator_ns = Namespace('Ator', description='Operações relacionadas a Atores')
 
 ator_service = AtorService()
+foto_service = FotoService()
+ator_import_service = AtorImportService()
+
+MAX_PAGE_LIMIT = 1000
+DEFAULT_PAGE_SIZE = 50
+
+
+def _ator_list_item(ator):
+    item = ator.to_dict()
+    item['foto_url'] = foto_url(ator.id) if item.pop('hexadecimal_foto') else None
+    return item
+
+
+def _campos_param(fn):
+    return ator_ns.param('campos', 'Campos a devolver, separados por vírgula (ex.: "id,nome"); padrão: todos')(fn)
+
+
+def _campos_from_request():
+    campos = request.args.get('campos')
+    if campos is None:
+        return None
+    return [campo.strip() for campo in campos.split(',') if campo.strip()]
+
+
+def _ator_projection(campos):
+    if campos is None:
+        return ator_model
+    return {campo: ator_model[campo] for campo in campos if campo in ator_model}
+
+
+def _output(data, model):
+    # Com o encoder rápido, dados que o serviço já monta no formato do model vão direto para o JSON
+    return data if fast_json_enabled() else marshal(data, model)
+
+
+def _jsonl_response(registros, encode=None):
+    # encode: serializador compilado que já devolve bytes (ver app/dtos/serializers.py)
+    def generate():
+        if encode is not None:
+            for registro in registros:
+                yield encode(registro) + b'\n'
+            return
+        for registro in registros:
+            yield json.dumps(registro) + '\n'
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+_FIM = object()
+
+
+def _json_array_response(registros):
+    # Array JSON em streaming: cada registro do pipeline é serializado e enviado assim que sai do cursor.
+    # O primeiro registro (e com ele o primeiro lote da consulta) é lido aqui, ainda dentro do try de quem
+    # chama: erro de conexão, de SQL ou de mapeamento vira 500 em vez de um 200 com o array cortado.
+    registros = iter(registros)
+    primeiro = next(registros, _FIM)
+
+    def generate():
+        if primeiro is _FIM:
+            yield b'[]\n'
+            return
+        yield b'[' + json_dumps(primeiro)
+        for registro in registros:
+            yield b',' + json_dumps(registro)
+        yield b']\n'
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+
+def _conditional_get(token):
+    # ETag pela versão dos dados do escopo (ator ou unidade, ver data_version) + URL: o If-None-Match
+    # é respondido com 304 antes de executar as consultas.
+    def wrapper(fn):
+        @wraps(fn)
+        def decorator(*args, **kwargs):
+            # None quando as versões estão desativadas (ver data_version.available): responde sem ETag
+            try:
+                version = token(**kwargs)
+            except Exception as e:
+                current_app.logger.warning('Falha ao ler a versão dos dados para o ETag: %s', e)
+                version = None
+            if version is None:
+                return fn(*args, **kwargs)
+
+            etag = hashlib.sha1(f'{version}:{request.full_path}'.encode('utf-8')).hexdigest()
+            if request.if_none_match.contains(etag) and verify_token(get_jwt_identity(), 'read_ator'):
+                response = Response(status=304, headers={'Cache-Control': 'private, no-cache'})
+                response.set_etag(etag)
+                return response
+
+            @after_this_request
+            def add_etag(response):
+                if response.status_code == 200:
+                    response.set_etag(etag)
+                    response.headers['Cache-Control'] = 'private, no-cache'
+                return response
+
+            return fn(*args, **kwargs)
+        return decorator
+    return wrapper
+
+
+def _ator_version(ator_id):
+    return data_version.atores_token([ator_id])
+
+
+def _atores_version():
+    return data_version.unidades_token()
+
+
+def _unidade_version():
+    # unidade_id vazio ou 0 nos filtros significa todas as unidades
+    return data_version.unidades_token(request.args.get('unidade_id', type=int) or None)
+
+
+def _lote_version():
+    if request.args.get('ids'):
+        try:
+            ator_ids = sorted({int(ator_id) for ator_id in request.args['ids'].split(',') if ator_id.strip()})
+        except ValueError:
+            return None
+        return data_version.atores_token(ator_ids[:MAX_PAGE_LIMIT + 1])
+    return _unidade_version()
 
 ator_model = ator_ns.model('Ator', {
     'id': fields.Integer(readOnly=True, description='Identificador único do ator'), 
@@ -42,6 +174,12 @@ ator_model = ator_ns.model('Ator', {
     'status': fields.Integer(description='Status do ator (ex: 1 para ativo, 2 para inativo)')
 })
 
+# A listagem devolve a URL da foto em vez do conteúdo armazenado em hexadecimal_foto
+ator_list_model = ator_ns.model('AtorListagem', dict(
+    {name: field for name, field in ator_model.items() if name != 'hexadecimal_foto'},
+    foto_url=fields.String(description='URL da foto do ator (GET /api/ator/<id>/foto/arquivo)')
+))
+
 vinculo_data_model = ator_ns.model('VinculoData', {
     'NOMER': fields.String(required=True, description='Nome do responsável'),
     'EMAILR': fields.String(required=True, description='Email do responsável'),
@@ -143,6 +281,12 @@ ator_autorizado_model = ator_ns.model('AtorAutorizado', {
     'nome': fields.String(description='Nome do Ator Autorizado')
 })
 
+ator_busca_model = ator_ns.model('AtorBusca', {
+    'id': fields.Integer(description='ID do Ator'),
+    'nome': fields.String(description='Nome do Ator'),
+    'email': fields.String(description='Email do Ator')
+})
+
 ator_unidade_model = ator_ns.model('AtorUnidade', {
     'id': fields.Integer(description='ID do Ator'),
     'nome': fields.String(description='Nome do Ator')
@@ -211,7 +355,42 @@ ator_filtered_grid_item_model = ator_ns.model('AtorFilteredGridItem', {
     'instituicao': fields.String(description='Nome da Instituição'),
     'municipio': fields.String(description='Município da Instituição'),
     'parecer': fields.String(description='Parecer Psicológico'),
-    'status': fields.String(description='Status do Ator')
+    'status': fields.String(description='Status do Ator'),
+    'foto_url': fields.String(description='URL da foto do Ator')
+})
+
+ator_stats_item_model = ator_ns.model('AtorStatsItem', {
+    'id': fields.Integer(description='ID da unidade, modalidade, profissão ou parecer (nulo quando não informado)'),
+    'descricao': fields.String(description='Descrição'),
+    'total': fields.Integer(description='Quantidade de atores ativos')
+})
+
+ator_stats_model = ator_ns.model('AtorStats', {
+    'total': fields.Integer(description='Total de atores ativos'),
+    'alunos': fields.Integer(description='Total de alunos ativos'),
+    'por_unidade': fields.List(fields.Nested(ator_stats_item_model), description='Atores ativos por unidade'),
+    'por_modalidade': fields.List(fields.Nested(ator_stats_item_model), description='Atores ativos por modalidade de ensino'),
+    'por_profissao': fields.List(fields.Nested(ator_stats_item_model), description='Atores ativos por profissão'),
+    'por_parecer': fields.List(fields.Nested(ator_stats_item_model), description='Atores ativos por parecer psicológico'),
+    'atualizado_em': fields.String(description='Data e hora da última recarga completa')
+})
+
+ator_filtered_grid_page_model = ator_ns.model('AtorFilteredGridPage', {
+    'items': fields.List(fields.Nested(ator_filtered_grid_item_model), description='Atores da página'),
+    'page': fields.Integer(description='Página atual (começando em 1)'),
+    'size': fields.Integer(description='Quantidade de atores por página'),
+    'total': fields.Integer(description='Total de atores que atendem aos filtros')
+})
+
+ator_import_error_model = ator_ns.model('AtorImportacaoErro', {
+    'linha': fields.Integer(description='Linha do arquivo importado'),
+    'erros': fields.List(fields.String, description='Erros encontrados na linha')
+})
+
+ator_import_result_model = ator_ns.model('AtorImportacaoResultado', {
+    'total': fields.Integer(description='Quantidade de linhas recebidas'),
+    'importados': fields.Integer(description='Quantidade de atores importados'),
+    'erros': fields.List(fields.Nested(ator_import_error_model), description='Linhas rejeitadas')
 })
 
 ator_grid_item_model = ator_ns.model('AtorGridItem', {
@@ -224,17 +403,38 @@ ator_grid_item_model = ator_ns.model('AtorGridItem', {
 @ator_ns.route('')
 class AtorList(Resource):
     @ator_ns.doc(security='Bearer Auth')
+    @ator_ns.param('limit', f'Quantidade máxima de atores por página (até {MAX_PAGE_LIMIT})', type=int)
+    @ator_ns.param('after', 'Cursor retornado no cabeçalho X-Next-Cursor da página anterior')
+    @ator_ns.param('formato', 'Use "jsonl" para receber todos os atores em streaming (JSON lines)')
     @jwt_required()
-    @ator_ns.marshal_list_with(ator_model)
+    @ator_ns.response(200, 'Lista de atores', [ator_list_model])
+    @ator_ns.response(400, 'Parâmetros de paginação inválidos')
     @ator_ns.response(403, 'Acesso Negado')
     def get(self):
         current_user_email = get_jwt_identity()
         if not verify_token(current_user_email, 'read_ator'):
             ator_ns.abort(403, "Acesso negado")
-            
+
+        limit = request.args.get('limit', type=int)
+        after = request.args.get('after')
         try:
-            atores = ator_service.get_all_atores()
-            return [ator.to_dict() for ator in atores]
+            if request.args.get('formato') == 'jsonl':
+                set_query_budget(None)
+                return _jsonl_response(ator_service.iter_atores_rows(), encode=encode_ator_list_row)
+
+            if limit is None and after is None:
+                set_query_budget(None)
+                atores = ator_service.iter_all_atores()
+                return _json_array_response(marshal(_ator_list_item(ator), ator_list_model) for ator in atores)
+
+            if limit is None or limit < 1 or limit > MAX_PAGE_LIMIT:
+                ator_ns.abort(400, f'Parâmetro "limit" deve estar entre 1 e {MAX_PAGE_LIMIT}')
+
+            atores, next_cursor = ator_service.get_atores_page(limit, after)
+            headers = {'X-Next-Cursor': next_cursor} if next_cursor else {}
+            return marshal([_ator_list_item(ator) for ator in atores], ator_list_model), 200, headers
+        except HTTPException as e:
+            raise e
         except Exception as e:
             ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
 
@@ -258,6 +458,37 @@ class AtorList(Resource):
             raise e 
         except Exception as e:
             ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
+@ator_ns.route('/importacao')
+class AtorImportacao(Resource):
+    @ator_ns.doc(security='Bearer Auth', description=(
+        'Importa atores em lote. Envie o arquivo no corpo da requisição com Content-Type text/csv '
+        '(cabeçalho com os mesmos campos do cadastro de ator) ou application/x-ndjson (um objeto JSON por linha).'
+    ))
+    @jwt_required()
+    @query_budget(None)
+    @ator_ns.marshal_with(ator_import_result_model)
+    @ator_ns.response(400, 'Arquivo inválido')
+    @ator_ns.response(403, 'Acesso Negado')
+    @ator_ns.response(415, 'Formato não suportado')
+    def post(self):
+        current_user_email = get_jwt_identity()
+        if not verify_token(current_user_email, 'write_ator'):
+            ator_ns.abort(403, "Acesso negado")
+
+        content = request.get_data(as_text=True)
+        try:
+            if request.mimetype in ('text/csv', 'application/csv'):
+                rows = ator_import_service.parse_csv(content)
+            elif request.mimetype in ('application/x-ndjson', 'application/jsonl', 'application/json-lines'):
+                rows = ator_import_service.parse_jsonl(content)
+            else:
+                ator_ns.abort(415, 'Envie o arquivo como text/csv ou application/x-ndjson')
+            return ator_import_service.import_atores(rows, request.url_root)
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
+
 @ator_ns.route('/<int:ator_id>')
 @ator_ns.param('ator_id', 'O identificador único do ator')
 class AtorSingle(Resource):
@@ -299,6 +530,41 @@ class AtorCountAlunos(Resource):
         except Exception as e:
             ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
 
+@ator_ns.route('/stats')
+class AtorStats(Resource):
+    @ator_ns.doc(security='Bearer Auth', description=(
+        'Contadores do painel sobre os atores ativos, mantidos em memória por worker e atualizados a cada '
+        'cadastro, alteração e exclusão feitos pela API neste worker. Escritas de outros workers, importações '
+        'em lote e alterações fora da API aparecem em até STATS_TTL segundos (padrão 300) ou após o POST; '
+        '"atualizado_em" indica a última recarga completa. Para o total exato de alunos use /count-alunos.'
+    ))
+    @jwt_required()
+    @ator_ns.response(200, 'Contadores do painel', ator_stats_model)
+    @ator_ns.response(403, 'Acesso Negado')
+    def get(self):
+        current_user_email = get_jwt_identity()
+        if not verify_token(current_user_email, 'read_ator'):
+            ator_ns.abort(403, "Acesso negado")
+
+        try:
+            return marshal(ator_service.get_stats(), ator_stats_model)
+        except Exception as e:
+            ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
+
+    @ator_ns.doc(security='Bearer Auth', description='Recalcula todos os contadores a partir do banco de dados.')
+    @jwt_required()
+    @ator_ns.response(200, 'Contadores recalculados', ator_stats_model)
+    @ator_ns.response(403, 'Acesso Negado')
+    def post(self):
+        current_user_email = get_jwt_identity()
+        if not verify_token(current_user_email, 'write_ator'):
+            ator_ns.abort(403, "Acesso negado")
+
+        try:
+            return marshal(ator_service.rebuild_stats(), ator_stats_model)
+        except Exception as e:
+            ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
+
 @ator_ns.route('/descricao')
 class AtorDescricao(Resource):
     @ator_ns.doc(security='Bearer Auth')
@@ -311,8 +577,7 @@ class AtorDescricao(Resource):
             ator_ns.abort(403, "Acesso negado")
             
         try:
-            atores = ator_service.get_ator_descriptions()
-            return [AtorIdNomeDTO(id=a.id, nome=a.nome).to_dict() for a in atores]
+            return ator_service.get_ator_descriptions()
         except Exception as e:
             ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
 
@@ -320,7 +585,7 @@ class AtorDescricao(Resource):
 class AtorComboNome(Resource):
     @ator_ns.doc(security='Bearer Auth')
     @jwt_required()
-    @ator_ns.marshal_list_with(fields.String, description='Lista de nomes de atores')
+    @ator_ns.response(200, 'Lista de nomes de atores', [fields.String])
     @ator_ns.response(403, 'Acesso Negado')
     def get(self):
         current_user_email = get_jwt_identity()
@@ -345,8 +610,7 @@ class AtorCombo(Resource):
             ator_ns.abort(403, "Acesso negado")
             
         try:
-            atores = ator_service.get_ator_combo_all()
-            return [AtorIdNomeDTO(id=a.id, nome=a.nome).to_dict() for a in atores]
+            return ator_service.get_ator_combo_all()
         except Exception as e:
             ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
 
@@ -386,7 +650,7 @@ class AtorTipo(Resource):
             
         try:
             ator_data = ator_service.get_ator_type(ator_id)
-            return AtorTipoDTO(**ator_data).to_dict()
+            return ator_data
         except LookupError as e:
             ator_ns.abort(404, str(e))
         except Exception as e:
@@ -404,70 +668,190 @@ class AtorComboAll(Resource):
             ator_ns.abort(403, "Acesso negado")
             
         try:
-            atores = ator_service.get_ator_combo_all()
-            return [AtorIdNomeDTO(id=a.id, nome=a.nome).to_dict() for a in atores]
+            return ator_service.get_ator_combo_all()
+        except Exception as e:
+            ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
+
+@ator_ns.route('/busca')
+class AtorBusca(Resource):
+    @ator_ns.doc(security='Bearer Auth')
+    @ator_ns.param('q', 'Trecho do nome ou e-mail (sem diferenciar acentos e maiúsculas)', required=True)
+    @ator_ns.param('limit', 'Quantidade máxima de resultados (padrão 20)', type=int)
+    @jwt_required()
+    @ator_ns.marshal_list_with(ator_busca_model)
+    @ator_ns.response(400, 'Parâmetros de busca inválidos')
+    @ator_ns.response(403, 'Acesso Negado')
+    def get(self):
+        current_user_email = get_jwt_identity()
+        if not verify_token(current_user_email, 'read_ator'):
+            ator_ns.abort(403, "Acesso negado")
+
+        try:
+            # Ordem: início do nome, início de palavra do nome, meio do nome, início e meio do e-mail
+            return ator_service.search_atores(request.args.get('q'), request.args.get('limit', 20, type=int))
+        except ValueError as e:
+            ator_ns.abort(400, str(e))
         except Exception as e:
             ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
 
+GRID_FILTER_PARAMS = [
+    ('unidade_id', 'ID da unidade para filtro', int),
+    ('modalidade_ensino_id', 'ID da modalidade de ensino para filtro', int),
+    ('profissao_id', 'ID da profissão para filtro', int),
+    ('cidade', 'Cidade para filtro', str)
+]
+GRID_SORT_PARAM = ('sort', 'Campo de ordenação (nome, idade, modalidade, tipo, instituicao, municipio, parecer, status); prefixe com "-" para ordem decrescente', str)
+
+
+def _params(fn, params):
+    for name, description, param_type in reversed(params):
+        fn = ator_ns.param(name, description, type=param_type)(fn)
+    return fn
+
+
+def _grid_filter_params(fn):
+    return _params(fn, GRID_FILTER_PARAMS + [
+        ('page', 'Página a retornar (começando em 1)', int),
+        ('size', f'Quantidade de atores por página (até {MAX_PAGE_LIMIT})', int),
+        GRID_SORT_PARAM,
+        ('total', 'Informe "false" para não calcular o total na resposta', str),
+        ('legado', 'Informe "true" para receber a lista completa, sem envelope nem paginação (formato anterior)', str)
+    ])
+
+
+def _grid_export_params(fn):
+    return _params(fn, GRID_FILTER_PARAMS + [
+        GRID_SORT_PARAM,
+        ('formato', f'Formato do arquivo: {" ou ".join(EXPORT_FORMATS)} (padrão: csv)', str)
+    ])
+
+
+def _grid_filters_from_request():
+    return {
+        'unidade_id': request.args.get('unidade_id', type=int),
+        'modalidade_ensino_id': request.args.get('modalidade_ensino_id', type=int),
+        'profissao_id': request.args.get('profissao_id', type=int),
+        'cidade': request.args.get('cidade')
+    }
+
+
+def _filtered_grid_response(service_method):
+    # Resposta sempre no envelope {items, page, size, total}; a lista completa sem envelope só com legado=true
+    filters = _grid_filters_from_request()
+    page = request.args.get('page', type=int)
+    size = request.args.get('size', type=int)
+    sort = request.args.get('sort')
+    legado = request.args.get('legado', 'false').lower() == 'true'
+
+    if legado:
+        if page is not None or size is not None:
+            ator_ns.abort(400, 'Parâmetros inválidos: "legado" não aceita "page" nem "size"')
+    else:
+        page = page or 1
+        size = size or DEFAULT_PAGE_SIZE
+        if page < 1 or size < 1 or size > MAX_PAGE_LIMIT:
+            ator_ns.abort(400, f'Parâmetros inválidos: "page" deve ser maior que zero e "size" estar entre 1 e {MAX_PAGE_LIMIT}')
+
+    try:
+        if legado:
+            set_query_budget(None)
+            results = service_method(filters, None, None, sort)
+            return _json_array_response(_output(item, ator_filtered_grid_item_model) for item in results)
+
+        results = service_method(filters, page, size, sort)
+        total = None
+        if request.args.get('total', 'true').lower() != 'false':
+            total = ator_service.count_filtered_actors(filters)
+        return _output({'items': list(results), 'page': page, 'size': size, 'total': total}, ator_filtered_grid_page_model)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
+
+
 @ator_ns.route('/filtro-caderno-atividades')
 class AtorFiltroCadernoAtividades(Resource):
     @ator_ns.doc(security='Bearer Auth')
-    @ator_ns.param('unidade_id', 'ID da unidade para filtro', type=int)
-    @ator_ns.param('modalidade_ensino_id', 'ID da modalidade de ensino para filtro', type=int)
-    @ator_ns.param('profissao_id', 'ID da profissão para filtro', type=int)
-    @ator_ns.param('cidade', 'Cidade para filtro')
+    @_grid_filter_params
     @jwt_required()
-    @ator_ns.marshal_list_with(ator_filtered_grid_item_model)
+    @_conditional_get(_unidade_version)
+    @ator_ns.response(304, 'Não modificado desde o ETag informado (If-None-Match)')
+    @ator_ns.response(200, 'Página de atores com o total (sem "page"/"size": primeira página); com legado=true, '
+                      'lista completa de AtorFilteredGridItem sem envelope', ator_filtered_grid_page_model)
+    @ator_ns.response(400, 'Parâmetros de paginação ou ordenação inválidos')
     @ator_ns.response(403, 'Acesso Negado')
     def get(self):
         current_user_email = get_jwt_identity()
         if not verify_token(current_user_email, 'read_ator'):
             ator_ns.abort(403, "Acesso negado")
-            
-        filters = {
-            'unidade_id': request.args.get('unidade_id', type=int),
-            'modalidade_ensino_id': request.args.get('modalidade_ensino_id', type=int),
-            'profissao_id': request.args.get('profissao_id', type=int),
-            'cidade': request.args.get('cidade')
-        }
+
+        return _filtered_grid_response(ator_service.get_filtered_actors_for_caderno_atividades)
+
+@ator_ns.route('/filtro-caderno-atividades/exportar')
+class AtorFiltroCadernoAtividadesExportar(Resource):
+    @ator_ns.doc(security='Bearer Auth', description=(
+        'Exporta os atores do caderno de atividades com os mesmos filtros da listagem. '
+        'O arquivo é enviado em streaming enquanto a consulta é lida do banco.'
+    ))
+    @_grid_export_params
+    @jwt_required()
+    @query_budget(None)
+    @ator_ns.response(200, 'Arquivo CSV ou XLSX')
+    @ator_ns.response(400, 'Formato ou ordenação inválidos')
+    @ator_ns.response(403, 'Acesso Negado')
+    def get(self):
+        current_user_email = get_jwt_identity()
+        if not verify_token(current_user_email, 'read_ator'):
+            ator_ns.abort(403, "Acesso negado")
+
+        formato = request.args.get('formato', 'csv').lower()
+        if formato not in EXPORT_FORMATS:
+            ator_ns.abort(400, f'Formato inválido: use {" ou ".join(EXPORT_FORMATS)}')
+
         try:
-            results = ator_service.get_filtered_actors_for_caderno_atividades(filters)
-            return [AtorFilteredGridItemDTO(**r).to_dict() for r in results]
+            registros = ator_service.export_filtered_actors_for_caderno_atividades(
+                _grid_filters_from_request(), request.args.get('sort')
+            )
+        except HTTPException as e:
+            raise e
         except Exception as e:
             ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
 
+        header = CADERNO_ATIVIDADES_EXPORT_MAPPER.keys
+        if formato == 'xlsx':
+            conteudo = iter_xlsx(header, registros, 'Caderno de atividades')
+        else:
+            conteudo = iter_csv(header, registros)
+        response = Response(stream_with_context(conteudo), mimetype=EXPORT_FORMATS[formato])
+        nome_arquivo = f'caderno-atividades-{date.today():%Y%m%d}.{formato}'
+        response.headers['Content-Disposition'] = f'attachment; filename="{nome_arquivo}"'
+        return response
+
 @ator_ns.route('/grid-filtro')
 class AtorGridFiltro(Resource):
     @ator_ns.doc(security='Bearer Auth')
-    @ator_ns.param('unidade_id', 'ID da unidade para filtro', type=int)
-    @ator_ns.param('modalidade_ensino_id', 'ID da modalidade de ensino para filtro', type=int)
-    @ator_ns.param('profissao_id', 'ID da profissão para filtro', type=int)
-    @ator_ns.param('cidade', 'Cidade para filtro')
+    @_grid_filter_params
     @jwt_required()
-    @ator_ns.marshal_list_with(ator_filtered_grid_item_model)
+    @_conditional_get(_unidade_version)
+    @ator_ns.response(304, 'Não modificado desde o ETag informado (If-None-Match)')
+    @ator_ns.response(200, 'Página de atores com o total (sem "page"/"size": primeira página); com legado=true, '
+                      'lista completa de AtorFilteredGridItem sem envelope', ator_filtered_grid_page_model)
+    @ator_ns.response(400, 'Parâmetros de paginação ou ordenação inválidos')
     @ator_ns.response(403, 'Acesso Negado')
     def get(self):
         current_user_email = get_jwt_identity()
         if not verify_token(current_user_email, 'read_ator'):
             ator_ns.abort(403, "Acesso negado")
-            
-        filters = {
-            'unidade_id': request.args.get('unidade_id', type=int),
-            'modalidade_ensino_id': request.args.get('modalidade_ensino_id', type=int),
-            'profissao_id': request.args.get('profissao_id', type=int),
-            'cidade': request.args.get('cidade')
-        }
-        try:
-            results = ator_service.get_filtered_actors_for_grid(filters)
-            return [AtorFilteredGridItemDTO(**r).to_dict() for r in results]
-        except Exception as e:
-            ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
+
+        return _filtered_grid_response(ator_service.get_filtered_actors_for_grid)
 
 @ator_ns.route('/grid')
 class AtorGrid(Resource):
     @ator_ns.doc(security='Bearer Auth')
     @jwt_required()
-    @ator_ns.marshal_list_with(ator_grid_item_model)
+    @_conditional_get(_atores_version)
+    @ator_ns.response(304, 'Não modificado desde o ETag informado (If-None-Match)')
+    @ator_ns.response(200, 'Lista de atores', [ator_grid_item_model])
     @ator_ns.response(403, 'Acesso Negado')
     def get(self):
         current_user_email = get_jwt_identity()
@@ -475,8 +859,8 @@ class AtorGrid(Resource):
             ator_ns.abort(403, "Acesso negado")
             
         try:
-            results = ator_service.get_all_actors_for_grid()
-            return [AtorGridItemDTO(**r).to_dict() for r in results]
+            set_query_budget(None)
+            return _json_array_response(_output(item, ator_grid_item_model) for item in ator_service.get_all_actors_for_grid())
         except Exception as e:
             ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
 
@@ -493,8 +877,7 @@ class AtorChatInstituicao(Resource):
             ator_ns.abort(403, "Acesso negado")
             
         try:
-            combined_atores = ator_service.get_chat_actors_by_institution(unidade_id)
-            return [AtorIdNomeDTO(id=a.id, nome=a.nome).to_dict() for a in combined_atores]
+            return ator_service.get_chat_actors_by_institution(unidade_id)
         except Exception as e:
             ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
 
@@ -524,6 +907,8 @@ class AtorNome(Resource):
 class AtorDadosMensageria(Resource):
     @ator_ns.doc(security='Bearer Auth')
     @jwt_required()
+    @_conditional_get(_ator_version)
+    @ator_ns.response(304, 'Não modificado desde o ETag informado (If-None-Match)')
     @ator_ns.marshal_with(ator_dados_mensageria_model)
     @ator_ns.response(404, 'Ator não encontrado')
     @ator_ns.response(403, 'Acesso Negado')
@@ -545,6 +930,8 @@ class AtorDadosMensageria(Resource):
 class AtorDadosCompletos(Resource):
     @ator_ns.doc(security='Bearer Auth')
     @jwt_required()
+    @_conditional_get(_ator_version)
+    @ator_ns.response(304, 'Não modificado desde o ETag informado (If-None-Match)')
     @ator_ns.marshal_with(ator_dados_completos_model)
     @ator_ns.response(404, 'Ator não encontrado')
     @ator_ns.response(403, 'Acesso Negado')
@@ -561,6 +948,38 @@ class AtorDadosCompletos(Resource):
         except Exception as e:
             ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
 
+@ator_ns.route('/dados-completos')
+class AtorDadosCompletosLote(Resource):
+    @ator_ns.doc(security='Bearer Auth')
+    @ator_ns.param('ids', f'IDs dos atores separados por vírgula (até {MAX_PAGE_LIMIT})')
+    @ator_ns.param('unidade_id', 'ID da unidade: retorna todos os alunos ativos da unidade', type=int)
+    @jwt_required()
+    @_conditional_get(_lote_version)
+    @ator_ns.produces(['application/x-ndjson'])
+    @ator_ns.response(200, 'Dados completos dos atores em streaming (JSON lines), um registro por ator', ator_dados_completos_model)
+    @ator_ns.response(304, 'Não modificado desde o ETag informado (If-None-Match)')
+    @ator_ns.response(400, 'Informe "ids" ou "unidade_id"')
+    @ator_ns.response(403, 'Acesso Negado')
+    def get(self):
+        current_user_email = get_jwt_identity()
+        if not verify_token(current_user_email, 'read_ator'):
+            ator_ns.abort(403, "Acesso negado")
+
+        ator_ids = None
+        if request.args.get('ids'):
+            try:
+                ator_ids = sorted({int(ator_id) for ator_id in request.args['ids'].split(',') if ator_id.strip()})
+            except ValueError:
+                ator_ns.abort(400, 'Parâmetro "ids" deve conter apenas números separados por vírgula')
+            if len(ator_ids) > MAX_PAGE_LIMIT:
+                ator_ns.abort(400, f'Parâmetro "ids" aceita até {MAX_PAGE_LIMIT} atores')
+
+        unidade_id = request.args.get('unidade_id', type=int)
+        if ator_ids is None and unidade_id is None:
+            ator_ns.abort(400, 'Informe "ids" ou "unidade_id"')
+
+        return _jsonl_response(ator_service.iter_complete_ator_data(ator_ids, unidade_id))
+
 @ator_ns.route('/<int:ator_id>/foto')
 @ator_ns.param('ator_id', 'O identificador único do ator')
 class AtorFoto(Resource):
@@ -582,6 +1001,39 @@ class AtorFoto(Resource):
         except Exception as e:
             ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
 
+@ator_ns.route('/<int:ator_id>/foto/arquivo')
+@ator_ns.param('ator_id', 'O identificador único do ator')
+class AtorFotoArquivo(Resource):
+    @ator_ns.doc(security='Bearer Auth')
+    @jwt_required()
+    @ator_ns.produces(['image/*'])
+    @ator_ns.response(200, 'Conteúdo binário da foto')
+    @ator_ns.response(304, 'Foto não modificada (If-None-Match)')
+    @ator_ns.response(404, 'Ator ou foto não encontrados')
+    @ator_ns.response(403, 'Acesso Negado')
+    def get(self, ator_id):
+        current_user_email = get_jwt_identity()
+        if not verify_token(current_user_email, 'read_ator'):
+            ator_ns.abort(403, "Acesso negado")
+
+        try:
+            headers = {'Cache-Control': f"private, max-age={current_app.config['FOTO_CACHE_MAX_AGE']}"}
+            if request.if_none_match:
+                etag = foto_service.get_foto_etag(ator_id)
+                if request.if_none_match.contains(etag):
+                    response = Response(status=304, headers=headers)
+                    response.set_etag(etag)
+                    return response
+
+            conteudo, mimetype, etag = foto_service.get_foto(ator_id)
+            response = Response(conteudo, mimetype=mimetype, headers=headers)
+            response.set_etag(etag)
+            return response
+        except LookupError as e:
+            ator_ns.abort(404, str(e))
+        except Exception as e:
+            ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
+
 @ator_ns.route('/email/<string:email>')
 @ator_ns.param('email', 'O endereço de e-mail do ator')
 class AtorByEmail(Resource):
@@ -728,6 +1180,8 @@ class AtorUnidadeAlunos(Resource):
 class AtorDadosPesquisa(Resource):
     @ator_ns.doc(security='Bearer Auth')
     @jwt_required()
+    @_conditional_get(_ator_version)
+    @ator_ns.response(304, 'Não modificado desde o ETag informado (If-None-Match)')
     @ator_ns.marshal_with(ator_dados_pesquisa_model)
     @ator_ns.response(404, 'Dados do ator não encontrados')
     @ator_ns.response(403, 'Acesso Negado')
@@ -789,17 +1243,21 @@ class AtorAlunoPorResponsavel(Resource):
 @ator_ns.route('/alunos-di')
 class AtorAlunosDi(Resource):
     @ator_ns.doc(security='Bearer Auth')
+    @_campos_param
     @jwt_required()
-    @ator_ns.marshal_list_with(ator_model) 
+    @ator_ns.response(200, 'Lista de atores (só os campos pedidos em "campos")', [ator_model])
+    @ator_ns.response(400, 'Parâmetro "campos" inválido')
     @ator_ns.response(403, 'Acesso Negado')
     def get(self):
         current_user_email = get_jwt_identity()
         if not verify_token(current_user_email, 'read_ator'):
             ator_ns.abort(403, "Acesso negado")
             
+        campos = _campos_from_request()
         try:
-            alunos = ator_service.get_all_students_di()
-            return [AtorResponseDTO(id=a.id, **a.to_dict()).to_dict() for a in alunos]
+            return marshal(ator_service.get_all_students_di(campos), _ator_projection(campos))
+        except ValueError as e:
+            ator_ns.abort(400, str(e))
         except Exception as e:
             ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
 
@@ -815,8 +1273,7 @@ class AtorInteracionais(Resource):
             ator_ns.abort(403, "Acesso negado")
             
         try:
-            combined_atores = ator_service.get_interacional_actors()
-            return [AtorIdNomeDTO(id=a.id, nome=a.nome).to_dict() for a in combined_atores]
+            return ator_service.get_interacional_actors()
         except Exception as e:
             ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
 
@@ -835,8 +1292,7 @@ class AtorPsicologosPorCidade(Resource):
 
         cidade = request.args.get('cidade')
         try:
-            psicologos = ator_service.get_psychologists_by_city(cidade)
-            return [AtorIdNomeDTO(id=p.id, nome=p.nome).to_dict() for p in psicologos]
+            return ator_service.get_psychologists_by_city(cidade)
         except ValueError as e:
             ator_ns.abort(400, str(e))
         except Exception as e:
@@ -845,51 +1301,63 @@ class AtorPsicologosPorCidade(Resource):
 @ator_ns.route('/psicologos')
 class AtorPsicologos(Resource):
     @ator_ns.doc(security='Bearer Auth')
+    @_campos_param
     @jwt_required()
-    @ator_ns.marshal_list_with(ator_model)
+    @ator_ns.response(200, 'Lista de atores (só os campos pedidos em "campos")', [ator_model])
+    @ator_ns.response(400, 'Parâmetro "campos" inválido')
     @ator_ns.response(403, 'Acesso Negado')
     def get(self):
         current_user_email = get_jwt_identity()
         if not verify_token(current_user_email, 'read_ator'):
             ator_ns.abort(403, "Acesso negado")
             
+        campos = _campos_from_request()
         try:
-            psicologos = ator_service.get_all_psychologists()
-            return [AtorResponseDTO(id=p.id, **p.to_dict()).to_dict() for p in psicologos]
+            return marshal(ator_service.get_all_psychologists(campos), _ator_projection(campos))
+        except ValueError as e:
+            ator_ns.abort(400, str(e))
         except Exception as e:
             ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
 
 @ator_ns.route('/professores')
 class AtorProfessores(Resource):
     @ator_ns.doc(security='Bearer Auth')
+    @_campos_param
     @jwt_required()
-    @ator_ns.marshal_list_with(ator_model)
+    @ator_ns.response(200, 'Lista de atores (só os campos pedidos em "campos")', [ator_model])
+    @ator_ns.response(400, 'Parâmetro "campos" inválido')
     @ator_ns.response(403, 'Acesso Negado')
     def get(self):
         current_user_email = get_jwt_identity()
         if not verify_token(current_user_email, 'read_ator'):
             ator_ns.abort(403, "Acesso negado")
             
+        campos = _campos_from_request()
         try:
-            professores = ator_service.get_all_professors()
-            return [AtorResponseDTO(id=p.id, **p.to_dict()).to_dict() for p in professores]
+            return marshal(ator_service.get_all_professors(campos), _ator_projection(campos))
+        except ValueError as e:
+            ator_ns.abort(400, str(e))
         except Exception as e:
             ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
 
 @ator_ns.route('/responsaveis')
 class AtorResponsaveis(Resource):
     @ator_ns.doc(security='Bearer Auth')
+    @_campos_param
     @jwt_required()
-    @ator_ns.marshal_list_with(ator_model)
+    @ator_ns.response(200, 'Lista de atores (só os campos pedidos em "campos")', [ator_model])
+    @ator_ns.response(400, 'Parâmetro "campos" inválido')
     @ator_ns.response(403, 'Acesso Negado')
     def get(self):
         current_user_email = get_jwt_identity()
         if not verify_token(current_user_email, 'read_ator'):
             ator_ns.abort(403, "Acesso negado")
             
+        campos = _campos_from_request()
         try:
-            responsaveis = ator_service.get_all_responsibles()
-            return [AtorResponseDTO(id=r.id, **r.to_dict()).to_dict() for r in responsaveis]
+            return marshal(ator_service.get_all_responsibles(campos), _ator_projection(campos))
+        except ValueError as e:
+            ator_ns.abort(400, str(e))
         except Exception as e:
             ator_ns.abort(500, f'Erro interno do servidor: {str(e)}')
 
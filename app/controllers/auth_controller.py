@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import create_access_token
 from flask_restx import Namespace, Resource, fields 
 
@@ -46,6 +46,9 @@ class UserLogin(Resource):
 
         # Define as informações adicionais que você quer no token.
         additional_claims = {"ator_id": user.ator_id}
+        if current_app.config.get('JWT_EMBED_GRUPO_USUARIO'):
+            # Permite autorizar as requisições sem consultar o grupo do usuário no banco.
+            additional_claims["cod_grupo_usuario"] = user.cod_grupo_usuario
         
         # Cria o token com o email como identidade principal e o ator_id como um claim adicional.
         access_token = create_access_token(identity=user.email, additional_claims=additional_claims)
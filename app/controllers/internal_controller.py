@@ -0,0 +1,43 @@
+from flask import current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_restx import Namespace, Resource
+
+from app import db
+from app.services.auth_service import get_user_group
+from app.services.mail_queue_service import mail_queue
+from app.services.pool_metrics_service import pool_metrics
+
+internal_ns = Namespace('Interno', description='Métricas internas de operação')
+
+GRUPO_ADMINISTRADOR = 1
+
+
+@internal_ns.route('/metricas/pool')
+class PoolMetricas(Resource):
+    @internal_ns.doc(security='Bearer Auth')
+    @jwt_required()
+    @internal_ns.response(200, 'Estado e histórico de uso do pool de conexões deste worker')
+    @internal_ns.response(403, 'Acesso Negado')
+    def get(self):
+        if get_user_group(get_jwt_identity()) != GRUPO_ADMINISTRADOR:
+            internal_ns.abort(403, "Acesso negado")
+
+        metricas = pool_metrics.snapshot(db.engine.pool)
+        metricas['configuracao'] = {
+            chave: current_app.config[chave]
+            for chave in ('DB_POOL_SIZE', 'DB_MAX_OVERFLOW', 'DB_POOL_TIMEOUT', 'DB_POOL_RECYCLE', 'DB_POOL_PRE_PING')
+        }
+        return metricas, 200
+
+
+@internal_ns.route('/metricas/email')
+class EmailMetricas(Resource):
+    @internal_ns.doc(security='Bearer Auth')
+    @jwt_required()
+    @internal_ns.response(200, 'Contadores da fila de e-mails deste worker e tamanho do spool')
+    @internal_ns.response(403, 'Acesso Negado')
+    def get(self):
+        if get_user_group(get_jwt_identity()) != GRUPO_ADMINISTRADOR:
+            internal_ns.abort(403, "Acesso negado")
+
+        return mail_queue.metrics(), 200
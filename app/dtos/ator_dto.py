@@ -2,7 +2,10 @@ from dataclasses import dataclass, field
 from datetime import date
 from typing import Optional, List, Dict, Any
 
-@dataclass
+from app.dtos.serializers import serializable
+
+@serializable
+@dataclass(slots=True)
 class AtorBaseDTO:
     nome: str
     email: str
@@ -27,33 +30,9 @@ class AtorBaseDTO:
     modalidade_ensino_id: Optional[int] = None
     status: Optional[int] = None
 
-    def to_dict(self):
-        data_dict = {}
-        for field_name in self.__dataclass_fields__.keys(): 
-            value = getattr(self, field_name)
-            if isinstance(value, date):
-                data_dict[field_name] = value.isoformat()
-            elif value is not None:
-                data_dict[field_name] = value
-        return data_dict
 
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]):
-        processed_data = data.copy()
-        for date_field in ['data_nascimento', 'data_inicio_intervencao']:
-            if date_field in processed_data and isinstance(processed_data[date_field], str):
-                try:
-                    processed_data[date_field] = date.fromisoformat(processed_data[date_field])
-                except ValueError:
-                    processed_data[date_field] = None
-        
-        valid_keys = set(cls.__dataclass_fields__.keys()) 
-        filtered_data = {k: v for k, v in processed_data.items() if k in valid_keys}
-        
-        return cls(**filtered_data)
-
-
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorCreateDTO(AtorBaseDTO):
     tipo_vinculo: Optional[int] = None
     nome_responsavel: Optional[str] = None
@@ -62,40 +41,32 @@ class AtorCreateDTO(AtorBaseDTO):
     login_responsavel: Optional[str] = None
     senha_responsavel: Optional[str] = None
 
+    # Chaves legadas do payload/planilha -> campos do DTO
+    _RENAMED_KEYS = {
+        'TIPO_VINCULO': 'tipo_vinculo',
+        'NOMER': 'nome_responsavel',
+        'EMAILR': 'email_responsavel',
+        'TELEFONECEL': 'telefone_cel_responsavel',
+        'LOGINR': 'login_responsavel',
+        'SENHAR': 'senha_responsavel',
+    }
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]):
         processed_data = data.copy()
-        for date_field in ['data_nascimento', 'data_inicio_intervencao']:
-            if date_field in processed_data and isinstance(processed_data[date_field], str):
-                try:
-                    processed_data[date_field] = date.fromisoformat(processed_data[date_field])
-                except ValueError:
-                    processed_data[date_field] = None
-
-        if 'TIPO_VINCULO' in processed_data:
-            processed_data['tipo_vinculo'] = processed_data.pop('TIPO_VINCULO')
-        if 'NOMER' in processed_data:
-            processed_data['nome_responsavel'] = processed_data.pop('NOMER')
-        if 'EMAILR' in processed_data:
-            processed_data['email_responsavel'] = processed_data.pop('EMAILR')
-        if 'TELEFONECEL' in processed_data:
-            processed_data['telefone_cel_responsavel'] = processed_data.pop('TELEFONECEL')
-        if 'LOGINR' in processed_data:
-            processed_data['login_responsavel'] = processed_data.pop('LOGINR')
-        if 'SENHAR' in processed_data:
-            processed_data['senha_responsavel'] = processed_data.pop('SENHAR')
-
-        valid_keys = set(cls.__dataclass_fields__.keys())
-        filtered_data = {k: v for k, v in processed_data.items() if k in valid_keys}
-        
-        return cls(**filtered_data)
-
-
-@dataclass
+        for legacy_key, field_name in cls._RENAMED_KEYS.items():
+            if legacy_key in processed_data:
+                processed_data[field_name] = processed_data.pop(legacy_key)
+        return cls._fields_from_dict(processed_data)
+
+
+@serializable
+@dataclass(slots=True)
 class AtorResponseDTO(AtorBaseDTO):
     id: Optional[int] = None
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorDetalhadoDTO(AtorBaseDTO):
     id: Optional[int] = None
     tipo_vinculo: Optional[int] = None
@@ -105,7 +76,7 @@ class AtorDetalhadoDTO(AtorBaseDTO):
     login_responsavel: Optional[str] = None
 
     def to_dict(self):
-        data = super().to_dict()
+        data = self._fields_to_dict()
         data['id'] = self.id
         if self.tipo_vinculo is not None:
             data['TIPO_VINCULO'] = self.tipo_vinculo
@@ -117,29 +88,31 @@ class AtorDetalhadoDTO(AtorBaseDTO):
             data['TELEFONECEL'] = self.telefone_cel_responsavel
         if self.login_responsavel is not None:
             data['LOGINR'] = self.login_responsavel
-        if self.senha_responsavel is not None:
-            data['SENHAR'] = self.senha_responsavel
         return data
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorIdNomeDTO:
     id: int
     nome: str
 
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorTipoDTO:
     id: int
     nome: str
     tipo: str
 
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorAnoSessaoDTO:
     ano_sessao: str
 
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorDadosMensageriaDTO:
     id: int
     nome: str
@@ -150,18 +123,9 @@ class AtorDadosMensageriaDTO:
     hexadecimal_foto: Optional[str]
     escola: Optional[str]
 
-    def to_dict(self):
-        data_dict = {}
-        for field_name in self.__dataclass_fields__.keys():
-            value = getattr(self, field_name)
-            if isinstance(value, date):
-                data_dict[field_name] = value.isoformat()
-            elif value is not None:
-                data_dict[field_name] = value
-        return data_dict
-
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorDadosCompletosDTO:
     id: int
     nome: str
@@ -182,57 +146,55 @@ class AtorDadosCompletosDTO:
     professor_id: Optional[int]
     psicologo_id: Optional[int]
 
-    def to_dict(self):
-        data_dict = {}
-        for field_name in self.__dataclass_fields__.keys():
-            value = getattr(self, field_name)
-            if isinstance(value, date):
-                data_dict[field_name] = value.isoformat()
-            elif value is not None:
-                data_dict[field_name] = value
-        return data_dict
 
-
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorFotoDTO:
     hexadecimal_foto: Optional[str]
 
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorByEmailDTO:
     id: int
     nome: str
     email: str
 
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorNomeImagemDTO:
     nome: str
     hexadecimal_foto: Optional[str]
 
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorNomeRsDTO:
     nome: str
 
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorEmailRawDTO:
     email: str
 
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorAutorizadoDTO:
     nome: str
 
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorUnidadeDTO:
     id: int
     nome: str
 
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorDadosPesquisaDTO:
     id: int
     nome: str
@@ -255,18 +217,9 @@ class AtorDadosPesquisaDTO:
     professor_id: Optional[int]
     psicologo_id: Optional[int]
 
-    def to_dict(self):
-        data_dict = {}
-        for field_name in self.__dataclass_fields__.keys():
-            value = getattr(self, field_name)
-            if isinstance(value, date):
-                data_dict[field_name] = value.isoformat()
-            elif value is not None:
-                data_dict[field_name] = value
-        return data_dict
-
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorDadosPesquisaAppDTO:
     responsavel: Optional[str]
     id: int
@@ -281,7 +234,8 @@ class AtorDadosPesquisaAppDTO:
     aluno: Optional[str]
 
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorAlunoPorResponsavelDTO:
     responsavel: Optional[str]
     id: int
@@ -290,7 +244,8 @@ class AtorAlunoPorResponsavelDTO:
     aluno_id: Optional[int]
 
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorFilteredGridItemDTO:
     id: int
     nome: str
@@ -305,7 +260,8 @@ class AtorFilteredGridItemDTO:
     status: Optional[str]
 
 
-@dataclass
+@serializable
+@dataclass(slots=True)
 class AtorGridItemDTO:
     id: int
     dados_ator: Optional[str]
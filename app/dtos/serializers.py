@@ -0,0 +1,174 @@
+import dataclasses
+import typing
+from collections import namedtuple
+from datetime import date
+from functools import lru_cache
+from json import dumps as _json_dumps
+from json.encoder import encode_basestring_ascii as _json_str
+from operator import attrgetter
+
+from sqlalchemy.engine import Row
+
+# Serializadores montados uma única vez para cada DTO/model/consulta: a lista de campos e o getter de cada um
+# são resolvidos na criação, sem percorrer __dataclass_fields__ ou __table__ a cada objeto.
+SERIALIZERS = {}
+
+
+def _parse_date(value):
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return None
+    return value
+
+
+def _is_date(annotation):
+    return annotation is date or date in typing.get_args(annotation)
+
+
+def serializable(cls):
+    # Aplicar depois de @dataclass(slots=True). Métodos to_dict/from_dict escritos na própria
+    # classe são preservados e podem usar _fields_to_dict/_fields_from_dict.
+    hints = typing.get_type_hints(cls)
+    campos = tuple((field.name, _is_date(hints[field.name])) for field in dataclasses.fields(cls))
+    getters = tuple((name, attrgetter(name), is_date) for name, is_date in campos)
+
+    def to_dict(self):
+        data = {}
+        for name, get, is_date in getters:
+            value = get(self)
+            if value is not None:
+                data[name] = value.isoformat() if is_date and isinstance(value, date) else value
+        return data
+
+    def from_dict(cls, data):
+        kwargs = {}
+        for name, is_date in campos:
+            if name in data:
+                kwargs[name] = _parse_date(data[name]) if is_date else data[name]
+        return cls(**kwargs)
+
+    cls._fields_to_dict = to_dict
+    cls._fields_from_dict = classmethod(from_dict)
+    if 'to_dict' not in cls.__dict__:
+        cls.to_dict = to_dict
+    if 'from_dict' not in cls.__dict__:
+        cls.from_dict = classmethod(from_dict)
+    SERIALIZERS[cls.__name__] = cls
+    return cls
+
+
+@lru_cache(maxsize=None)
+def _columns_encoder(model):
+    # Um por tabela, criado no primeiro to_dict do model
+    names = tuple(column.name for column in model.__table__.columns)
+    get = attrgetter(*names)
+    if len(names) == 1:
+        encode = lambda instance: {names[0]: get(instance)}
+    else:
+        encode = lambda instance: dict(zip(names, get(instance)))
+    SERIALIZERS[model.__name__] = encode
+    return encode
+
+
+def columns_to_dict(instance):
+    # Substitui o {c.name: getattr(self, c.name) for c in self.__table__.columns} dos models
+    return _columns_encoder(type(instance))(instance)
+
+
+_ROW_ENCODERS = {
+    'int': str,
+    'float': repr,
+    'str': _json_str,
+    'date': lambda value: '"' + value.isoformat() + '"',
+    'json': _json_dumps,
+}
+
+
+def row_encoder(name, columns):
+    # Função que recebe um Row/tupla na ordem de `columns` ([(chave, tipo)]) e devolve o objeto JSON
+    # já em bytes. Tipos: int, float, str, date e json (qualquer valor serializável).
+    campos = tuple(
+        (('{' if index == 0 else ',') + _json_str(key) + ':', _ROW_ENCODERS[kind])
+        for index, (key, kind) in enumerate(columns)
+    )
+
+    def encode(row):
+        partes = [
+            prefixo + ('null' if value is None else encode_value(value))
+            for (prefixo, encode_value), value in zip(campos, row, strict=True)
+        ]
+        partes.append('}')
+        return ''.join(partes).encode('ascii')
+
+    SERIALIZERS[name] = encode
+    return encode
+
+
+@lru_cache(maxsize=None)
+def _row_tuple(fields):
+    return namedtuple('MappedRow', fields, rename=True)
+
+
+def _fast_rows(rows):
+    # Row do SQLAlchemy resolve cada atributo pelo nome a cada acesso; uma namedtuple com os mesmos campos
+    # é montada uma vez por linha e lida por índice nos campos declarados e nas funções derivadas
+    rows = iter(rows)
+    for row in rows:
+        if not isinstance(row, Row):
+            yield row
+            yield from rows
+            return
+        make = _row_tuple(row._fields)._make
+        yield make(row)
+        for row in rows:
+            yield make(row)
+
+
+def _field_getter(key, origem, conversao):
+    # Uma função (row, item, context) -> valor por campo declarado
+    if callable(origem):
+        get = origem
+    elif isinstance(origem, str) and origem.isidentifier():
+        get = lambda row, item, context, attr=attrgetter(origem): attr(row)
+    else:
+        raise ValueError(f'Origem inválida para o campo {key!r}: {origem!r}')
+
+    if conversao is None:
+        return get
+    if conversao == 'date':
+        def get_date(row, item, context):
+            value = get(row, item, context)
+            return None if value is None else value.isoformat()
+        return get_date
+    if callable(conversao):
+        return lambda row, item, context: conversao(get(row, item, context))
+    raise ValueError(f'Conversão inválida para o campo {key!r}: {conversao!r}')
+
+
+class RowMapper:
+    # Formato de saída de um endpoint declarado uma vez, como [(chave, origem)] ou [(chave, origem, conversão)]:
+    # - origem: nome do atributo da linha, ou função (row, item, context) para campos derivados; `item` já
+    #   tem os campos declarados antes dele e `context` é o que foi passado para iter()/one();
+    # - conversão: 'date' (data em ISO) ou função aplicada ao valor do atributo (ex.: descrição por id).
+    # iter() percorre o resultado uma única vez, entregando cada registro sem montar listas intermediárias.
+    def __init__(self, name, fields):
+        self.name = name
+        self.keys = tuple(field[0] for field in fields)
+        self._fields = tuple(
+            (key, _field_getter(key, origem, conversao[0] if conversao else None))
+            for key, origem, *conversao in fields
+        )
+        SERIALIZERS[name] = self
+
+    def iter(self, rows, **context):
+        fields = self._fields
+        for row in _fast_rows(rows):
+            item = {}
+            for key, get in fields:
+                item[key] = get(row, item, context)
+            yield item
+
+    def one(self, row, **context):
+        return next(self.iter((row,), **context))
@@ -10,4 +10,7 @@ class HttpNotFoundError(NotFound):
     description = "O recurso solicitado não foi encontrado."
 
 class HttpInternalServerError(InternalServerError):
-    description = "O servidor encontrou uma condição inesperada que o impediu de atender à requisição."
\ No newline at end of file
+    description = "O servidor encontrou uma condição inesperada que o impediu de atender à requisição."
+
+class HttpQueryBudgetExceededError(InternalServerError):
+    description = "A requisição excedeu o número máximo de comandos SQL permitido (SQL_QUERY_BUDGET)."
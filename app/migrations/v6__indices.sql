@@ -0,0 +1,16 @@
+-- Índices declarados nos models (__table_args__). usuario1.email e usuario1.usuario já são UNIQUE.
+CREATE INDEX ix_ator_profissao_nome_status ON cognvox.ator (profissao_id, nome, status);
+CREATE INDEX ix_ator_unidade_profissao_nome ON cognvox.ator (unidade_id, profissao_id, nome);
+CREATE INDEX ix_ator_modalidade_nome ON cognvox.ator (modalidade_ensino_id, nome);
+CREATE INDEX ix_ator_nome_id ON cognvox.ator (nome, id);
+CREATE INDEX ix_ator_cpf ON cognvox.ator (cpf);
+
+CREATE INDEX ix_ator_vinculo_di_ator_di ON cognvox.ator_vinculo_di (ator_di_id, ator_id);
+CREATE INDEX ix_ator_vinculo_di_ator ON cognvox.ator_vinculo_di (ator_id, ator_di_id);
+
+CREATE INDEX ix_plano_trabalho_ator_di ON cognvox.plano_trabalho (ator_di_id);
+CREATE INDEX ix_plano_trabalho_psicologo_ator_di ON cognvox.plano_trabalho (ator_psicologo_id, ator_di_id);
+
+CREATE INDEX ix_quadro_psicopedagogico_ator_parecer ON cognvox.quadro_psicopedagogico (ator_id, parecer_psicologico_id);
+
+CREATE INDEX ix_seg_prod_cognvox_usuario1_cod_ordenacao ON cognvox.seg_prod_cognvox_usuario1 (cod_ordenacao);
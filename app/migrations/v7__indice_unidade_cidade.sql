@@ -0,0 +1,2 @@
+-- Filtro por cidade de get_psychologists_by_city (declarado em Unidade.__table_args__)
+CREATE INDEX ix_unidade_cidade ON cognvox.unidade (cidade);
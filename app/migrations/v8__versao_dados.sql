@@ -0,0 +1,9 @@
+-- Versões por ator/unidade usadas nos ETags (declarado em VersaoDados); linhas são criadas na primeira escrita.
+-- Toda escrita de ator incrementa também a linha 'unidade:<id>' na transação de quem escreve: a linha fica
+-- travada até o commit, então escritas concorrentes na mesma unidade passam a ser serializadas.
+-- Sem esta tabela (ou fora de MySQL/MariaDB/SQLite) a API segue funcionando, sem ETag; aplique e reinicie.
+CREATE TABLE cognvox.versao_dados (
+    escopo VARCHAR(40) NOT NULL,
+    versao BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (escopo)
+);
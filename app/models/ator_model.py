@@ -5,6 +5,15 @@ from datetime import datetime
 
 class Ator(db.Model):
     __tablename__ = 'ator'
+    # Listagens filtram por status != 2 e por profissão/unidade/modalidade ordenando por nome;
+    # o status vem depois do nome porque a desigualdade não aproveita a ordem do índice.
+    __table_args__ = (
+        db.Index('ix_ator_profissao_nome_status', 'profissao_id', 'nome', 'status'),
+        db.Index('ix_ator_unidade_profissao_nome', 'unidade_id', 'profissao_id', 'nome'),
+        db.Index('ix_ator_modalidade_nome', 'modalidade_ensino_id', 'nome'),
+        db.Index('ix_ator_nome_id', 'nome', 'id'),
+        db.Index('ix_ator_cpf', 'cpf'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     nome = db.Column(db.String(255), nullable=False)
     cpf = db.Column(db.String(14))
@@ -1,12 +1,17 @@
 from app import db
+from app.dtos.serializers import columns_to_dict
 
 class AtorVinculo(db.Model):
     __tablename__ = 'ator_vinculo_di'
+    __table_args__ = (
+        db.Index('ix_ator_vinculo_di_ator_di', 'ator_di_id', 'ator_id'),
+        db.Index('ix_ator_vinculo_di_ator', 'ator_id', 'ator_di_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     ator_id = db.Column(db.Integer, db.ForeignKey('ator.id')) 
     ator_di_id = db.Column(db.Integer, db.ForeignKey('ator.id')) 
     tipo_vinculo_id = db.Column(db.Integer, db.ForeignKey('tipo_vinculo.id'))
     tipo_vinculo = db.relationship('TipoVinculo', backref='vinculos_ator')
-    
+
     def to_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
\ No newline at end of file
+        return columns_to_dict(self)
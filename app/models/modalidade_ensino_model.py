@@ -1,4 +1,5 @@
 from app import db
+from app.dtos.serializers import columns_to_dict
 
 class ModalidadeEnsino(db.Model):
     __tablename__ = 'modalidade_ensino'
@@ -6,4 +7,4 @@ class ModalidadeEnsino(db.Model):
     descricao = db.Column(db.String(255))
 
     def to_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
\ No newline at end of file
+        return columns_to_dict(self)
@@ -1,8 +1,13 @@
 from app import db
+from app.dtos.serializers import columns_to_dict
 from datetime import date
 
 class PlanoTrabalho(db.Model):
     __tablename__ = 'plano_trabalho'
+    __table_args__ = (
+        db.Index('ix_plano_trabalho_ator_di', 'ator_di_id'),
+        db.Index('ix_plano_trabalho_psicologo_ator_di', 'ator_psicologo_id', 'ator_di_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     ator_di_id = db.Column(db.Integer, db.ForeignKey('ator.id'))
     data_inicial_interacao = db.Column(db.Date)
@@ -11,4 +16,4 @@ class PlanoTrabalho(db.Model):
     ator_psicologo_id = db.Column(db.Integer, db.ForeignKey('ator.id'))
 
     def to_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
\ No newline at end of file
+        return columns_to_dict(self)
@@ -1,7 +1,11 @@
 from app import db
+from app.dtos.serializers import columns_to_dict
 
 class QuadroPsicopedagogico(db.Model):
     __tablename__ = 'quadro_psicopedagogico'
+    __table_args__ = (
+        db.Index('ix_quadro_psicopedagogico_ator_parecer', 'ator_id', 'parecer_psicologico_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     ator_id = db.Column(db.Integer, db.ForeignKey('ator.id'))
     parecer_psicologico_id = db.Column(db.Integer, db.ForeignKey('parecer_psicologico.id'))
@@ -11,4 +15,4 @@ class QuadroPsicopedagogico(db.Model):
     parecer_psicologico = db.relationship('ParecerPsicologico', backref='quadros_psicopedagogicos')
 
     def to_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
\ No newline at end of file
+        return columns_to_dict(self)
@@ -1,4 +1,5 @@
 from app import db
+from app.dtos.serializers import columns_to_dict
 
 class SessaoObservacao(db.Model):
     __tablename__ = 'sessao_observacao'
@@ -12,4 +13,4 @@ class SessaoObservacao(db.Model):
     ator = db.relationship('Ator', backref='sessoes_observacao')
 
     def to_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
\ No newline at end of file
+        return columns_to_dict(self)
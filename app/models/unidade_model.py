@@ -1,12 +1,16 @@
 from app import db
+from app.dtos.serializers import columns_to_dict
 
 class Unidade(db.Model):
     __tablename__ = 'unidade'
+    __table_args__ = (
+        db.Index('ix_unidade_cidade', 'cidade'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     nome_instituicao = db.Column(db.String(255))
     cidade = db.Column(db.String(255))
     estado = db.Column(db.String(255))
-    logoinstituicao = db.Column(db.String(255)) 
+    logoinstituicao = db.Column(db.String(255))
 
     def to_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
\ No newline at end of file
+        return columns_to_dict(self)
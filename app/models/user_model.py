@@ -1,4 +1,5 @@
 from app import db
+from app.dtos.serializers import columns_to_dict
 
 class Usuario(db.Model):
     __tablename__ = 'usuario1' 
@@ -14,16 +15,23 @@ class Usuario(db.Model):
     primeiro_acesso = db.Column(db.Integer)
     erros_login = db.Column(db.Integer)
     ator_id = db.Column(db.Integer, db.ForeignKey('ator.id'), unique=True, nullable=False)
+
     def to_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return columns_to_dict(self)
 
 class SegProdCognvoxUsuario(db.Model):
     __tablename__ = 'seg_prod_cognvox_usuario1'
+    __table_args__ = (
+        db.Index('ix_seg_prod_cognvox_usuario1_cod_ordenacao', 'cod_ordenacao'),
+    )
     id = db.Column(db.Integer, primary_key=True) 
     usuario = db.Column(db.String(255))
     senha = db.Column(db.String(255))
     cod_status = db.Column(db.Integer)
     cod_ordenacao = db.Column(db.Integer)
+    # cod_ordenacao aponta para usuario1.codigo sem FK no banco; o relacionamento
+    # permite que o flush preencha o código do usuário principal automaticamente.
+    usuario_principal = db.relationship('Usuario', primaryjoin='foreign(SegProdCognvoxUsuario.cod_ordenacao) == Usuario.codigo')
 
     def to_dict(self):
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
\ No newline at end of file
+        return columns_to_dict(self)
@@ -0,0 +1,7 @@
+from app import db
+
+class VersaoDados(db.Model):
+    # Contador de escritas por escopo ('ator:<id>', 'unidade:<id>', 'referencia'), base dos ETags
+    __tablename__ = 'versao_dados'
+    escopo = db.Column(db.String(40), primary_key=True)
+    versao = db.Column(db.BigInteger, nullable=False, default=0)
@@ -11,16 +11,137 @@ from app.models.sessao_observacao_model import SessaoObservacao
 from app.models.tipo_vinculo_model import TipoVinculo
 from app.models.plano_trabalho_model import PlanoTrabalho
 from app.models.ator_vinculo_model import AtorVinculo
-from sqlalchemy import func, or_, and_
-from sqlalchemy.orm import aliased
+from sqlalchemy import func, or_, and_, insert, literal, union_all
+from sqlalchemy.orm import aliased, joinedload, raiseload
+
+GRID_SORT_COLUMNS = {
+    'nome': Ator.nome,
+    'idade': Ator.data_nascimento,
+    'modalidade': ModalidadeEnsino.descricao,
+    'tipo': Profissao.descricao,
+    'instituicao': Unidade.nome_instituicao,
+    'municipio': Unidade.cidade,
+    'parecer': ParecerPsicologico.descricao,
+    'status': Status.descricao
+}
+
+# As descrições vêm do cache de dados de referência; a tabela só entra na consulta quando é usada na ordenação
+GRID_SORT_JOINS = {
+    'modalidade': (ModalidadeEnsino, ModalidadeEnsino.id == Ator.modalidade_ensino_id),
+    'tipo': (Profissao, Profissao.id == Ator.profissao_id),
+    'instituicao': (Unidade, Unidade.id == Ator.unidade_id),
+    'municipio': (Unidade, Unidade.id == Ator.unidade_id),
+    'parecer': (ParecerPsicologico, ParecerPsicologico.id == QuadroPsicopedagogico.parecer_psicologico_id),
+    'status': (Status, Status.codigo == Ator.status)
+}
+
+# Campos que as listagens com projeção aceitam (todas as colunas de Ator, na ordem de Ator.to_dict)
+ATOR_CAMPOS = tuple(column.key for column in Ator.__table__.columns)
+
+
+def _keyset_after(column, descending, value, ator_id):
+    # Linhas depois de (value, ator_id) na ordem (column ASC|DESC, Ator.id). No MySQL e no SQLite o NULL
+    # vem antes de qualquer valor: primeiro na ordem crescente, por último na decrescente.
+    if value is None:
+        nulls = and_(column.is_(None), Ator.id > ator_id)
+        return nulls if descending else or_(nulls, column.isnot(None))
+    following = or_(column < value if descending else column > value, and_(column == value, Ator.id > ator_id))
+    return or_(following, column.is_(None)) if descending else following
+
+
+def _id_nome(rows):
+    return [{'id': row.id, 'nome': row.nome} for row in rows]
+
+def _chunks(values, size=1000):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
 
 class AtorRepository:
-    def get_all_atores(self):
-        return Ator.query.order_by(Ator.nome).all()
+    def _server_side_cursors(self):
+        # O pysqlite já lê o cursor sob demanda. O mysql-connector não tem cursor no servidor no SQLAlchemy
+        # (supports_server_side_cursors = False): o resultado inteiro é lido para o cliente no execute.
+        dialect = db.session.get_bind().dialect
+        return dialect.supports_server_side_cursors or dialect.name == 'sqlite'
+
+    def _stream(self, query, batch_size, keyset=None):
+        # Modo streaming das listagens sem limite. Com cursor no servidor: uma consulta lida em lotes
+        # (stream_results + yield_per). Sem ele, a consulta ordenada por (coluna, Ator.id) é lida em lotes
+        # de batch_size por chave; keyset: (coluna, descendente) da ordenação.
+        if keyset is not None and not self._server_side_cursors():
+            return self._keyset_batches(query, batch_size, *keyset)
+        return query.execution_options(stream_results=True).yield_per(batch_size)
+
+    def _keyset_batches(self, query, batch_size, column, descending):
+        # query: ordenada por (column, Ator.id), podendo repetir a chave (outer join com os quadros).
+        # Cada lote termina na última chave completa; o restante dela vem no lote seguinte.
+        if getattr(column, 'class_', None) is Ator:
+            key = column.key
+        else:
+            # Colunas de tabelas da ordenação (ex.: Unidade.cidade) vêm junto com a linha
+            key = 'chave_ordenacao'
+            query = query.add_columns(column.label(key))
+
+        after = None
+        while True:
+            batch_query = query if after is None else query.filter(_keyset_after(column, descending, *after))
+            rows = batch_query.limit(batch_size).all()
+            if len(rows) < batch_size:
+                yield from rows
+                return
+
+            last = (getattr(rows[-1], key), rows[-1].id)
+            cut = len(rows)
+            while cut and (getattr(rows[cut - 1], key), rows[cut - 1].id) == last:
+                cut -= 1
+            if cut == 0:
+                # Uma única chave ocupa o lote inteiro: lê todas as linhas dela de uma vez
+                same_key = column.is_(None) if last[0] is None else column == last[0]
+                rows = query.filter(same_key, Ator.id == last[1]).all()
+                cut = len(rows)
+            yield from rows[:cut]
+            after = (getattr(rows[cut - 1], key), rows[cut - 1].id)
+
+    def iter_all_atores(self, batch_size=1000):
+        # Listagens serializam só colunas: relacionamentos tocados por engano falham em vez de virar N+1
+        query = Ator.query.options(raiseload('*')).order_by(Ator.nome, Ator.id)
+        return self._stream(query, batch_size, keyset=(Ator.nome, False))
+
+    def get_atores_page(self, limit, after=None):
+        # Paginação por chave (nome, id): o custo de cada página independe da posição na lista
+        query = Ator.query.options(raiseload('*')).order_by(Ator.nome, Ator.id)
+        if after:
+            after_nome, after_id = after
+            query = query.filter(or_(
+                Ator.nome > after_nome,
+                and_(Ator.nome == after_nome, Ator.id > after_id)
+            ))
+        return query.limit(limit).all()
+
+    def iter_atores_rows(self, columns, batch_size=500):
+        # Paginação por (nome, id) em lotes, devolvendo só as colunas pedidas (sem montar entidades)
+        after = None
+        while True:
+            query = db.session.query(Ator.nome, Ator.id, *columns).order_by(Ator.nome, Ator.id)
+            if after:
+                query = query.filter(or_(
+                    Ator.nome > after[0],
+                    and_(Ator.nome == after[0], Ator.id > after[1])
+                ))
+            rows = query.limit(batch_size).all()
+            if not rows:
+                return
+            after = (rows[-1][0], rows[-1][1])
+            for row in rows:
+                yield row[2:]
+            if len(rows) < batch_size:
+                return
 
     def get_ator_by_id(self, ator_id):
         return Ator.query.get(ator_id)
 
+    def get_ator_with_usuario(self, ator_id):
+        return Ator.query.options(joinedload(Ator.usuario), raiseload('*')).filter(Ator.id == ator_id).first()
+
     def get_ator_by_email(self, email):
         return Ator.query.filter_by(email=email).first()
 
@@ -30,6 +151,16 @@ class AtorRepository:
     def get_ator_by_cpf(self, cpf):
         return Ator.query.filter_by(cpf=cpf).first()
 
+    def get_unique_conflicts(self, email, username, cpf=None):
+        # Uma única ida ao banco para as verificações de unicidade do cadastro
+        queries = [
+            db.select(literal('email').label('campo')).select_from(Ator).where(Ator.email == email),
+            db.select(literal('usuario').label('campo')).select_from(Usuario).where(Usuario.usuario == username)
+        ]
+        if cpf:
+            queries.append(db.select(literal('cpf').label('campo')).select_from(Ator).where(Ator.cpf == cpf))
+        return set(db.session.execute(union_all(*queries)).scalars())
+
     def add_ator(self, ator):
         db.session.add(ator)
 
@@ -54,6 +185,36 @@ class AtorRepository:
     def begin_nested(self):
         return db.session.begin_nested()
 
+    def get_existing_emails(self, emails):
+        existing = set()
+        for chunk in _chunks(list(emails)):
+            existing.update(row.email for row in Ator.query.with_entities(Ator.email).filter(Ator.email.in_(chunk)))
+            existing.update(row.email for row in Usuario.query.with_entities(Usuario.email).filter(Usuario.email.in_(chunk)))
+        return existing
+
+    def get_existing_usernames(self, usernames):
+        existing = set()
+        for chunk in _chunks(list(usernames)):
+            existing.update(row.usuario for row in Usuario.query.with_entities(Usuario.usuario).filter(Usuario.usuario.in_(chunk)))
+        return existing
+
+    def get_existing_cpfs(self, cpfs):
+        existing = set()
+        for chunk in _chunks(list(cpfs)):
+            existing.update(row.cpf for row in Ator.query.with_entities(Ator.cpf).filter(Ator.cpf.in_(chunk)))
+        return existing
+
+    def bulk_insert(self, model, rows):
+        # executemany: um único comando para todas as linhas do lote
+        if rows:
+            db.session.execute(insert(model), rows)
+
+    def get_ator_ids_by_email(self, emails):
+        return dict(Ator.query.with_entities(Ator.email, Ator.id).filter(Ator.email.in_(list(emails))).all())
+
+    def get_user_codes_by_email(self, emails):
+        return dict(Usuario.query.with_entities(Usuario.email, Usuario.codigo).filter(Usuario.email.in_(list(emails))).all())
+
     def update_plano_trabalho_by_ator_id(self, ator_id, data):
         PlanoTrabalho.query.filter_by(ator_di_id=ator_id).update(data, synchronize_session=False)
 
@@ -67,104 +228,111 @@ class AtorRepository:
         return Ator.query.filter(Ator.profissao_id == 1, Ator.status != 2).count()
 
     def get_ator_descriptions(self):
-        return Ator.query.with_entities(Ator.id, Ator.nome).order_by(Ator.id).all()
+        return _id_nome(Ator.query.with_entities(Ator.id, Ator.nome).order_by(Ator.id).all())
 
     def get_ator_combo_names(self):
         return [a.nome for a in Ator.query.with_entities(Ator.nome).order_by(Ator.nome).all()]
 
     def get_ator_combo_all(self):
-        return Ator.query.with_entities(Ator.id, Ator.nome).filter(Ator.status != 2).order_by(Ator.nome).all()
+        return _id_nome(Ator.query.with_entities(Ator.id, Ator.nome).filter(Ator.status != 2).order_by(Ator.nome).all())
 
     def get_ator_year_session(self, ator_id):
         return Ator.query.with_entities(Ator.ano_sessao).filter_by(id=ator_id).first()
 
     def get_ator_type(self, ator_id):
+        return db.session.query(Ator.id, Ator.nome, Ator.profissao_id)\
+            .filter(Ator.status != 2, Ator.id == ator_id).first()
+
+    def _grid_order(self, sort):
+        sort_column, descending = sort or ('nome', False)
+        # A idade é ordenada pela data de nascimento, em sentido inverso
+        if sort_column == 'idade':
+            descending = not descending
+        return sort_column, GRID_SORT_COLUMNS[sort_column], descending
+
+    def _apply_grid_page(self, ator_query, page=None, size=None, sort=None):
+        sort_column, order_column, descending = self._grid_order(sort)
+        if sort_column in GRID_SORT_JOINS:
+            ator_query = ator_query.outerjoin(*GRID_SORT_JOINS[sort_column])
+
+        ator_query = ator_query.order_by(order_column.desc() if descending else order_column.asc(), Ator.id)
+
+        if size:
+            ator_query = ator_query.limit(size).offset((max(page or 1, 1) - 1) * size)
+        return ator_query
+
+    def count_filtered_actors(self, query_filters):
+        # Só o quadro psicopedagógico pode repetir o ator, por isso é a única tabela da contagem
+        return db.session.query(func.count())\
+            .select_from(Ator)\
+            .outerjoin(QuadroPsicopedagogico, QuadroPsicopedagogico.ator_id == Ator.id)\
+            .filter(and_(*query_filters))\
+            .scalar()
+
+    def _filtered_actors_query(self, query_filters):
         return db.session.query(
             Ator.id,
             Ator.nome,
-            Profissao.descricao.label('tipo')
-        ).outerjoin(Profissao, Profissao.id == Ator.profissao_id)\
-        .filter(Ator.status != 2, Ator.id == ator_id).first()
-
-    def get_filtered_actors_for_caderno_atividades(self, query_filters, city_filter):
-        ator_query = db.session.query(
-            Ator.id,
-            Ator.nome,
-            func.timestampdiff(func.year, Ator.data_nascimento, func.now()).label('IDADE'),
-            Ator.hexadecimal_foto,
-            Ator.ano_sessao,
-            ModalidadeEnsino.descricao.label('MODALIDADE'),
-            Profissao.descricao.label('TIPO'),
-            Unidade.nome_instituicao.label('INSTITUICAO'),
-            Unidade.cidade.label('MUNICIPIO'),
-            ParecerPsicologico.descricao.label('PARECER'),
-            Status.descricao.label('STATUS')
-        ).outerjoin(ModalidadeEnsino, ModalidadeEnsino.id == Ator.modalidade_ensino_id)\
-        .outerjoin(Profissao, Profissao.id == Ator.profissao_id)\
-        .outerjoin(Unidade, Unidade.id == Ator.unidade_id)\
-        .outerjoin(QuadroPsicopedagogico, QuadroPsicopedagogico.ator_id == Ator.id)\
-        .outerjoin(ParecerPsicologico, ParecerPsicologico.id == QuadroPsicopedagogico.parecer_psicologico_id)\
-        .outerjoin(Status, Status.codigo == Ator.status)\
-        .filter(and_(*query_filters)).order_by(Ator.nome)
-
-        if city_filter:
-            ator_query = ator_query.filter(Unidade.cidade == city_filter)
-
-        return ator_query.all()
-
-    def get_filtered_actors_for_grid(self, query_filters, city_filter):
-        ator_query = db.session.query(
-            Ator.id,
+            Ator.data_nascimento,
             Ator.hexadecimal_foto,
-            Ator.nome,
-            func.timestampdiff(func.year, Ator.data_nascimento, func.now()).label('idade'),
             Ator.ano_sessao,
-            ModalidadeEnsino.descricao.label('modalidade'),
-            Profissao.descricao.label('tipo'),
-            Unidade.nome_instituicao.label('instituicao'),
-            Unidade.cidade.label('municipio'),
-            ParecerPsicologico.descricao.label('parecer'),
-            Status.descricao.label('status')
-        ).outerjoin(ModalidadeEnsino, Ator.modalidade_ensino_id == ModalidadeEnsino.id)\
-        .outerjoin(Profissao, Ator.profissao_id == Profissao.id)\
-        .outerjoin(Unidade, Ator.unidade_id == Unidade.id)\
-        .outerjoin(QuadroPsicopedagogico, QuadroPsicopedagogico.ator_id == Ator.id)\
-        .outerjoin(ParecerPsicologico, QuadroPsicopedagogico.parecer_psicologico_id == ParecerPsicologico.id)\
-        .outerjoin(Status, Ator.status == Status.codigo)\
-        .filter(and_(*query_filters)).order_by(Ator.nome)
-
-        if city_filter:
-            ator_query = ator_query.filter(Unidade.cidade == city_filter)
-
-        return ator_query.all()
-
-    def get_all_actors_for_grid(self):
-        return db.session.query(
+            Ator.modalidade_ensino_id,
+            Ator.profissao_id,
+            Ator.unidade_id,
+            Ator.status,
+            QuadroPsicopedagogico.parecer_psicologico_id
+        ).outerjoin(QuadroPsicopedagogico, QuadroPsicopedagogico.ator_id == Ator.id)\
+        .filter(and_(*query_filters))
+
+    def get_filtered_actors(self, query_filters, page=None, size=None, sort=None):
+        ator_query = self._filtered_actors_query(query_filters)
+        return self._apply_grid_page(ator_query, page, size, sort).all()
+
+    def iter_filtered_actors(self, query_filters, sort=None, batch_size=1000):
+        # Mesmas linhas de get_filtered_actors, sem limite, em modo streaming (_stream).
+        # A consulta só é executada quando o gerador começa a ser consumido.
+        ator_query = self._apply_grid_page(self._filtered_actors_query(query_filters), sort=sort)
+        _, order_column, descending = self._grid_order(sort)
+        yield from self._stream(ator_query, batch_size, keyset=(order_column, descending))
+
+    def iter_all_actors_for_grid(self, batch_size=1000):
+        query = db.session.query(
             Ator.id,
             Ator.nome,
             Ator.email,
             Ator.ano_sessao,
-            ModalidadeEnsino.descricao.label('modalidade'),
-            Profissao.descricao.label('tipo'),
-            Unidade.nome_instituicao.label('instituicao')
-        ).outerjoin(ModalidadeEnsino, Ator.modalidade_ensino_id == ModalidadeEnsino.id)\
-        .outerjoin(Profissao, Ator.profissao_id == Profissao.id)\
-        .outerjoin(Unidade, Ator.unidade_id == Unidade.id)\
-        .filter(Ator.status != 2).order_by(Ator.nome).all()
-
-    def get_chat_actors_by_institution(self, unidade_id):
-        atores_unidade_query = db.session.query(Ator.id, Ator.nome).filter(
-            Ator.unidade_id == unidade_id,
-            Ator.status != 2,
-            Ator.profissao_id.in_([28, 3])
-        )
-
-        atores_profissao_query = db.session.query(Ator.id, Ator.nome).filter(
+            Ator.modalidade_ensino_id,
+            Ator.profissao_id,
+            Ator.unidade_id
+        ).filter(Ator.status != 2).order_by(Ator.nome, Ator.id)
+        return self._stream(query, batch_size, keyset=(Ator.nome, False))
+
+    def get_search_rows(self):
+        # Carga do índice de busca (search_index_service)
+        return db.session.query(Ator.id, Ator.nome, Ator.email).filter(Ator.status != 2).all()
+
+    def get_stats_rows(self):
+        # Carga dos contadores do painel (stats_service): atores ativos e o parecer de todos os quadros
+        atores = db.session.query(
+            Ator.id, Ator.profissao_id, Ator.unidade_id, Ator.modalidade_ensino_id
+        ).filter(Ator.status != 2).all()
+        pareceres = db.session.query(
+            QuadroPsicopedagogico.id, QuadroPsicopedagogico.ator_id, QuadroPsicopedagogico.parecer_psicologico_id
+        ).all()
+        return atores, pareceres
+
+    def get_membership_rows(self):
+        # Carga do índice de papéis: equipe/administradores do chat, interacionais e quem tem vínculo com um DI
+        vinculado = db.session.query(AtorVinculo.id).filter(AtorVinculo.ator_id == Ator.id).exists()
+        return db.session.query(
+            Ator.id, Ator.nome, Ator.unidade_id, Ator.profissao_id
+        ).filter(
             Ator.status != 2,
-            Ator.profissao_id == 100
-        )
+            or_(Ator.profissao_id.in_([2, 3, 28, 100]), vinculado)
+        ).all()
 
-        return atores_unidade_query.union(atores_profissao_query).order_by(Ator.nome).all()
+    def get_vinculo_rows(self):
+        return db.session.query(AtorVinculo.id, AtorVinculo.ator_id).filter(AtorVinculo.ator_id.isnot(None)).all()
 
     def get_ator_name(self, ator_id):
         return Ator.query.with_entities(Ator.nome).filter_by(id=ator_id).first()
@@ -176,13 +344,11 @@ class AtorRepository:
             Ator.data_nascimento,
             Ator.telefone_cel,
             Ator.email,
-            func.timestampdiff(func.year, Ator.data_nascimento, func.now()).label('IDADE'),
             Ator.hexadecimal_foto,
-            Unidade.nome_instituicao.label('ESCOLA')
-        ).outerjoin(Unidade, Unidade.id == Ator.unidade_id)\
-        .filter(Ator.id == ator_id).first()
+            Ator.unidade_id
+        ).filter(Ator.id == ator_id).first()
 
-    def get_complete_ator_data(self, ator_id):
+    def _complete_ator_data_query(self):
         AtorResponsavel = aliased(Ator)
         AtorInteracional = aliased(Ator)
         AtorProfessor = aliased(Ator)
@@ -193,9 +359,8 @@ class AtorRepository:
             Ator.nome,
             Ator.data_nascimento,
             Ator.telefone_cel,
-            func.timestampdiff(func.year, Ator.data_nascimento, func.now()).label('IDADE'),
             Ator.hexadecimal_foto,
-            func.concat(AtorResponsavel.nome, ' ', TipoVinculo.descricao).label('RESPONSAVEL'),
+            (AtorResponsavel.nome + ' ' + TipoVinculo.descricao).label('RESPONSAVEL'),
             PlanoTrabalho.data_inicial_interacao.label('DATAINICIO'),
             AtorInteracional.nome.label('PARINTERACIONAL'),
             AtorProfessor.nome.label('PROFESSOR'),
@@ -214,8 +379,25 @@ class AtorRepository:
         .outerjoin(AtorInteracional, AtorInteracional.id == PlanoTrabalho.ator_interacional_id)\
         .outerjoin(AtorProfessor, AtorProfessor.id == PlanoTrabalho.ator_professor_id)\
         .outerjoin(AtorPsicologo, AtorPsicologo.id == PlanoTrabalho.ator_psicologo_id)\
-        .outerjoin(Unidade, Unidade.id == Ator.unidade_id)\
-        .filter(Ator.id == ator_id).first()
+        .outerjoin(Unidade, Unidade.id == Ator.unidade_id)
+
+    def get_complete_ator_data(self, ator_id):
+        return self._complete_ator_data_query().filter(Ator.id == ator_id).first()
+
+    def iter_complete_ator_data(self, ator_ids=None, unidade_id=None, batch_size=500):
+        # Uma única consulta para o lote; como no endpoint individual, só a primeira
+        # linha de cada ator (vínculo/plano) é devolvida.
+        query = self._complete_ator_data_query()
+        if ator_ids is not None:
+            query = query.filter(Ator.id.in_(ator_ids))
+        else:
+            query = query.filter(Ator.unidade_id == unidade_id, Ator.profissao_id == 1, Ator.status != 2)
+
+        last_id = None
+        for row in query.order_by(Ator.nome, Ator.id).yield_per(batch_size):
+            if row.id != last_id:
+                last_id = row.id
+                yield row
 
     def get_ator_photo_hex(self, ator_id):
         return Ator.query.with_entities(Ator.hexadecimal_foto).filter_by(id=ator_id).first()
@@ -259,16 +441,15 @@ class AtorRepository:
         return db.session.query(
             Ator.id, Ator.nome, Ator.data_nascimento, Ator.hexadecimal_foto,
             Ator.data_inicio_intervencao, Ator.ano_sessao,
-            func.concat(AtorResponsavel.nome, ' ', TipoVinculo.descricao).label('RESPONSAVEL'),
+            (AtorResponsavel.nome + ' ' + TipoVinculo.descricao).label('RESPONSAVEL'),
             PlanoTrabalho.data_inicial_interacao.label('DATAINICIO'),
-            (func.timestampdiff(func.year, Ator.data_nascimento, func.now())).label('IDADE'),
             AtorInteracional.nome.label('PARINTERACIONAL'),
             AtorProfessor.nome.label('PROFESSOR'),
             AtorPsicologo.nome.label('PSICOLOGO'),
             AtorPsicologo.email.label('EMAILPSICOLOGO'),
             AtorPsicologo.id.label('CODIGOPSICOLOGO'),
             Unidade.nome_instituicao.label('INSTITUICAO'),
-            func.concat(Unidade.cidade, '-', Unidade.estado).label('MUNICIPIO'),
+            (Unidade.cidade + '-' + Unidade.estado).label('MUNICIPIO'),
             AtorVinculo.ator_id.label('RESPONSAVELID'),
             PlanoTrabalho.ator_interacional_id.label('PARINTERACIONALID'),
             PlanoTrabalho.ator_professor_id.label('PROFESSORID'),
@@ -322,52 +503,36 @@ class AtorRepository:
         ).outerjoin(AtorVinculo, AtorVinculo.ator_id == Ator.id)\
         .filter(Ator.id == ator_id).first()
 
-    def get_all_students_di(self):
-        return Ator.query.filter(Ator.profissao_id == 1, Ator.status != 2)\
-            .order_by(Ator.nome).all()
-
-    def get_interacional_actors(self):
-        atores_profissao_2_query = db.session.query(Ator.id, Ator.nome).filter(
-            Ator.status != 2,
-            Ator.profissao_id == 2
-        )
-
-        atores_vinculo_di_query = db.session.query(Ator.id, Ator.nome).join(
-            AtorVinculo, Ator.id == AtorVinculo.ator_id
-        )
-
-        return atores_profissao_2_query.union(atores_vinculo_di_query).order_by(Ator.nome).all()
-
-    def get_psychologists_by_city(self, city):
-        unidade_ids_subquery = db.session.query(Unidade.id).filter(Unidade.cidade == city).subquery()
-
-        ator_di_ids_subquery = db.session.query(Ator.id).filter(
-            Ator.status != 2,
-            Ator.profissao_id == 1,
-            Ator.unidade_id.in_(unidade_ids_subquery)
-        ).subquery()
-
-        psicologo_ids_subquery = db.session.query(PlanoTrabalho.ator_psicologo_id).filter(
-            PlanoTrabalho.ator_di_id.in_(ator_di_ids_subquery)
-        ).group_by(PlanoTrabalho.ator_psicologo_id).subquery()
-
-        return db.session.query(Ator.id, Ator.nome).filter(
-            Ator.id.in_(psicologo_ids_subquery)
-        ).order_by(Ator.nome).all()
-
-    def get_all_psychologists(self):
-        return Ator.query.filter(Ator.profissao_id == 3, Ator.status != 2)\
-            .order_by(Ator.nome).all()
-
-    def get_all_professors(self):
-        return Ator.query.filter(Ator.profissao_id == 4, Ator.status != 2)\
-            .order_by(Ator.nome).all()
-
-    def get_all_responsibles(self):
-        return Ator.query.filter(
-            Ator.profissao_id.notin_([1, 2, 3, 4]),
-            Ator.status != 2
-        ).order_by(Ator.nome).all()
+    def project_atores(self, campos, *criteria):
+        # Só as colunas pedidas, como Row (tupla nomeada): sem identity map nem instrumentação do ORM.
+        # Com (id, nome) os índices ix_ator_profissao_nome_status/ix_ator_nome_id cobrem a consulta inteira.
+        return db.session.query(*(getattr(Ator, campo) for campo in campos))\
+            .filter(*criteria).order_by(Ator.nome).all()
+
+    def get_all_students_di(self, campos=ATOR_CAMPOS):
+        return [row._asdict() for row in self.project_atores(campos, Ator.profissao_id == 1, Ator.status != 2)]
+
+    def get_psychologists_by_city(self, cidades):
+        # Um único JOIN agrupado: unidades da cidade -> alunos DI ativos -> planos de trabalho -> psicólogos
+        aluno = aliased(Ator)
+        return _id_nome(db.session.query(Ator.id, Ator.nome)
+            .join(PlanoTrabalho, PlanoTrabalho.ator_psicologo_id == Ator.id)
+            .join(aluno, and_(aluno.id == PlanoTrabalho.ator_di_id, aluno.profissao_id == 1, aluno.status != 2))
+            .join(Unidade, Unidade.id == aluno.unidade_id)
+            .filter(Unidade.cidade.in_(cidades))
+            .group_by(Ator.id, Ator.nome)
+            .order_by(Ator.nome).all())
+
+    def get_all_psychologists(self, campos=ATOR_CAMPOS):
+        return [row._asdict() for row in self.project_atores(campos, Ator.profissao_id == 3, Ator.status != 2)]
+
+    def get_all_professors(self, campos=ATOR_CAMPOS):
+        return [row._asdict() for row in self.project_atores(campos, Ator.profissao_id == 4, Ator.status != 2)]
+
+    def get_all_responsibles(self, campos=ATOR_CAMPOS):
+        return [row._asdict() for row in self.project_atores(
+            campos, Ator.profissao_id.notin_([1, 2, 3, 4]), Ator.status != 2
+        )]
 
     def get_user_module_items_by_ator_id(self, ator_id):
         return db.session.query(
@@ -0,0 +1,32 @@
+from app import db
+from app.models.unidade_model import Unidade
+from app.models.modalidade_ensino_model import ModalidadeEnsino
+from app.models.profissao_model import Profissao
+from app.models.parecer_psicologico_model import ParecerPsicologico
+from app.models.status_model import Status
+from app.models.tipo_vinculo_model import TipoVinculo
+
+class ReferenceDataRepository:
+    def get_profissoes(self):
+        return db.session.query(Profissao.id, Profissao.descricao).all()
+
+    def get_modalidades_ensino(self):
+        return db.session.query(ModalidadeEnsino.id, ModalidadeEnsino.descricao).all()
+
+    def get_pareceres_psicologicos(self):
+        return db.session.query(ParecerPsicologico.id, ParecerPsicologico.descricao).all()
+
+    def get_status(self):
+        return db.session.query(Status.codigo, Status.descricao).all()
+
+    def get_tipos_vinculo(self):
+        return db.session.query(TipoVinculo.id, TipoVinculo.descricao).all()
+
+    def get_unidades(self):
+        return db.session.query(
+            Unidade.id,
+            Unidade.nome_instituicao,
+            Unidade.cidade,
+            Unidade.estado,
+            Unidade.logoinstituicao
+        ).all()
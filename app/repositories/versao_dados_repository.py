@@ -0,0 +1,57 @@
+from sqlalchemy import func, inspect, or_, select
+from sqlalchemy.dialects import mysql, sqlite
+
+from app.models.ator_model import Ator
+from app.models.ator_vinculo_model import AtorVinculo
+from app.models.plano_trabalho_model import PlanoTrabalho
+from app.models.versao_dados_model import VersaoDados
+
+# Dialetos com INSERT ... ON DUPLICATE KEY / ON CONFLICT
+_UPSERTS = {
+    'mysql': lambda rows: mysql.insert(VersaoDados).values(rows).on_duplicate_key_update(versao=VersaoDados.versao + 1),
+    'mariadb': lambda rows: mysql.insert(VersaoDados).values(rows).on_duplicate_key_update(versao=VersaoDados.versao + 1),
+    'sqlite': lambda rows: sqlite.insert(VersaoDados).values(rows).on_conflict_do_update(
+        index_elements=[VersaoDados.escopo], set_={'versao': VersaoDados.versao + 1}
+    ),
+}
+
+
+class VersaoDadosRepository:
+    # Recebe a sessão explicitamente: também é usado dentro dos eventos de flush
+    def supports(self, dialect_name):
+        return dialect_name in _UPSERTS
+
+    def table_exists(self, session):
+        # Pela conexão da própria transação: também é chamado dentro dos eventos de flush
+        return inspect(session.connection()).has_table(VersaoDados.__tablename__)
+
+    def increment(self, session, escopos):
+        # Ordenados para que transações concorrentes travem as linhas na mesma ordem
+        rows = [{'escopo': escopo, 'versao': 1} for escopo in sorted(escopos)]
+        session.execute(_UPSERTS[session.get_bind().dialect.name](rows))
+
+    def get_versions(self, session, escopos):
+        return dict(session.execute(
+            select(VersaoDados.escopo, VersaoDados.versao).where(VersaoDados.escopo.in_(list(escopos)))
+        ).all())
+
+    def get_prefix_version(self, session, prefixo):
+        # Soma e quantidade só crescem: qualquer incremento ou escopo novo muda o par
+        return tuple(session.execute(
+            select(func.count(), func.coalesce(func.sum(VersaoDados.versao), 0))
+            .where(VersaoDados.escopo.like(f'{prefixo}%'))
+        ).one())
+
+    def get_unidade_ids(self, session, ator_ids):
+        return set(session.execute(select(Ator.unidade_id).where(Ator.id.in_(list(ator_ids)))).scalars())
+
+    def get_dependent_ator_ids(self, session, ator_ids):
+        # Alunos cujos dados completos mostram o nome destes atores (responsável, par interacional, professor, psicólogo)
+        ator_ids = list(ator_ids)
+        vinculos = select(AtorVinculo.ator_di_id).where(AtorVinculo.ator_id.in_(ator_ids))
+        planos = select(PlanoTrabalho.ator_di_id).where(or_(
+            PlanoTrabalho.ator_interacional_id.in_(ator_ids),
+            PlanoTrabalho.ator_professor_id.in_(ator_ids),
+            PlanoTrabalho.ator_psicologo_id.in_(ator_ids),
+        ))
+        return set(session.execute(vinculos.union(planos)).scalars())
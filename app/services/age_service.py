@@ -0,0 +1,8 @@
+from datetime import date
+
+
+def calculate_age(birth_date, today=None):
+    if birth_date is None:
+        return None
+    today = today or date.today()
+    return today.year - birth_date.year - ((birth_date.month, birth_date.day) > (today.month, today.day))
@@ -0,0 +1,275 @@
+from app.models.ator_model import Ator
+from app.models.user_model import Usuario, SegProdCognvoxUsuario
+from app.models.ator_vinculo_model import AtorVinculo
+from app.services.auth_service import base64_encode_py, invalidate_user_group
+from app.services.query_cache_service import query_cache
+from app.services.search_index_service import search_index
+from app.services.membership_index_service import membership_index
+from app.services.stats_service import ator_stats
+from app.services.data_version_service import data_version
+from app.services.ator_service import AtorService
+from app.services.mail_queue_service import dispatch_email
+from app.validators.ator_validator import validate_ator_data, validate_vinculo_data
+from app.dtos.ator_dto import AtorCreateDTO
+from app.exceptions.custom_exceptions import HttpBadRequestError
+from app.repositories.ator_repository import AtorRepository
+from flask import current_app
+from datetime import date
+import csv
+import io
+import json
+import sys
+
+
+class AtorImportService:
+    def __init__(self):
+        self.ator_repository = AtorRepository()
+        self.ator_service = AtorService()
+
+    def parse_csv(self, content):
+        reader = csv.DictReader(io.StringIO(content), delimiter=self._detect_delimiter(content))
+        return [(reader.line_num, dict(row)) for row in reader]
+
+    def _detect_delimiter(self, content):
+        header = content.split('\n', 1)[0]
+        return ';' if header.count(';') > header.count(',') else ','
+
+    def parse_jsonl(self, content):
+        rows = []
+        for line_number, line in enumerate(content.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                raise HttpBadRequestError(f'Linha {line_number} não é um JSON válido: {e}')
+            if not isinstance(row, dict):
+                raise HttpBadRequestError(f'Linha {line_number} deve ser um objeto JSON')
+            rows.append((line_number, row))
+        return rows
+
+    def _normalize_row(self, raw_row):
+        row = {}
+        for key, value in raw_row.items():
+            if key is None:
+                continue
+            if isinstance(value, str):
+                value = value.strip()
+            row[key.strip()] = None if value == '' else value
+        return row
+
+    def _validate_row(self, row):
+        errors = []
+        is_valid, error_message = validate_ator_data(row)
+        if not is_valid:
+            errors.append(error_message)
+
+        for field in ('grupo_usuario', 'TIPO_VINCULO'):
+            if row.get(field) is not None:
+                try:
+                    row[field] = int(row[field])
+                except (TypeError, ValueError):
+                    errors.append(f"Campo '{field}' deve ser um número inteiro válido.")
+        if row.get('grupo_usuario') is None:
+            errors.append("Campo obrigatório 'grupo_usuario' ausente ou vazio.")
+        if errors:
+            return None, errors
+
+        ator_dto = AtorCreateDTO.from_dict(row)
+        if ator_dto.tipo_vinculo:
+            is_valid_vinculo, vinculo_error = validate_vinculo_data({
+                'NOMER': ator_dto.nome_responsavel,
+                'EMAILR': ator_dto.email_responsavel,
+                'TELEFONECEL': ator_dto.telefone_cel_responsavel,
+                'TIPO_VINCULO': ator_dto.tipo_vinculo,
+                'UNIDADEID': ator_dto.unidade_id
+            })
+            if not is_valid_vinculo:
+                errors.append(f"Erro nos dados do vínculo: {vinculo_error}")
+            elif not ator_dto.login_responsavel or not ator_dto.senha_responsavel:
+                errors.append("Erro nos dados do vínculo: 'LOGINR' e 'SENHAR' são obrigatórios.")
+        return ator_dto, errors
+
+    def _unique_keys(self, ator_dto):
+        emails = [ator_dto.email]
+        usernames = [ator_dto.usuario]
+        if ator_dto.tipo_vinculo:
+            emails.append(ator_dto.email_responsavel)
+            usernames.append(ator_dto.login_responsavel)
+        return emails, usernames, [ator_dto.cpf] if ator_dto.cpf else []
+
+    def _check_duplicates(self, valid_rows, errors_by_line):
+        seen_emails, seen_usernames, seen_cpfs = set(), set(), set()
+        for line_number, ator_dto in list(valid_rows.items()):
+            emails, usernames, cpfs = self._unique_keys(ator_dto)
+            row_errors = []
+            if len(set(emails)) < len(emails) or seen_emails.intersection(emails):
+                row_errors.append('E-mail repetido no arquivo de importação.')
+            if len(set(usernames)) < len(usernames) or seen_usernames.intersection(usernames):
+                row_errors.append('Nome de usuário repetido no arquivo de importação.')
+            if seen_cpfs.intersection(cpfs):
+                row_errors.append('CPF repetido no arquivo de importação.')
+            seen_emails.update(emails)
+            seen_usernames.update(usernames)
+            seen_cpfs.update(cpfs)
+            if row_errors:
+                errors_by_line[line_number] = row_errors
+                del valid_rows[line_number]
+
+        existing_emails = self.ator_repository.get_existing_emails(seen_emails)
+        existing_usernames = self.ator_repository.get_existing_usernames(seen_usernames)
+        existing_cpfs = self.ator_repository.get_existing_cpfs(seen_cpfs)
+
+        for line_number, ator_dto in list(valid_rows.items()):
+            emails, usernames, cpfs = self._unique_keys(ator_dto)
+            row_errors = []
+            if existing_emails.intersection(emails):
+                row_errors.append('Já existe esse email cadastrado em nossos registros!')
+            if existing_usernames.intersection(usernames):
+                row_errors.append('Já existe um usuário com este nome de usuário cadastrado!')
+            if existing_cpfs.intersection(cpfs):
+                row_errors.append('Já existe esse CPF cadastrado em nossos registros!')
+            if row_errors:
+                errors_by_line[line_number] = row_errors
+                del valid_rows[line_number]
+
+    def _ator_row(self, **values):
+        row = {column.key: None for column in Ator.__table__.columns if column.key != 'id'}
+        row.update(values)
+        return row
+
+    def _usuario_row(self, usuario, senha, unidade_id, nome, email, grupo_usuario, ator_id):
+        return {
+            'usuario': usuario,
+            'senha': base64_encode_py(senha),
+            'cod_empresa': unidade_id,
+            'nome': nome,
+            'email': email,
+            'cod_status': 1,
+            'cod_grupo_usuario': grupo_usuario,
+            'cod_nivel': 1,
+            'primeiro_acesso': 1,
+            'erros_login': 0,
+            'ator_id': ator_id
+        }
+
+    def _insert_chunk(self, chunk, data_inicio_padrao):
+        ator_rows = []
+        for ator_dto in chunk:
+            ator_rows.append(self._ator_row(
+                nome=ator_dto.nome, cpf=ator_dto.cpf, data_nascimento=ator_dto.data_nascimento,
+                data_inicio_intervencao=ator_dto.data_inicio_intervencao or data_inicio_padrao,
+                reg_profissional=ator_dto.reg_profissional, email=ator_dto.email,
+                telefone_cel=ator_dto.telefone_cel, telefone_fixo=ator_dto.telefone_fixo,
+                idioma_id=ator_dto.idioma_id, unidade_id=ator_dto.unidade_id, profissao_id=ator_dto.profissao_id,
+                endereco=ator_dto.endereco, cidade=ator_dto.cidade, estado=ator_dto.estado, pais=ator_dto.pais,
+                hexadecimal_foto=ator_dto.hexadecimal_foto or '', modalidade_ensino_id=ator_dto.modalidade_ensino_id,
+                status=ator_dto.status, ano_sessao=ator_dto.ano_sessao
+            ))
+            if ator_dto.tipo_vinculo:
+                ator_rows.append(self._ator_row(
+                    nome=ator_dto.nome_responsavel, data_inicio_intervencao=ator_dto.data_inicio_intervencao or data_inicio_padrao,
+                    data_nascimento=data_inicio_padrao, email=ator_dto.email_responsavel,
+                    telefone_cel=ator_dto.telefone_cel_responsavel, idioma_id=ator_dto.idioma_id,
+                    unidade_id=ator_dto.unidade_id, profissao_id=28, endereco=ator_dto.endereco,
+                    cidade=ator_dto.cidade, estado=ator_dto.estado, pais=ator_dto.pais,
+                    modalidade_ensino_id=ator_dto.modalidade_ensino_id, status=ator_dto.status, ano_sessao=1
+                ))
+        self.ator_repository.bulk_insert(Ator, ator_rows)
+
+        emails = [row['email'] for row in ator_rows]
+        ator_ids = self.ator_repository.get_ator_ids_by_email(emails)
+
+        user_rows = []
+        for ator_dto in chunk:
+            user_rows.append(self._usuario_row(
+                ator_dto.usuario, ator_dto.senha, ator_dto.unidade_id, ator_dto.nome,
+                ator_dto.email, ator_dto.grupo_usuario, ator_ids[ator_dto.email]
+            ))
+            if ator_dto.tipo_vinculo:
+                user_rows.append(self._usuario_row(
+                    ator_dto.login_responsavel, ator_dto.senha_responsavel, ator_dto.unidade_id,
+                    ator_dto.nome_responsavel, ator_dto.email_responsavel, ator_dto.grupo_usuario,
+                    ator_ids[ator_dto.email_responsavel]
+                ))
+        self.ator_repository.bulk_insert(Usuario, user_rows)
+
+        user_codes = self.ator_repository.get_user_codes_by_email(emails)
+        sec_user_rows = []
+        vinculo_rows = []
+        for ator_dto in chunk:
+            sec_user_rows.append({
+                'usuario': base64_encode_py(ator_dto.usuario),
+                'senha': base64_encode_py(ator_dto.senha),
+                'cod_status': 1,
+                'cod_ordenacao': user_codes[ator_dto.email]
+            })
+            if ator_dto.tipo_vinculo:
+                sec_user_rows.append({
+                    'usuario': base64_encode_py(ator_dto.login_responsavel),
+                    'senha': base64_encode_py(ator_dto.senha_responsavel),
+                    'cod_status': 1,
+                    'cod_ordenacao': user_codes[ator_dto.email_responsavel]
+                })
+                vinculo_rows.append({
+                    'ator_id': ator_ids[ator_dto.email_responsavel],
+                    'ator_di_id': ator_ids[ator_dto.email],
+                    'tipo_vinculo_id': ator_dto.tipo_vinculo
+                })
+        self.ator_repository.bulk_insert(SegProdCognvoxUsuario, sec_user_rows)
+        self.ator_repository.bulk_insert(AtorVinculo, vinculo_rows)
+        # Inserções em lote não passam pelos eventos da sessão
+        data_version.touch(unidade_ids={ator_dto.unidade_id for ator_dto in chunk})
+        return emails
+
+    def import_atores(self, raw_rows, request_url_root):
+        max_rows = current_app.config['ATOR_IMPORT_MAX_ROWS']
+        if len(raw_rows) > max_rows:
+            raise HttpBadRequestError(f'A importação aceita no máximo {max_rows} linhas por requisição')
+
+        errors_by_line = {}
+        valid_rows = {}
+        for line_number, raw_row in raw_rows:
+            ator_dto, row_errors = self._validate_row(self._normalize_row(raw_row))
+            if row_errors:
+                errors_by_line[line_number] = row_errors
+            else:
+                valid_rows[line_number] = ator_dto
+
+        self._check_duplicates(valid_rows, errors_by_line)
+
+        chunk_size = current_app.config['ATOR_IMPORT_CHUNK_SIZE']
+        data_inicio_padrao = date.today()
+        imported = []
+        lines = list(valid_rows)
+        for start in range(0, len(lines), chunk_size):
+            chunk_lines = lines[start:start + chunk_size]
+            chunk = [valid_rows[line_number] for line_number in chunk_lines]
+            try:
+                emails = self._insert_chunk(chunk, data_inicio_padrao)
+                self.ator_repository.commit()
+                invalidate_user_group(*emails)
+                imported.extend(chunk)
+            except Exception as e:
+                self.ator_repository.rollback()
+                print(f"Erro ao importar lote de atores: {e}", file=sys.stderr)
+                for line_number in chunk_lines:
+                    errors_by_line[line_number] = [f'Erro ao gravar o lote no banco de dados: {str(e)}']
+
+        if imported:
+            query_cache.invalidate()
+            # Inserções em lote não passam pelos eventos da sessão: recarrega os índices e os contadores no próximo uso
+            search_index.invalidate()
+            membership_index.invalidate()
+            ator_stats.invalidate()
+
+        for ator_dto in imported:
+            if ator_dto.status != 2:
+                subject, body = self.ator_service._build_access_email(ator_dto.usuario, ator_dto.senha, ator_dto.email, request_url_root)
+                dispatch_email(ator_dto.email, None, "suporte@cognivox.net", subject, body)
+
+        return {
+            'total': len(raw_rows),
+            'importados': len(imported),
+            'erros': [{'linha': line_number, 'erros': errors_by_line[line_number]} for line_number in sorted(errors_by_line)]
+        }
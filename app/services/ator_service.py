@@ -1,15 +1,169 @@
 from app.models.ator_model import Ator
 from app.models.user_model import Usuario, SegProdCognvoxUsuario
 from app.models.ator_vinculo_model import AtorVinculo
-from app.services.auth_service import base64_encode_py, remove_accents_py, send_email_py
+from app.models.plano_trabalho_model import PlanoTrabalho
+from app.services.auth_service import base64_encode_py, remove_accents_py, invalidate_user_group
 from app.validators.ator_validator import validate_ator_data, validate_vinculo_data
 from app.dtos.ator_dto import AtorCreateDTO, AtorBaseDTO, AtorDetalhadoDTO
+from app.dtos.serializers import row_encoder, RowMapper
 from app.exceptions.custom_exceptions import HttpConflictError, HttpBadRequestError, HttpInternalServerError, HttpNotFoundError
-from app.repositories.ator_repository import AtorRepository 
+from app.repositories.ator_repository import AtorRepository, GRID_SORT_COLUMNS, ATOR_CAMPOS
+from app.services.reference_data_service import reference_data
+from app.services.foto_service import foto_url, foto_url_expression
+from app.services.mail_queue_service import dispatch_email
+from app.services.age_service import calculate_age
+from app.services.query_cache_service import query_cache, cached_query
+from app.services.membership_index_service import membership_index
+from app.services.search_index_service import search_index
+from app.services.stats_service import ator_stats
+from app.services.data_version_service import data_version
+from flask import current_app
 from datetime import datetime, date
 from sqlalchemy.exc import IntegrityError
+import base64
+import json
 import sys
 
+# Colunas da listagem de atores (mesmas chaves de Ator.to_dict, com foto_url no lugar da foto)
+ATOR_LIST_COLUMNS = (
+    (Ator.id, 'int'),
+    (Ator.nome, 'str'),
+    (Ator.cpf, 'str'),
+    (Ator.ano_sessao, 'str'),
+    (Ator.data_nascimento, 'date'),
+    (Ator.data_inicio_intervencao, 'date'),
+    (Ator.reg_profissional, 'str'),
+    (Ator.email, 'str'),
+    (Ator.telefone_cel, 'str'),
+    (Ator.telefone_fixo, 'str'),
+    (Ator.idioma_id, 'int'),
+    (Ator.unidade_id, 'int'),
+    (Ator.profissao_id, 'int'),
+    (Ator.endereco, 'str'),
+    (Ator.cidade, 'str'),
+    (Ator.estado, 'str'),
+    (Ator.pais, 'str'),
+    (Ator.modalidade_ensino_id, 'int'),
+    (Ator.status, 'int'),
+    (foto_url_expression(Ator.id, Ator.hexadecimal_foto).label('foto_url'), 'str'),
+)
+encode_ator_list_row = row_encoder('ator_list_row', [(column.key, kind) for column, kind in ATOR_LIST_COLUMNS])
+
+
+def _idade(row, item, context):
+    return calculate_age(row.data_nascimento, context['today'])
+
+
+def _dados_ator_idade(row, item, context):
+    dados_ator = f"{row.nome}<br>{item['idade']} anos"
+    if row.ano_sessao not in [None, ""]:
+        dados_ator += f"<br>SESSÃO ANO:{row.ano_sessao}"
+    return dados_ator
+
+
+def _dados_ator_email(row, item, context):
+    dados_ator = f"{row.nome}<br>{row.email}"
+    if row.ano_sessao:
+        dados_ator += f"<br>Sessões ano:{row.ano_sessao}"
+    return dados_ator
+
+
+def _foto_caderno(row, item, context):
+    if row.hexadecimal_foto and len(row.hexadecimal_foto) > 3:
+        return f'<img class="image-2" src="/md_arquivos/upload/deposito/{row.hexadecimal_foto}">'
+    return '<img class="image-2" src="/images/aluno_default.png">'
+
+
+def _foto_grid(row, item, context):
+    if row.hexadecimal_foto:
+        return f'<div class="col-md-12 justify-content-center"><img class="image-2 col-md-10" src="/md_arquivos/upload/deposito/{row.hexadecimal_foto}"></div>'
+    return '<div class="col-md-12 justify-content-center"><img class="image-2 col-md-10" src="/images/aluno_default.png"></div>'
+
+
+def _foto_url(row, item, context):
+    return foto_url(row.id) if row.hexadecimal_foto else None
+
+
+def _filtered_grid_fields(foto):
+    # Linhas de AtorRepository.get_filtered_actors -> ator_filtered_grid_item_model
+    return (
+        ('id', 'id'),
+        ('nome', 'nome'),
+        ('idade', _idade),
+        ('foto', foto),
+        ('dados_ator', _dados_ator_idade),
+        ('modalidade', 'modalidade_ensino_id', reference_data.modalidade_ensino),
+        ('tipo', 'profissao_id', reference_data.profissao),
+        ('instituicao', 'unidade_id', reference_data.nome_instituicao),
+        ('municipio', 'unidade_id', reference_data.cidade),
+        ('parecer', 'parecer_psicologico_id', reference_data.parecer_psicologico),
+        ('status', 'status', reference_data.status),
+        ('foto_url', _foto_url),
+    )
+
+
+CADERNO_ATIVIDADES_MAPPER = RowMapper('caderno_atividades_item', _filtered_grid_fields(_foto_caderno))
+GRID_FILTRO_MAPPER = RowMapper('grid_filtro_item', _filtered_grid_fields(_foto_grid))
+
+# Linhas de AtorRepository.iter_filtered_actors -> exportação do caderno de atividades (chaves = cabeçalho)
+CADERNO_ATIVIDADES_EXPORT_MAPPER = RowMapper('caderno_atividades_export', (
+    ('ID', 'id'),
+    ('Nome', 'nome'),
+    ('Idade', _idade),
+    ('Ano da sessão', 'ano_sessao'),
+    ('Modalidade', 'modalidade_ensino_id', reference_data.modalidade_ensino),
+    ('Tipo', 'profissao_id', reference_data.profissao),
+    ('Instituição', 'unidade_id', reference_data.nome_instituicao),
+    ('Município', 'unidade_id', reference_data.cidade),
+    ('Parecer', 'parecer_psicologico_id', reference_data.parecer_psicologico),
+    ('Status', 'status', reference_data.status),
+))
+
+# Linhas de AtorRepository.get_all_actors_for_grid -> ator_grid_item_model
+GRID_MAPPER = RowMapper('grid_item', (
+    ('id', 'id'),
+    ('dados_ator', _dados_ator_email),
+    ('modalidade', 'modalidade_ensino_id', reference_data.modalidade_ensino),
+    ('tipo', 'profissao_id', reference_data.profissao),
+    ('instituicao', 'unidade_id', reference_data.nome_instituicao),
+))
+
+# Linha de AtorRepository.get_user_module_items_by_ator_id -> itens do módulo do usuário
+_MODULE_ITEMS_FIELDS = (
+    ('ID', 'id'),
+    ('NOME', 'nome'),
+    ('CPF', 'cpf'),
+    ('ANO_SESSAO', 'ano_sessao'),
+    ('DATANASCIMENTO', 'data_nascimento', 'date'),
+    ('DATAINICIOINTERVENCAO', 'data_inicio_intervencao', 'date'),
+    ('REGPROFISSIONAL', 'reg_profissional'),
+    ('EMAIL', 'email'),
+    ('TELEFONECEL', 'telefone_cel'),
+    ('TELEFONEFIXO', 'telefone_fixo'),
+    ('IDIOMAID', 'idioma_id'),
+    ('UNIDADEID', 'unidade_id'),
+    ('PROFISSAOID', 'profissao_id'),
+    ('ENDERECO', 'endereco'),
+    ('CIDADE', 'cidade'),
+    ('ESTADO', 'estado'),
+    ('PAIS', 'pais'),
+    ('HEXADECIMALFOTO', 'hexadecimal_foto'),
+    ('MODALIDADEENSINOID', 'modalidade_ensino_id'),
+    ('STATUS', 'status'),
+    ('USUARIO', 'usuario'),
+    ('SENHA', 'senha'),
+    ('COD_GRUPO_USUARIO', 'cod_grupo_usuario'),
+)
+MODULE_ITEMS_MAPPER = RowMapper('module_items', _MODULE_ITEMS_FIELDS)
+# Os itens preenchidos repetem o celular em TELEFONECELO
+POPULATED_MODULE_ITEMS_MAPPER = RowMapper('populated_module_items', (
+    *_MODULE_ITEMS_FIELDS[:9], ('TELEFONECELO', 'telefone_cel'), *_MODULE_ITEMS_FIELDS[9:]
+))
+
+# Planos de trabalho são a base de get_psychologists_by_city (@cached_query): escritas neles invalidam o cache
+query_cache.watch(PlanoTrabalho)
+
+
 class AtorService:
     def __init__(self):
         self.ator_repository = AtorRepository()
@@ -28,17 +182,61 @@ class AtorService:
             query_filters.append(Ator.profissao_id == profissao_id)
         if not (unidade_id or modalidade_ensino_id or profissao_id or cidade):
             query_filters.append(Ator.unidade_id == 0)
+        city_filter = self._get_city_filter(filters)
+        if city_filter:
+            query_filters.append(Ator.unidade_id.in_(reference_data.unidade_ids_by_city(city_filter)))
         return query_filters
 
-    def get_all_atores(self):
-        return self.ator_repository.get_all_atores()
+    def _get_city_filter(self, filters):
+        return filters.get('cidade') if str(filters.get('cidade')) not in ["0", ""] else None
+
+    def _parse_grid_sort(self, sort):
+        if not sort:
+            return None
+        descending = sort.startswith('-')
+        sort_column = sort.lstrip('-')
+        if sort_column not in GRID_SORT_COLUMNS:
+            raise HttpBadRequestError(f'Ordenação inválida: "{sort}". Use um dos campos: {", ".join(GRID_SORT_COLUMNS)}')
+        return sort_column, descending
+
+    def count_filtered_actors(self, filters):
+        query_filters = self._build_ator_filter_query(filters)
+        return self.ator_repository.count_filtered_actors(query_filters)
+
+    def _stream_batch_size(self):
+        return current_app.config.get('STREAM_BATCH_SIZE', 1000)
+
+    def iter_all_atores(self):
+        return self.ator_repository.iter_all_atores(self._stream_batch_size())
+
+    def _encode_cursor(self, ator):
+        payload = json.dumps([ator.nome, ator.id]).encode('utf-8')
+        return base64.urlsafe_b64encode(payload).decode('ascii')
+
+    def _decode_cursor(self, cursor):
+        try:
+            nome, ator_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            return str(nome), int(ator_id)
+        except (ValueError, TypeError, UnicodeError):
+            raise HttpBadRequestError('Cursor de paginação inválido')
+
+    def get_atores_page(self, limit, cursor=None):
+        after = self._decode_cursor(cursor) if cursor else None
+        atores = self.ator_repository.get_atores_page(limit, after)
+        next_cursor = self._encode_cursor(atores[-1]) if len(atores) == limit else None
+        return atores, next_cursor
+
+    def iter_atores_rows(self, batch_size=500):
+        # Linhas na ordem de ATOR_LIST_COLUMNS, prontas para encode_ator_list_row
+        columns = [column for column, kind in ATOR_LIST_COLUMNS]
+        return self.ator_repository.iter_atores_rows(columns, batch_size)
 
     def get_ator_by_id(self, ator_id: int) -> AtorDetalhadoDTO:
-        ator = self.ator_repository.get_ator_by_id(ator_id)
+        ator = self.ator_repository.get_ator_with_usuario(ator_id)
         if not ator:
             raise HttpNotFoundError("Ator não encontrado")
 
-        # Graças ao relationship, podemos acessar o usuário diretamente
+        # O usuário já vem no mesmo SELECT (joinedload)
         usuario = ator.usuario
 
         # Monta o DTO com os dados do ator e do usuário
@@ -73,18 +271,48 @@ class AtorService:
 
         return ator_detalhado
 
+    def _build_access_email(self, usuario, senha, email, request_url_root):
+        subject = "DADOS DE ACESSO AO COGNVOX"
+        body = f"""
+        <div style="text-align: center;"><img src="{request_url_root.rstrip('/')}/images/logoOficial.png" height=50></div>
+        <p>Seus dados foram alterados em {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}.</p>
+        <h3>Usuário: {remove_accents_py(usuario)}</h3><br>
+        <h3>Senha: {remove_accents_py(senha)}</h3><br>
+        <h3>E-Mail: {remove_accents_py(email)}</h3><br>
+        <p>No próximo login no COGNVOX, utilize o LOGIN e SENHA informados aqui para ter acesso.</p>
+        <div style="text-align: center;" ><a href="{request_url_root.rstrip('/')}">ACESSE AQUI</a></div><br>
+        <div style="text-align: center;"><hr><p><b>Caso deseje remover seus dados da plataforma clique em <a href="{request_url_root.rstrip('/')}/excluiusuario/">REMOVER MEUS DADOS DA PLATAFORMA</a>.</b></p></div>
+        <div style="text-align: center;"><hr><p><b>Este é um email automático, não deve ser respondido.</b></p></div>
+        """
+        return subject, body
+
     def create_ator(self, ator_dto: AtorCreateDTO, request_url_root: str):
         is_valid, error_message = validate_ator_data(ator_dto.to_dict())
         if not is_valid:
             raise HttpBadRequestError(error_message)
 
-        if self.ator_repository.get_ator_by_email(ator_dto.email):
+        if ator_dto.tipo_vinculo:
+            vinculo_data_for_validation = {
+                'NOMER': ator_dto.nome_responsavel,
+                'EMAILR': ator_dto.email_responsavel,
+                'TELEFONECEL': ator_dto.telefone_cel_responsavel,
+                'TIPO_VINCULO': ator_dto.tipo_vinculo,
+                'UNIDADEID': ator_dto.unidade_id,
+                'LOGINR': ator_dto.login_responsavel,
+                'SENHAR': ator_dto.senha_responsavel
+            }
+            is_valid_vinculo, vinculo_error = validate_vinculo_data(vinculo_data_for_validation)
+            if not is_valid_vinculo:
+                raise HttpBadRequestError(f"Erro nos dados do vínculo: {vinculo_error}")
+
+        conflitos = self.ator_repository.get_unique_conflicts(ator_dto.email, ator_dto.usuario, ator_dto.cpf)
+        if 'email' in conflitos:
             raise HttpConflictError('Já existe esse email cadastrado em nossos registros!')
 
-        if self.ator_repository.get_user_by_username(ator_dto.usuario):
+        if 'usuario' in conflitos:
             raise HttpConflictError('Já existe um usuário com este nome de usuário cadastrado!')
 
-        if ator_dto.cpf and self.ator_repository.get_ator_by_cpf(ator_dto.cpf):
+        if 'cpf' in conflitos:
             raise HttpConflictError('Já existe esse CPF cadastrado em nossos registros!')
 
         data_inicio_intervencao = ator_dto.data_inicio_intervencao or date.today()
@@ -130,19 +358,6 @@ class AtorService:
             self.ator_repository.add_ator(new_ator)
 
             if ator_dto.tipo_vinculo:
-                vinculo_data_for_validation = {
-                    'NOMER': ator_dto.nome_responsavel,
-                    'EMAILR': ator_dto.email_responsavel,
-                    'TELEFONECEL': ator_dto.telefone_cel_responsavel,
-                    'TIPO_VINCULO': ator_dto.tipo_vinculo,
-                    'UNIDADEID': ator_dto.unidade_id,
-                    'LOGINR': ator_dto.login_responsavel,
-                    'SENHAR': ator_dto.senha_responsavel
-                }
-                is_valid_vinculo, vinculo_error = validate_vinculo_data(vinculo_data_for_validation)
-                if not is_valid_vinculo:
-                    raise HttpBadRequestError(f"Erro nos dados do vínculo: {vinculo_error}")
-
                 new_responsible_ator = Ator(
                     nome=ator_dto.nome_responsavel,
                     data_inicio_intervencao=data_inicio_intervencao,
@@ -177,11 +392,12 @@ class AtorService:
                 new_responsible_ator.usuario = new_responsible_user
                 
                 self.ator_repository.add_ator(new_responsible_ator)
-                self.ator_repository.flush()
 
+                # Os ids do vínculo e o cod_ordenacao são resolvidos pelos relacionamentos
+                # durante o flush do commit, sem flushes intermediários.
                 new_ator_vinculo = AtorVinculo(
-                    ator_id=new_responsible_ator.id,
-                    ator_di_id=new_ator.id,
+                    ator_vinculado=new_responsible_ator,
+                    ator_di=new_ator,
                     tipo_vinculo_id=ator_dto.tipo_vinculo
                 )
                 self.ator_repository.add_ator_vinculo(new_ator_vinculo)
@@ -190,36 +406,25 @@ class AtorService:
                     usuario=base64_encode_py(ator_dto.login_responsavel),
                     senha=base64_encode_py(ator_dto.senha_responsavel),
                     cod_status=1,
-                    cod_ordenacao=new_responsible_user.codigo
+                    usuario_principal=new_responsible_user
                 )
                 self.ator_repository.add_sec_user(new_responsible_sec_user)
             
-            self.ator_repository.flush()
-            
             new_sec_user = SegProdCognvoxUsuario(
                 usuario=base64_encode_py(ator_dto.usuario),
                 senha=base64_encode_py(ator_dto.senha),
                 cod_status=1,
-                cod_ordenacao=new_user.codigo
+                usuario_principal=new_user
             )
             self.ator_repository.add_sec_user(new_sec_user)
 
             self.ator_repository.commit()
+            invalidate_user_group(ator_dto.email, ator_dto.email_responsavel)
+            query_cache.invalidate()
 
             if ator_dto.status != 2:
-                subject = "DADOS DE ACESSO AO COGNVOX"
-                body = f"""
-                <div style="text-align: center;"><img src="{request_url_root.rstrip('/')}/images/logoOficial.png" height=50></div>
-                <p>Seus dados foram alterados em {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}.</p>
-                <h3>Usuário: {remove_accents_py(ator_dto.usuario)}</h3><br>
-                <h3>Senha: {remove_accents_py(ator_dto.senha)}</h3><br>
-                <h3>E-Mail: {remove_accents_py(ator_dto.email)}</h3><br>
-                <p>No próximo login no COGNVOX, utilize o LOGIN e SENHA informados aqui para ter acesso.</p>
-                <div style="text-align: center;" ><a href="{request_url_root.rstrip('/')}">ACESSE AQUI</a></div><br>
-                <div style="text-align: center;"><hr><p><b>Caso deseje remover seus dados da plataforma clique em <a href="{request_url_root.rstrip('/')}/excluiusuario/">REMOVER MEUS DADOS DA PLATAFORMA</a>.</b></p></div>
-                <div style="text-align: center;"><hr><p><b>Este é um email automático, não deve ser respondido.</b></p></div>
-                """
-                send_email_py(ator_dto.email, None, "suporte@cognivox.net", subject, body)
+                subject, body = self._build_access_email(ator_dto.usuario, ator_dto.senha, ator_dto.email, request_url_root)
+                dispatch_email(ator_dto.email, None, "suporte@cognivox.net", subject, body)
             
             return new_ator
 
@@ -275,6 +480,8 @@ class AtorService:
                 ator_to_update.ano_sessao = ator_dto.ano_sessao
                 
                 self.ator_repository.update_plano_trabalho_by_ator_id(ator_id, {'data_inicial_interacao': ator_dto.data_inicio_intervencao})
+                # UPDATE em lote não passa pelos eventos da sessão
+                data_version.touch([ator_id])
 
                 user_to_update = self.ator_repository.get_user_by_email(old_email)
                 if user_to_update:
@@ -297,6 +504,8 @@ class AtorService:
                         sec_user_to_update.cod_status = ator_dto.status
             
             self.ator_repository.commit()
+            invalidate_user_group(old_email, ator_dto.email)
+            query_cache.invalidate()
             
             return ator_to_update
 
@@ -313,6 +522,7 @@ class AtorService:
         try:
             ator_to_delete.status = 2
             self.ator_repository.commit()
+            query_cache.invalidate()
             return {'message': 'Registro apagado com sucesso!'}
         except Exception as e:
             self.ator_repository.rollback()
@@ -322,12 +532,21 @@ class AtorService:
     def count_alunos(self):
         return self.ator_repository.count_alunos()
 
+    def get_stats(self):
+        return ator_stats.summary()
+
+    def rebuild_stats(self):
+        return ator_stats.rebuild()
+
+    @cached_query('ator_descriptions')
     def get_ator_descriptions(self):
         return self.ator_repository.get_ator_descriptions()
 
+    @cached_query('ator_combo_names')
     def get_ator_combo_names(self):
         return self.ator_repository.get_ator_combo_names()
 
+    @cached_query('ator_combo_all')
     def get_ator_combo_all(self):
         return self.ator_repository.get_ator_combo_all()
 
@@ -346,87 +565,47 @@ class AtorService:
         return {
             'id': ator_data.id,
             'nome': ator_data.nome,
-            'tipo': ator_data.tipo
+            'tipo': reference_data.profissao(ator_data.profissao_id)
         }
 
-    def get_filtered_actors_for_caderno_atividades(self, filters):
+    def _filtered_actors(self, filters, page, size, sort):
+        # Sem paginação, a listagem é lida em streaming
         query_filters = self._build_ator_filter_query(filters)
-        city_filter = filters.get('cidade') if str(filters.get('cidade')) not in ["0", ""] else None
-        
-        atores = self.ator_repository.get_filtered_actors_for_caderno_atividades(query_filters, city_filter)
-        
-        results = []
-        for ator in atores:
-            foto_html = f'<img class="image-2" src="/md_arquivos/upload/deposito/{ator.hexadecimal_foto}">' if ator.hexadecimal_foto and len(ator.hexadecimal_foto) > 3 else '<img class="image-2" src="/images/aluno_default.png">'
-            
-            dados_ator = f"{ator.nome}<br>{ator.IDADE} anos"
-            if ator.ano_sessao not in [None, ""]:
-                dados_ator += f"<br>SESSÃO ANO:{ator.ano_sessao}"
-                
-            results.append({
-                'id': ator.id,
-                'nome': ator.nome,
-                'idade': ator.IDADE,
-                'foto': foto_html,
-                'dados_ator': dados_ator,
-                'modalidade': ator.MODALIDADE,
-                'tipo': ator.TIPO,
-                'instituicao': ator.INSTITUICAO,
-                'municipio': ator.MUNICIPIO,
-                'parecer': ator.PARECER,
-                'status': ator.STATUS
-            })
-        return results
-
-    def get_filtered_actors_for_grid(self, filters):
+        if size:
+            return self.ator_repository.get_filtered_actors(query_filters, page, size, self._parse_grid_sort(sort))
+        return self.ator_repository.iter_filtered_actors(
+            query_filters, self._parse_grid_sort(sort), self._stream_batch_size()
+        )
+
+    def get_filtered_actors_for_caderno_atividades(self, filters, page=None, size=None, sort=None):
+        atores = self._filtered_actors(filters, page, size, sort)
+        return CADERNO_ATIVIDADES_MAPPER.iter(atores, today=date.today())
+
+    def export_filtered_actors_for_caderno_atividades(self, filters, sort=None):
+        # Filtros e ordenação validados agora; a consulta roda enquanto a resposta é enviada
         query_filters = self._build_ator_filter_query(filters)
-        city_filter = filters.get('cidade') if str(filters.get('cidade')) not in ["0", ""] else None
+        atores = self.ator_repository.iter_filtered_actors(
+            query_filters, self._parse_grid_sort(sort), self._stream_batch_size()
+        )
+        return CADERNO_ATIVIDADES_EXPORT_MAPPER.iter(atores, today=date.today())
 
-        atores = self.ator_repository.get_filtered_actors_for_grid(query_filters, city_filter)
-        
-        results = []
-        for ator in atores:
-            foto_html = f'<div class="col-md-12 justify-content-center"><img class="image-2 col-md-10" src="/md_arquivos/upload/deposito/{ator.hexadecimal_foto}"></div>' if ator.hexadecimal_foto else '<div class="col-md-12 justify-content-center"><img class="image-2 col-md-10" src="/images/aluno_default.png"></div>'
-            
-            dados_ator = f"{ator.nome}<br>{ator.idade} anos"
-            if ator.ano_sessao not in [None, ""]:
-                dados_ator += f"<br>SESSÃO ANO:{ator.ano_sessao}"
-                
-            results.append({
-                'id': ator.id,
-                'foto': foto_html,
-                'dados_ator': dados_ator,
-                'modalidade': ator.modalidade,
-                'tipo': ator.tipo,
-                'instituicao': ator.instituicao,
-                'municipio': ator.municipio,
-                'parecer': ator.parecer,
-                'status': ator.status
-            })
-        return results
+    def get_filtered_actors_for_grid(self, filters, page=None, size=None, sort=None):
+        atores = self._filtered_actors(filters, page, size, sort)
+        return GRID_FILTRO_MAPPER.iter(atores, today=date.today())
 
     def get_all_actors_for_grid(self):
-        atores = self.ator_repository.get_all_actors_for_grid()
+        return GRID_MAPPER.iter(self.ator_repository.iter_all_actors_for_grid(self._stream_batch_size()))
 
-        results = []
-        for ator in atores:
-            dados_ator = f"{ator.nome}<br>{ator.email}"
-            if ator.ano_sessao:
-                dados_ator += f"<br>Sessões ano:{ator.ano_sessao}"
-                
-            results.append({
-                'id': ator.id,
-                'dados_ator': dados_ator,
-                'modalidade': ator.modalidade,
-                'tipo': ator.tipo,
-                'instituicao': ator.instituicao
-            })
-        return results
+    def search_atores(self, termo, limit=20):
+        if not termo or not termo.strip():
+            raise ValueError('Parâmetro "q" é obrigatório')
+        max_limit = current_app.config.get('SEARCH_MAX_LIMIT', 100)
+        if limit < 1 or limit > max_limit:
+            raise ValueError(f'Parâmetro "limit" deve estar entre 1 e {max_limit}')
+        return search_index.search(termo, limit)
 
     def get_chat_actors_by_institution(self, unidade_id):
-        combined_atores = self.ator_repository.get_chat_actors_by_institution(unidade_id)
-        
-        return [{'id': a.id, 'nome': a.nome} for a in combined_atores]
+        return membership_index.chat_members(unidade_id)
 
     def get_ator_name(self, ator_id):
         ator = self.ator_repository.get_ator_name(ator_id)
@@ -446,9 +625,9 @@ class AtorService:
             'data_nascimento': ator_data.data_nascimento.isoformat() if ator_data.data_nascimento else None,
             'telefone_cel': ator_data.telefone_cel,
             'email': ator_data.email,
-            'idade': ator_data.IDADE,
+            'idade': calculate_age(ator_data.data_nascimento),
             'hexadecimal_foto': ator_data.hexadecimal_foto,
-            'escola': ator_data.ESCOLA
+            'escola': reference_data.nome_instituicao(ator_data.unidade_id)
         }
 
     def get_complete_ator_data(self, ator_id):
@@ -457,12 +636,23 @@ class AtorService:
         if not result:
             raise LookupError('Ator não encontrado')
             
+        return self._complete_ator_data_dict(result)
+
+    def iter_complete_ator_data(self, ator_ids=None, unidade_id=None):
+        if ator_ids is None and unidade_id is None:
+            raise ValueError('Informe "ids" ou "unidade_id"')
+
+        today = date.today()
+        for result in self.ator_repository.iter_complete_ator_data(ator_ids, unidade_id):
+            yield self._complete_ator_data_dict(result, today)
+
+    def _complete_ator_data_dict(self, result, today=None):
         return {
             'id': result.id,
             'nome': result.nome,
             'data_nascimento': result.data_nascimento.isoformat() if result.data_nascimento else None,
             'telefone_cel': result.telefone_cel,
-            'idade': result.IDADE,
+            'idade': calculate_age(result.data_nascimento, today),
             'hexadecimal_foto': result.hexadecimal_foto,
             'responsavel': result.RESPONSAVEL,
             'data_inicio': result.DATAINICIO.isoformat() if result.DATAINICIO else None,
@@ -530,7 +720,7 @@ class AtorService:
             'ano_sessao': ator_data.ano_sessao,
             'responsavel': ator_data.RESPONSAVEL,
             'data_inicio': ator_data.DATAINICIO.isoformat() if ator_data.DATAINICIO else None,
-            'idade': ator_data.IDADE,
+            'idade': calculate_age(ator_data.data_nascimento),
             'par_interacional': ator_data.PARINTERACIONAL,
             'professor': ator_data.PROFESSOR,
             'psicologo': ator_data.PSICOLOGO,
@@ -578,62 +768,50 @@ class AtorService:
             'aluno_id': ator_data.ALUNOID
         }
 
-    def get_all_students_di(self):
-        return self.ator_repository.get_all_students_di()
+    def _parse_campos(self, campos):
+        if campos is None:
+            return ATOR_CAMPOS
+        invalidos = [campo for campo in campos if campo not in ATOR_CAMPOS]
+        if invalidos or not campos:
+            raise ValueError(f'Parâmetro "campos" inválido: use um ou mais de {", ".join(ATOR_CAMPOS)}')
+        return tuple(dict.fromkeys(campos))
+
+    @cached_query('all_students_di')
+    def get_all_students_di(self, campos=None):
+        return self.ator_repository.get_all_students_di(self._parse_campos(campos))
 
     def get_interacional_actors(self):
-        combined_atores = self.ator_repository.get_interacional_actors()
-        
-        return [{'id': a.id, 'nome': a.nome} for a in combined_atores]
+        return membership_index.interacionais()
 
+    @cached_query('psychologists_by_city')
     def get_psychologists_by_city(self, city):
         if not city:
             raise ValueError('Parâmetro "cidade" é obrigatório')
 
-        psicologos = self.ator_repository.get_psychologists_by_city(city)
-        
-        return [{'id': p.id, 'nome': p.nome} for p in psicologos]
+        cidades = reference_data.city_names(city)
+        if not cidades:
+            return []
+        return self.ator_repository.get_psychologists_by_city(cidades)
 
-    def get_all_psychologists(self):
-        return self.ator_repository.get_all_psychologists()
+    @cached_query('all_psychologists')
+    def get_all_psychologists(self, campos=None):
+        return self.ator_repository.get_all_psychologists(self._parse_campos(campos))
 
-    def get_all_professors(self):
-        return self.ator_repository.get_all_professors()
+    @cached_query('all_professors')
+    def get_all_professors(self, campos=None):
+        return self.ator_repository.get_all_professors(self._parse_campos(campos))
 
-    def get_all_responsibles(self):
-        return self.ator_repository.get_all_responsibles()
+    @cached_query('all_responsibles')
+    def get_all_responsibles(self, campos=None):
+        return self.ator_repository.get_all_responsibles(self._parse_campos(campos))
 
     def get_user_module_items_by_ator_id(self, ator_id):
         ator_data = self.ator_repository.get_user_module_items_by_ator_id(ator_id)
 
         if not ator_data:
             raise LookupError('Dados do ator não encontrados')
-            
-        return {
-            'ID': ator_data.id,
-            'NOME': ator_data.nome,
-            'CPF': ator_data.cpf,
-            'ANO_SESSAO': ator_data.ano_sessao,
-            'DATANASCIMENTO': ator_data.data_nascimento.isoformat() if ator_data.data_nascimento else None,
-            'DATAINICIOINTERVENCAO': ator_data.data_inicio_intervencao.isoformat() if ator_data.data_inicio_intervencao else None,
-            'REGPROFISSIONAL': ator_data.reg_profissional,
-            'EMAIL': ator_data.email,
-            'TELEFONECEL': ator_data.telefone_cel,
-            'TELEFONEFIXO': ator_data.telefone_fixo,
-            'IDIOMAID': ator_data.idioma_id,
-            'UNIDADEID': ator_data.unidade_id,
-            'PROFISSAOID': ator_data.profissao_id,
-            'ENDERECO': ator_data.endereco,
-            'CIDADE': ator_data.cidade,
-            'ESTADO': ator_data.estado,
-            'PAIS': ator_data.pais,
-            'HEXADECIMALFOTO': ator_data.hexadecimal_foto,
-            'MODALIDADEENSINOID': ator_data.modalidade_ensino_id,
-            'STATUS': ator_data.status,
-            'USUARIO': ator_data.usuario,
-            'SENHA': ator_data.senha,
-            'COD_GRUPO_USUARIO': ator_data.cod_grupo_usuario
-        }
+
+        return MODULE_ITEMS_MAPPER.one(ator_data)
 
     def get_empty_module_items(self):
         first_ator = self.ator_repository.get_first_ator()
@@ -646,33 +824,8 @@ class AtorService:
 
         if not ator_data:
             raise LookupError('Ator não encontrado')
-            
-        return {
-            'ID': ator_data.id,
-            'NOME': ator_data.nome,
-            'CPF': ator_data.cpf,
-            'ANO_SESSAO': ator_data.ano_sessao,
-            'DATANASCIMENTO': ator_data.data_nascimento.isoformat() if ator_data.data_nascimento else None,
-            'DATAINICIOINTERVENCAO': ator_data.data_inicio_intervencao.isoformat() if ator_data.data_inicio_intervencao else None,
-            'REGPROFISSIONAL': ator_data.reg_profissional,
-            'EMAIL': ator_data.email,
-            'TELEFONECEL': ator_data.telefone_cel,
-            'TELEFONECELO': ator_data.telefone_cel,
-            'TELEFONEFIXO': ator_data.telefone_fixo,
-            'IDIOMAID': ator_data.idioma_id,
-            'UNIDADEID': ator_data.unidade_id,
-            'PROFISSAOID': ator_data.profissao_id,
-            'ENDERECO': ator_data.endereco,
-            'CIDADE': ator_data.cidade,
-            'ESTADO': ator_data.estado,
-            'PAIS': ator_data.pais,
-            'HEXADECIMALFOTO': ator_data.hexadecimal_foto,
-            'MODALIDADEENSINOID': ator_data.modalidade_ensino_id,
-            'STATUS': ator_data.status,
-            'USUARIO': ator_data.usuario,
-            'SENHA': ator_data.senha,
-            'COD_GRUPO_USUARIO': ator_data.cod_grupo_usuario
-        }
+
+        return POPULATED_MODULE_ITEMS_MAPPER.one(ator_data)
 
     def update_ator_profile(self, ator_id, data):
         data['id'] = ator_id
@@ -728,6 +881,8 @@ class AtorService:
                         sec_user_to_update.cod_status = data.get('status', sec_user_to_update.cod_status)
             
             self.ator_repository.commit()
+            invalidate_user_group(old_email, ator_to_update.email)
+            query_cache.invalidate()
             
             return ator_to_update
 
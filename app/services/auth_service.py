@@ -1,23 +1,54 @@
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity, get_jwt
 from flask import jsonify, current_app
 from functools import wraps
 from app.models.user_model import Usuario
+from app.services.cache_service import TTLCache
 from app import db
 import base64
 import unicodedata
 
+_NAO_ENCONTRADO = object()
+_user_group_cache = None
+
+def _get_user_group_cache():
+    global _user_group_cache
+    if _user_group_cache is None:
+        _user_group_cache = TTLCache(
+            max_size=current_app.config.get('AUTH_GROUP_CACHE_SIZE', 1024),
+            ttl=current_app.config.get('AUTH_GROUP_CACHE_TTL', 60)
+        )
+    return _user_group_cache
+
+def invalidate_user_group(*user_emails):
+    if _user_group_cache is not None:
+        _user_group_cache.delete(*[email for email in user_emails if email])
+
 def get_user_group_from_db(user_email):
     if not user_email:
         return None
+
+    cache = _get_user_group_cache()
+    cached_group = cache.get(user_email, _NAO_ENCONTRADO)
+    if cached_group is not _NAO_ENCONTRADO:
+        return cached_group
     
     with current_app.app_context():
-        user = Usuario.query.filter_by(email=user_email).first()
-        if user:
-            return user.cod_grupo_usuario
-        return None
+        user = Usuario.query.with_entities(Usuario.cod_grupo_usuario).filter_by(email=user_email).first()
+        user_group_id = user.cod_grupo_usuario if user else None
+
+    cache.set(user_email, user_group_id)
+    return user_group_id
+
+def get_user_group(user_email):
+    # Com JWT_EMBED_GRUPO_USUARIO o grupo vem no próprio token emitido no login, sem consulta ao banco
+    if current_app.config.get('JWT_EMBED_GRUPO_USUARIO'):
+        user_group_id = get_jwt().get('cod_grupo_usuario')
+        if user_group_id is not None:
+            return user_group_id
+    return get_user_group_from_db(user_email)
 
 def verify_token(user_email, required_permission_type):
-    user_group_id = get_user_group_from_db(user_email)
+    user_group_id = get_user_group(user_email)
 
     if user_group_id is None:
         return False
@@ -63,7 +94,7 @@ def roles_required(roles):
         def decorator(*args, **kwargs):
             verify_jwt_in_request()
             current_user_email = get_jwt_identity()
-            user_group_id = get_user_group_from_db(current_user_email)
+            user_group_id = get_user_group(current_user_email)
 
             if user_group_id is None:
                 return jsonify({'message': 'Acesso negado: Usuário não autorizado'}), 403
@@ -0,0 +1,126 @@
+from datetime import date
+from flask import current_app
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+import hashlib
+
+from app import db
+from app.models.ator_model import Ator
+from app.models.ator_vinculo_model import AtorVinculo
+from app.models.plano_trabalho_model import PlanoTrabalho
+from app.models.quadro_psicopedagogico_model import QuadroPsicopedagogico
+from app.models.user_model import Usuario
+from app.repositories.versao_dados_repository import VersaoDadosRepository
+from app.services.reference_data_service import REFERENCE_MODELS
+
+# Modelo -> colunas com o id do ator cujos dados a escrita altera
+ATOR_ATRIBUTOS = {
+    Ator: ('id',),
+    Usuario: ('ator_id',),
+    AtorVinculo: ('ator_di_id',),
+    PlanoTrabalho: ('ator_di_id',),
+    QuadroPsicopedagogico: ('ator_id',),
+}
+
+
+class DataVersionService:
+    # Versões por ator, por unidade e dos dados de referência gravadas no banco, na mesma transação
+    # da escrita: valem para todos os workers e só mudam quando os dados do escopo mudam.
+    # Escritas que não passam pela sessão (UPDATE em lote, SQL direto) chamam touch() explicitamente.
+    # Cada escrita de ator também incrementa a linha 'unidade:<id>' dentro da transação de quem escreve:
+    # a linha fica travada até o commit e escritas concorrentes na mesma unidade esperam umas pelas outras.
+    def __init__(self):
+        self.repository = VersaoDadosRepository()
+        self._disponivel = {}
+
+    def available(self, session=None):
+        # Dialeto sem upsert ou migração v8 não aplicada: sem versões nem ETag, com um aviso por processo.
+        # A verificação é feita uma vez por engine; depois de aplicar a migração é preciso reiniciar.
+        session = session or db.session
+        engine = session.get_bind().engine
+        disponivel = self._disponivel.get(engine)
+        if disponivel is None:
+            disponivel = self._disponivel[engine] = self._check(session, engine.dialect.name)
+        return disponivel
+
+    def _check(self, session, dialect_name):
+        if not self.repository.supports(dialect_name):
+            current_app.logger.warning('Versões de dados (ETag) desativadas: dialeto %s não suportado', dialect_name)
+            return False
+        if not self.repository.table_exists(session):
+            current_app.logger.warning('Versões de dados (ETag) desativadas: tabela versao_dados ausente (migração v8)')
+            return False
+        return True
+
+    def touch(self, ator_ids=(), unidade_ids=(), referencia=False, session=None):
+        session = session or db.session
+        if not self.available(session):
+            return
+        ator_ids = {ator_id for ator_id in ator_ids if ator_id is not None}
+        unidade_ids = set(unidade_ids)
+        if ator_ids:
+            unidade_ids |= self.repository.get_unidade_ids(session, ator_ids)
+        escopos = {f'ator:{ator_id}' for ator_id in ator_ids}
+        escopos |= {f'unidade:{unidade_id or 0}' for unidade_id in unidade_ids}
+        if referencia:
+            escopos.add('referencia')
+        if escopos:
+            self.repository.increment(session, escopos)
+
+    def _token(self, *partes):
+        # A data entra porque as respostas trazem a idade calculada no dia
+        return hashlib.sha1(repr((date.today().isoformat(), *partes)).encode('utf-8')).hexdigest()
+
+    def atores_token(self, ator_ids):
+        if not self.available():
+            return None
+        escopos = [f'ator:{ator_id}' for ator_id in ator_ids] + ['referencia']
+        versoes = self.repository.get_versions(db.session, escopos)
+        return self._token(*(versoes.get(escopo, 0) for escopo in escopos))
+
+    def unidades_token(self, unidade_id=None):
+        # unidade_id None: todas as unidades (listagens sem filtro de unidade)
+        if not self.available():
+            return None
+        if unidade_id is None:
+            unidades = self.repository.get_prefix_version(db.session, 'unidade:')
+            referencia = self.repository.get_versions(db.session, ['referencia']).get('referencia', 0)
+            return self._token(unidades, referencia)
+        escopos = [f'unidade:{unidade_id}', 'referencia']
+        versoes = self.repository.get_versions(db.session, escopos)
+        return self._token(*(versoes.get(escopo, 0) for escopo in escopos))
+
+
+data_version = DataVersionService()
+
+
+def _valores(instance, atributo, state):
+    # Valor atual e, se a escrita mudou o atributo, o anterior
+    history = state.attrs[atributo].history
+    return {getattr(instance, atributo), *history.deleted}
+
+
+@event.listens_for(Session, 'after_flush')
+def _touch_versions(session, flush_context):
+    if not data_version.available(session):
+        return
+    ator_ids, unidade_ids, renomeados = set(), set(), set()
+    referencia = False
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        atributos = ATOR_ATRIBUTOS.get(type(instance))
+        if atributos is not None:
+            state = inspect(instance)
+            for atributo in atributos:
+                ator_ids |= _valores(instance, atributo, state)
+            if isinstance(instance, Ator):
+                # A unidade anterior também perde o ator; atores excluídos já não estão no banco
+                unidade_ids |= _valores(instance, 'unidade_id', state)
+                if instance in session.deleted or state.attrs['nome'].history.deleted:
+                    renomeados.add(instance.id)
+        elif isinstance(instance, REFERENCE_MODELS):
+            referencia = True
+
+    if renomeados:
+        ator_ids |= data_version.repository.get_dependent_ator_ids(session, renomeados)
+    if ator_ids or unidade_ids or referencia:
+        data_version.touch(ator_ids, unidade_ids, referencia, session=session)
@@ -0,0 +1,143 @@
+from datetime import date, datetime
+from xml.sax.saxutils import escape
+import csv
+import io
+import re
+import zipfile
+
+# formato -> mimetype da resposta
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+# Textos que o Excel interpretaria como fórmula ao abrir o CSV
+_FORMULA = frozenset('=+-@\t\r')
+# Caracteres de controle que não são permitidos em XML
+_XML_INVALIDO = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_NS_PLANILHA = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_NS_PACOTE = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_NS_RELACOES = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_XML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_XLSX_PARTES = {
+    '[Content_Types].xml': (
+        _XML + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        _XML + f'<Relationships xmlns="{_NS_PACOTE}">'
+        f'<Relationship Id="rId1" Type="{_NS_RELACOES}/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        _XML + f'<Relationships xmlns="{_NS_PACOTE}">'
+        f'<Relationship Id="rId1" Type="{_NS_RELACOES}/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+class _StreamBuffer:
+    # Destino do zipfile sem seek/tell: o zipfile grava em modo streaming (data descriptors)
+    # e o que foi escrito sai no próximo drain()
+    def __init__(self):
+        self._partes = []
+
+    def write(self, data):
+        self._partes.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._partes)
+        self._partes = []
+        return data
+
+
+def _csv_value(value):
+    if isinstance(value, str):
+        return "'" + value if value and value[0] in _FORMULA else value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def iter_csv(header, records, batch_size=500):
+    # CSV separado por ";" com BOM, como o Excel em português espera; o cabeçalho sai antes da consulta
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=';', lineterminator='\r\n')
+    buffer.write('\ufeff')
+    writer.writerow(header)
+    yield buffer.getvalue().encode('utf-8')
+
+    buffer.seek(0)
+    buffer.truncate()
+    for index, record in enumerate(records, start=1):
+        writer.writerow([_csv_value(value) for value in record.values()])
+        if index % batch_size == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def _xlsx_cell(value):
+    if value is None:
+        return '<c/>'
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c><v>{value}</v></c>'
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    text = escape(_XML_INVALIDO.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values):
+    return '<row>' + ''.join(_xlsx_cell(value) for value in values) + '</row>'
+
+
+def _sheet_name(nome):
+    # O Excel limita o nome da aba a 31 caracteres e não aceita os caracteres []:*?/\ nele
+    return escape(re.sub(r'[\[\]:*?/\\]', ' ', nome)[:31], {'"': '&quot;'})
+
+
+def iter_xlsx(header, records, sheet_name='Planilha1', batch_size=500):
+    # XLSX mínimo (uma planilha, textos inline, sem estilos) gravado direto no ZIP da resposta:
+    # cada lote de linhas é comprimido e enviado, sem montar a planilha em memória nem em disco
+    buffer = _StreamBuffer()
+    workbook = (
+        _XML + f'<workbook xmlns="{_NS_PLANILHA}" xmlns:r="{_NS_RELACOES}"><sheets>'
+        f'<sheet name="{_sheet_name(sheet_name)}" sheetId="1" r:id="rId1"/>'
+        '</sheets></workbook>'
+    )
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as arquivo:
+        for nome, conteudo in _XLSX_PARTES.items():
+            arquivo.writestr(nome, conteudo)
+        arquivo.writestr('xl/workbook.xml', workbook)
+
+        with arquivo.open('xl/worksheets/sheet1.xml', 'w') as planilha:
+            planilha.write((_XML + f'<worksheet xmlns="{_NS_PLANILHA}"><sheetData>' + _xlsx_row(header)).encode('utf-8'))
+            yield buffer.drain()
+
+            linhas = []
+            for record in records:
+                linhas.append(_xlsx_row(record.values()))
+                if len(linhas) == batch_size:
+                    planilha.write(''.join(linhas).encode('utf-8'))
+                    linhas = []
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            planilha.write((''.join(linhas) + '</sheetData></worksheet>').encode('utf-8'))
+    yield buffer.drain()
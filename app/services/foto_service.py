@@ -0,0 +1,96 @@
+from flask import current_app
+from sqlalchemy import String, case, cast, func, literal
+from werkzeug.utils import safe_join
+from app.repositories.ator_repository import AtorRepository
+import hashlib
+import mimetypes
+import os
+import re
+
+_HEX_PATTERN = re.compile(r'^(?:[0-9a-fA-F]{2})+$')
+
+_ASSINATURAS_IMAGEM = (
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+
+
+def foto_url(ator_id):
+    return f'/api/ator/{ator_id}/foto/arquivo'
+
+
+def foto_url_expression(ator_id, hexadecimal_foto):
+    # Mesmo valor de foto_url(), calculado no SELECT para listagens serializadas direto das linhas
+    return case(
+        (func.coalesce(hexadecimal_foto, '') != '',
+         literal('/api/ator/') + cast(ator_id, String) + '/foto/arquivo'),
+        else_=None
+    )
+
+
+class FotoService:
+    def __init__(self):
+        self.ator_repository = AtorRepository()
+
+    def _get_foto_value(self, ator_id):
+        ator = self.ator_repository.get_ator_photo_hex(ator_id)
+        if not ator:
+            raise LookupError('Ator não encontrado')
+        if not ator.hexadecimal_foto:
+            raise LookupError('Foto não encontrada')
+        return ator.hexadecimal_foto
+
+    def _resolve_path(self, foto_value):
+        storage_dir = current_app.config.get('FOTO_STORAGE_DIR')
+        if not storage_dir:
+            return None
+        path = safe_join(storage_dir, foto_value.lstrip('/'))
+        if not path or not os.path.isfile(path):
+            return None
+        return path
+
+    def _is_hex_payload(self, foto_value):
+        return bool(_HEX_PATTERN.match(foto_value))
+
+    def _etag(self, foto_value, path=None):
+        digest = hashlib.sha1(foto_value.encode('utf-8'))
+        if path:
+            stat = os.stat(path)
+            digest.update(f'{stat.st_mtime_ns}:{stat.st_size}'.encode('ascii'))
+        return digest.hexdigest()
+
+    def _locate(self, foto_value):
+        if self._is_hex_payload(foto_value):
+            return None
+        path = self._resolve_path(foto_value)
+        if not path:
+            raise LookupError('Foto não encontrada')
+        return path
+
+    def get_foto_etag(self, ator_id):
+        foto_value = self._get_foto_value(ator_id)
+        return self._etag(foto_value, self._locate(foto_value))
+
+    def get_foto(self, ator_id):
+        foto_value = self._get_foto_value(ator_id)
+        path = self._locate(foto_value)
+
+        if path:
+            with open(path, 'rb') as arquivo:
+                conteudo = arquivo.read()
+            mimetype = mimetypes.guess_type(path)[0]
+        else:
+            conteudo = bytes.fromhex(foto_value)
+            mimetype = None
+
+        for assinatura, tipo in _ASSINATURAS_IMAGEM:
+            if conteudo.startswith(assinatura):
+                mimetype = tipo
+                break
+        else:
+            if conteudo[:4] == b'RIFF' and conteudo[8:12] == b'WEBP':
+                mimetype = 'image/webp'
+
+        return conteudo, mimetype or 'application/octet-stream', self._etag(foto_value, path)
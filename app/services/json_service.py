@@ -0,0 +1,69 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+import json
+
+from flask import current_app, make_response
+from flask.json.provider import DefaultJSONProvider
+from flask_restx.representations import output_json as restx_output_json
+from sqlalchemy.engine import Row, RowMapping
+
+# orjson é opcional; sem ele o encoder rápido usa o json da biblioteca padrão com os mesmos tipos
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, Row):
+        return value._asdict()
+    if isinstance(value, RowMapping):
+        return dict(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    # DTOs: mesmo formato de quando o controller chama to_dict()
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    raise TypeError(f'Objeto do tipo {type(value).__name__} não é serializável em JSON')
+
+
+class FastJSONEncoder(json.JSONEncoder):
+    def default(self, value):
+        return _default(value)
+
+
+def dumps(data):
+    # Sempre devolve bytes UTF-8
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS)
+    return json.dumps(data, cls=FastJSONEncoder, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def fast_json_enabled():
+    return current_app.config.get('JSON_FAST_ENCODER', False)
+
+
+def output_json(data, code, headers=None):
+    # Representação 'application/json' do Api: com JSON_FAST_ENCODER desligado, mantém a do flask-restx
+    if not fast_json_enabled():
+        return restx_output_json(data, code, headers)
+    response = make_response(dumps(data) + b'\n', code)
+    response.headers.extend(headers or {})
+    return response
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    # jsonify() e request.get_json() fora dos Resources do flask-restx
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s)
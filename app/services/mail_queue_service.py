@@ -0,0 +1,263 @@
+from flask import current_app
+from email.mime.text import MIMEText
+from email.utils import formatdate, make_msgid
+from threading import Event, Lock, Thread
+import json
+import os
+import smtplib
+import sys
+import time
+import uuid
+
+from app.services.auth_service import send_email_py
+
+
+class MailQueueService:
+    # Fila de saída persistida em disco: pending/ -> processing/ -> (removido | failed/)
+    def __init__(self):
+        self.app = None
+        self._wakeup = Event()
+        self._stop = Event()
+        self._workers = []
+        self._metrics_lock = Lock()
+        self._metrics = {
+            'enfileirados': 0,
+            'enviados': 0,
+            'falhas_temporarias': 0,
+            'falhas_definitivas': 0,
+            'conexoes_smtp': 0,
+            'lotes': 0
+        }
+
+    def init_app(self, app):
+        self.app = app
+        self.spool_dir = app.config.get('MAIL_SPOOL_DIR') or os.path.join(app.instance_path, 'mail_spool')
+        self.batch_size = app.config['MAIL_BATCH_SIZE']
+        self.max_retries = app.config['MAIL_MAX_RETRIES']
+        self.retry_backoff = app.config['MAIL_RETRY_BACKOFF']
+        self.failed_retention = app.config['MAIL_FAILED_RETENTION_DAYS'] * 86400
+        if not app.config['MAIL_QUEUE_ENABLED']:
+            return
+
+        # As mensagens pendentes levam a senha inicial do ator no corpo: só o usuário do processo lê o spool
+        for folder in ('pending', 'processing', 'failed'):
+            os.makedirs(os.path.join(self.spool_dir, folder), mode=0o700, exist_ok=True)
+            os.chmod(os.path.join(self.spool_dir, folder), 0o700)
+
+        # Mensagens presas em envio (processo interrompido) voltam para a fila
+        stale_before = time.time() - app.config['MAIL_STALE_PROCESSING_SECONDS']
+        for name in os.listdir(self._folder('processing')):
+            processing_path = os.path.join(self._folder('processing'), name)
+            try:
+                if os.path.getmtime(processing_path) < stale_before:
+                    os.replace(processing_path, os.path.join(self._folder('pending'), name))
+            except FileNotFoundError:
+                continue
+
+        self.purge_failed()
+        self.start(app.config['MAIL_WORKERS'])
+
+    def _folder(self, name):
+        return os.path.join(self.spool_dir, name)
+
+    def _count(self, metric, amount=1):
+        with self._metrics_lock:
+            self._metrics[metric] += amount
+
+    def enqueue(self, to_email, cc_email, from_email, subject, body):
+        message = {
+            'id': uuid.uuid4().hex,
+            'to': to_email,
+            'cc': cc_email,
+            'from': from_email,
+            'subject': subject,
+            'body': body,
+            'attempts': 0,
+            'next_attempt_at': 0
+        }
+        self._write(message, 'pending')
+        self._count('enfileirados')
+        self._wakeup.set()
+        return message['id']
+
+    def _write(self, message, folder):
+        path = os.path.join(self._folder(folder), f"{message['id']}.json")
+        tmp_path = f'{path}.tmp'
+        with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w', encoding='utf-8') as spool_file:
+            json.dump(message, spool_file)
+        os.replace(tmp_path, path)
+
+    def _claim_batch(self):
+        batch = []
+        now = time.time()
+        for name in sorted(os.listdir(self._folder('pending'))):
+            if not name.endswith('.json'):
+                continue
+            pending_path = os.path.join(self._folder('pending'), name)
+            try:
+                with open(pending_path, encoding='utf-8') as spool_file:
+                    message = json.load(spool_file)
+            except (OSError, ValueError):
+                continue
+            if message.get('next_attempt_at', 0) > now:
+                continue
+            try:
+                # O rename é atômico: só um worker consegue reivindicar cada mensagem
+                os.replace(pending_path, os.path.join(self._folder('processing'), name))
+            except FileNotFoundError:
+                continue
+            batch.append(message)
+            if len(batch) >= self.batch_size:
+                break
+        return batch
+
+    def _connect(self):
+        config = self.app.config
+        smtp_class = smtplib.SMTP_SSL if config.get('MAIL_USE_SSL') else smtplib.SMTP
+        connection = smtp_class(config['MAIL_SERVER'], config['MAIL_PORT'], timeout=config['MAIL_SMTP_TIMEOUT'])
+        if config.get('MAIL_USE_TLS') and not config.get('MAIL_USE_SSL'):
+            connection.starttls()
+        if config.get('MAIL_USERNAME') and config.get('MAIL_PASSWORD'):
+            connection.login(config['MAIL_USERNAME'], config['MAIL_PASSWORD'])
+        self._count('conexoes_smtp')
+        return connection
+
+    def _build_mime(self, message):
+        mime = MIMEText(message['body'], 'html', 'utf-8')
+        mime['Subject'] = message['subject']
+        mime['From'] = message['from'] or self.app.config.get('MAIL_DEFAULT_SENDER')
+        mime['To'] = message['to']
+        if message.get('cc'):
+            mime['Cc'] = message['cc']
+        mime['Date'] = formatdate(localtime=True)
+        mime['Message-ID'] = make_msgid()
+        return mime
+
+    def _finish(self, message):
+        try:
+            os.remove(os.path.join(self._folder('processing'), f"{message['id']}.json"))
+        except FileNotFoundError:
+            pass
+
+    def _fail(self, message):
+        # O arquivo em failed/ serve só para diagnóstico: o corpo (com a senha) não é guardado
+        message.pop('body', None)
+        message['failed_at'] = time.time()
+        self._write(message, 'failed')
+
+    def purge_failed(self):
+        removed = 0
+        expires_before = time.time() - self.failed_retention
+        for name in os.listdir(self._folder('failed')):
+            failed_path = os.path.join(self._folder('failed'), name)
+            try:
+                if os.path.getmtime(failed_path) < expires_before:
+                    os.remove(failed_path)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+    def _retry_or_fail(self, message, error, permanent=False):
+        # permanent: recusa definitiva do servidor (5xx), repetir o envio não muda o resultado
+        message['attempts'] += 1
+        message['last_error'] = str(error)
+        self._finish(message)
+        if permanent or message['attempts'] >= self.max_retries:
+            self._fail(message)
+            self._count('falhas_definitivas')
+            print(f"Falha definitiva no envio de e-mail {message['id']} para {message['to']}: {error}", file=sys.stderr)
+        else:
+            message['next_attempt_at'] = time.time() + self.retry_backoff * (2 ** (message['attempts'] - 1))
+            self._write(message, 'pending')
+            self._count('falhas_temporarias')
+
+    def _send_batch(self, batch):
+        self._count('lotes')
+        connection = None
+        try:
+            # Uma única conexão SMTP é reaproveitada para todo o lote
+            connection = self._connect()
+            for index, message in enumerate(batch):
+                try:
+                    recipients = [message['to']] + ([message['cc']] if message.get('cc') else [])
+                    mime = self._build_mime(message)
+                    connection.sendmail(mime['From'], recipients, mime.as_string())
+                    self._finish(message)
+                    self._count('enviados')
+                except smtplib.SMTPServerDisconnected as e:
+                    for pending_message in batch[index:]:
+                        self._retry_or_fail(pending_message, e)
+                    return
+                except (smtplib.SMTPException, OSError) as e:
+                    self._retry_or_fail(message, e, _is_permanent(e))
+        except (smtplib.SMTPException, OSError) as e:
+            for message in batch:
+                self._retry_or_fail(message, e)
+        finally:
+            if connection is not None:
+                try:
+                    connection.quit()
+                except (smtplib.SMTPException, OSError):
+                    pass
+
+    def process_pending(self):
+        processed = 0
+        while True:
+            batch = self._claim_batch()
+            if not batch:
+                return processed
+            self._send_batch(batch)
+            processed += len(batch)
+
+    def _run(self):
+        poll_interval = self.app.config['MAIL_POLL_INTERVAL']
+        while not self._stop.is_set():
+            self.process_pending()
+            self.purge_failed()
+            self._wakeup.wait(poll_interval)
+            self._wakeup.clear()
+
+    def start(self, workers=1):
+        if self._workers:
+            return
+        self._stop.clear()
+        for index in range(workers):
+            worker = Thread(target=self._run, name=f'mail-queue-{index}', daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wakeup.set()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+
+    def metrics(self):
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        metrics['fila_ativa'] = bool(self.app and self.app.config['MAIL_QUEUE_ENABLED'])
+        if not metrics['fila_ativa']:
+            return metrics
+        metrics['pendentes'] = len(os.listdir(self._folder('pending')))
+        metrics['em_envio'] = len(os.listdir(self._folder('processing')))
+        metrics['falhas_arquivadas'] = len(os.listdir(self._folder('failed')))
+        metrics['workers_ativos'] = sum(1 for worker in self._workers if worker.is_alive())
+        return metrics
+
+
+mail_queue = MailQueueService()
+
+
+def _is_permanent(error):
+    # Respostas 5xx do servidor (destinatário inexistente, remetente recusado, mensagem rejeitada)
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+
+def dispatch_email(to_email, cc_email, from_email, subject, body):
+    if current_app.config.get('MAIL_QUEUE_ENABLED'):
+        return mail_queue.enqueue(to_email, cc_email, from_email, subject, body)
+    return send_email_py(to_email, cc_email, from_email, subject, body)
@@ -0,0 +1,225 @@
+from bisect import bisect_left, insort
+from collections import Counter
+from heapq import merge
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from threading import Lock, RLock
+import time
+
+from app.models.ator_model import Ator
+from app.models.ator_vinculo_model import AtorVinculo
+from app.repositories.ator_repository import AtorRepository
+from app.services.search_index_service import normalize_search
+
+# Papéis atendidos pelo índice (profissao_id)
+CHAT_PROFISSOES_UNIDADE = (28, 3)
+CHAT_PROFISSOES_GLOBAIS = (100,)
+INTERACIONAL_PROFISSOES = (2,)
+
+
+class MembershipIndexService:
+    # Atores ativos por papel, por unidade e globais, em listas ordenadas pelo nome sem acento nem caixa.
+    # Escritas feitas pela sessão do SQLAlchemy (atores e vínculos) atualizam as listas no commit. Inserções em
+    # lote (importação) chamam invalidate(); a recarga completa após MEMBERSHIP_INDEX_TTL só cobre outros
+    # workers e alterações fora da API.
+    # As listas devolvidas são compartilhadas entre requisições e não devem ser alteradas.
+    def __init__(self):
+        self.ator_repository = AtorRepository()
+        self._lock = RLock()
+        self._load_lock = Lock()
+        self._atores = None
+        self._vinculos = {}
+        self._vinculados = Counter()
+        self._por_unidade = {}
+        self._globais = []
+        self._interacionais = []
+        self._cache = {}
+        self._pendentes = None
+        self._invalidado = False
+        self._loaded_at = 0.0
+
+    def _is_stale(self):
+        ttl = current_app.config.get('MEMBERSHIP_INDEX_TTL', 300)
+        return self._atores is None or self._invalidado or time.monotonic() - self._loaded_at > ttl
+
+    def _ensure_loaded(self):
+        if not self._is_stale():
+            return
+        # Enquanto outra thread recarrega, os dados anteriores continuam valendo
+        if not self._load_lock.acquire(blocking=self._atores is None):
+            return
+        try:
+            with self._lock:
+                if not self._is_stale():
+                    return
+                # Escritas confirmadas durante a consulta são reaplicadas sobre a carga; uma invalidação
+                # feita durante ela vale para a próxima recarga
+                self._pendentes = []
+                self._invalidado = False
+            try:
+                ator_rows = self.ator_repository.get_membership_rows()
+                vinculo_rows = self.ator_repository.get_vinculo_rows()
+            except Exception:
+                with self._lock:
+                    self._pendentes = None
+                    self._invalidado = True
+                raise
+            with self._lock:
+                self.load(ator_rows, vinculo_rows)
+                pendentes, self._pendentes = self._pendentes, None
+                for operacao in pendentes:
+                    self._apply(*operacao)
+        finally:
+            self._load_lock.release()
+
+    def load(self, ator_rows, vinculo_rows):
+        # ator_rows: (id, nome, unidade_id, profissao_id) dos atores ativos com papel no índice ou vínculo
+        # vinculo_rows: (id, ator_id) de todos os vínculos
+        with self._lock:
+            self._atores = {}
+            self._vinculos = dict(vinculo_rows)
+            self._vinculados = Counter(self._vinculos.values())
+            self._por_unidade = {}
+            self._globais = []
+            self._interacionais = []
+            self._cache = {}
+            for ator_id, nome, unidade_id, profissao_id in ator_rows:
+                self._insert(ator_id, nome, unidade_id, profissao_id, ordenar=False)
+            for lista in (*self._por_unidade.values(), self._globais, self._interacionais):
+                lista.sort()
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        # As listas atuais seguem valendo para quem já as está lendo até a próxima recarga
+        with self._lock:
+            self._invalidado = True
+
+    def _listas(self, ator_id, unidade_id, profissao_id):
+        listas = []
+        if profissao_id in CHAT_PROFISSOES_UNIDADE:
+            listas.append(self._por_unidade.setdefault(unidade_id, []))
+        if profissao_id in CHAT_PROFISSOES_GLOBAIS:
+            listas.append(self._globais)
+        if profissao_id in INTERACIONAL_PROFISSOES or self._vinculados[ator_id] > 0:
+            listas.append(self._interacionais)
+        return listas
+
+    def _insert(self, ator_id, nome, unidade_id, profissao_id, ordenar=True):
+        listas = self._listas(ator_id, unidade_id, profissao_id)
+        if not listas:
+            return
+        # O id desempata nomes iguais: os itens nunca se comparam pelo dict
+        item = ((normalize_search(nome), ator_id), {'id': ator_id, 'nome': nome})
+        self._atores[ator_id] = (item, listas, nome, unidade_id, profissao_id)
+        for lista in listas:
+            if ordenar:
+                insort(lista, item)
+            else:
+                lista.append(item)
+        self._cache = {}
+
+    def _remove(self, ator_id):
+        entrada = self._atores.pop(ator_id, None)
+        if entrada is None:
+            return None
+        item, listas = entrada[0], entrada[1]
+        for lista in listas:
+            del lista[bisect_left(lista, item)]
+        self._cache = {}
+        return entrada[2:]
+
+    def _upsert_ator(self, ator_id, dados):
+        # dados: (nome, unidade_id, profissao_id, status) ou None para ator excluído
+        self._remove(ator_id)
+        if dados is not None and dados[3] != 2:
+            self._insert(ator_id, *dados[:3])
+
+    def _reavaliar(self, ator_id):
+        # Ganhou ou perdeu o último vínculo: entra ou sai dos interacionais
+        dados = self._remove(ator_id)
+        if dados is not None:
+            self._insert(ator_id, *dados)
+
+    def _set_vinculo(self, vinculo_id, ator_id, dados):
+        anterior = self._vinculos.pop(vinculo_id, None)
+        if anterior is not None:
+            self._vinculados[anterior] -= 1
+            if self._vinculados[anterior] <= 0:
+                del self._vinculados[anterior]
+            self._reavaliar(anterior)
+        if ator_id is None:
+            return
+        self._vinculos[vinculo_id] = ator_id
+        self._vinculados[ator_id] += 1
+        if dados is not None:
+            self._upsert_ator(ator_id, dados)
+        else:
+            self._reavaliar(ator_id)
+
+    def _apply(self, tipo, *args):
+        if tipo == 'ator':
+            self._upsert_ator(*args)
+        else:
+            self._set_vinculo(*args)
+
+    def apply(self, operacoes):
+        # Operações idempotentes ('ator', id, dados) e ('vinculo', id, ator_id, dados_do_ator)
+        with self._lock:
+            for operacao in operacoes:
+                if self._pendentes is not None:
+                    self._pendentes.append(operacao)
+                if self._atores is not None:
+                    self._apply(*operacao)
+
+    def chat_members(self, unidade_id):
+        self._ensure_loaded()
+        with self._lock:
+            membros = self._cache.get(('chat', unidade_id))
+            if membros is None:
+                # Unidade + globais, intercalados pela mesma ordem de nome
+                itens = merge(self._por_unidade.get(unidade_id, ()), self._globais)
+                membros = self._cache[('chat', unidade_id)] = [registro for _, registro in itens]
+            return membros
+
+    def interacionais(self):
+        self._ensure_loaded()
+        with self._lock:
+            membros = self._cache.get('interacionais')
+            if membros is None:
+                membros = self._cache['interacionais'] = [registro for _, registro in self._interacionais]
+            return membros
+
+
+membership_index = MembershipIndexService()
+
+
+def _dados_ator(ator):
+    return None if ator is None else (ator.nome, ator.unidade_id, ator.profissao_id, ator.status)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_membership_changes(session, flush_context):
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, Ator):
+            dados = None if instance in session.deleted else _dados_ator(instance)
+            session.info.setdefault('membership_index_operacoes', []).append(('ator', instance.id, dados))
+        elif isinstance(instance, AtorVinculo):
+            if instance in session.deleted or instance.ator_id is None:
+                operacao = ('vinculo', instance.id, None, None)
+            else:
+                # Os dados do ator vão junto: ele pode ainda não estar no índice
+                operacao = ('vinculo', instance.id, instance.ator_id, _dados_ator(session.get(Ator, instance.ator_id)))
+            session.info.setdefault('membership_index_operacoes', []).append(operacao)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_membership_changes(session):
+    operacoes = session.info.pop('membership_index_operacoes', None)
+    if operacoes:
+        membership_index.apply(operacoes)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_membership_changes(session):
+    session.info.pop('membership_index_operacoes', None)
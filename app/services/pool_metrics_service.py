@@ -0,0 +1,125 @@
+from threading import Lock
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Limites (em ms) dos buckets do histograma de espera por conexão
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = Lock()
+        self._connections = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+            self._wait_count = 0
+            self._wait_sum = 0.0
+            self._wait_max = 0.0
+            self._timeouts = 0
+            self._connects = 0
+            self._invalidations = 0
+
+    def record_wait(self, elapsed_ms):
+        with self._lock:
+            index = len(WAIT_BUCKETS_MS)
+            for position, limit in enumerate(WAIT_BUCKETS_MS):
+                if elapsed_ms <= limit:
+                    index = position
+                    break
+            self._wait_buckets[index] += 1
+            self._wait_count += 1
+            self._wait_sum += elapsed_ms
+            self._wait_max = max(self._wait_max, elapsed_ms)
+
+    def record_timeout(self):
+        with self._lock:
+            self._timeouts += 1
+
+    def attach(self, engine):
+        pool = engine.pool
+
+        @event.listens_for(pool, 'connect')
+        def on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                self._connects += 1
+                self._connections[id(dbapi_connection)] = time.monotonic()
+
+        @event.listens_for(pool, 'close')
+        def on_close(dbapi_connection, connection_record):
+            with self._lock:
+                self._connections.pop(id(dbapi_connection), None)
+
+        @event.listens_for(pool, 'close_detached')
+        def on_close_detached(dbapi_connection):
+            with self._lock:
+                self._connections.pop(id(dbapi_connection), None)
+
+        @event.listens_for(pool, 'invalidate')
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self._invalidations += 1
+
+    def snapshot(self, pool):
+        now = time.monotonic()
+        with self._lock:
+            ages = [now - connected_at for connected_at in self._connections.values()]
+            histograma = {}
+            acumulado = 0
+            for limit, count in zip(WAIT_BUCKETS_MS, self._wait_buckets):
+                acumulado += count
+                histograma[f'le_{limit}ms'] = acumulado
+            histograma['le_inf'] = acumulado + self._wait_buckets[-1]
+            espera = {
+                'checkouts': self._wait_count,
+                'total_ms': round(self._wait_sum, 3),
+                'media_ms': round(self._wait_sum / self._wait_count, 3) if self._wait_count else 0.0,
+                'max_ms': round(self._wait_max, 3),
+                'timeouts': self._timeouts,
+                'histograma': histograma
+            }
+            conexoes_abertas = {
+                'total': len(ages),
+                'criadas': self._connects,
+                'invalidadas': self._invalidations,
+                'idade_min_s': round(min(ages), 1) if ages else 0.0,
+                'idade_max_s': round(max(ages), 1) if ages else 0.0,
+                'idade_media_s': round(sum(ages) / len(ages), 1) if ages else 0.0
+            }
+
+        return {
+            'pool': type(pool).__name__,
+            'tamanho': _pool_stat(pool, 'size'),
+            'em_uso': _pool_stat(pool, 'checkedout'),
+            'disponiveis': _pool_stat(pool, 'checkedin'),
+            'overflow': _pool_stat(pool, 'overflow'),
+            'max_overflow': getattr(pool, '_max_overflow', None),
+            'espera': espera,
+            'conexoes': conexoes_abertas
+        }
+
+
+def _pool_stat(pool, name):
+    stat = getattr(pool, name, None)
+    return stat() if callable(stat) else None
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    # Mede o tempo gasto esperando uma conexão livre no pool
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        pool_metrics.record_wait((time.perf_counter() - started) * 1000)
+        return connection
@@ -0,0 +1,140 @@
+from functools import wraps
+from threading import Lock
+import json
+import sys
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.services.cache_service import TTLCache
+
+_MISSING = object()
+
+
+class MemoryCacheBackend:
+    def __init__(self, max_size, ttl):
+        self._cache = TTLCache(max_size=max_size, ttl=ttl)
+        self._generation = 0
+        self._lock = Lock()
+
+    def get(self, key):
+        return self._cache.get(key, _MISSING)
+
+    def set(self, key, value):
+        self._cache.set(key, value)
+
+    def generation(self):
+        return self._generation
+
+    def bump_generation(self):
+        with self._lock:
+            self._generation += 1
+        self._cache.clear()
+
+
+class RedisCacheBackend:
+    # Compartilha resultados e geração entre os workers; o pacote redis é opcional
+    def __init__(self, url, ttl, prefix='cognivox:query_cache'):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._ttl = ttl
+        self._prefix = prefix
+
+    def get(self, key):
+        value = self._client.get(f'{self._prefix}:{key}')
+        return _MISSING if value is None else json.loads(value)
+
+    def set(self, key, value):
+        self._client.set(f'{self._prefix}:{key}', json.dumps(value, default=str), ex=self._ttl)
+
+    def generation(self):
+        return int(self._client.get(f'{self._prefix}:generation') or 0)
+
+    def bump_generation(self):
+        self._client.incr(f'{self._prefix}:generation')
+
+
+class QueryCache:
+    def __init__(self):
+        self._backend = None
+        self._watched = ()
+
+    def init_app(self, app):
+        backend = app.config.get('QUERY_CACHE_BACKEND', 'memory')
+        ttl = app.config.get('QUERY_CACHE_TTL', 60)
+        if backend == 'redis':
+            self._backend = RedisCacheBackend(app.config.get('QUERY_CACHE_REDIS_URL'), ttl)
+        elif backend == 'memory':
+            self._backend = MemoryCacheBackend(app.config.get('QUERY_CACHE_SIZE', 256), ttl)
+        else:
+            self._backend = None
+
+    def watch(self, *models):
+        # Modelos cujas escritas invalidam o cache no commit da sessão
+        self._watched = tuple(dict.fromkeys((*self._watched, *models)))
+
+    def invalidate(self):
+        if self._backend is None:
+            return
+        try:
+            self._backend.bump_generation()
+        except Exception as e:
+            print(f"Falha ao invalidar o cache de consultas: {e}", file=sys.stderr)
+
+    def get_or_load(self, name, params, loader):
+        if self._backend is None:
+            return loader()
+
+        try:
+            key = f'{self._backend.generation()}:{name}:{json.dumps(params, default=str)}'
+            value = self._backend.get(key)
+        except Exception as e:
+            # Cache indisponível não pode derrubar a consulta
+            print(f"Falha ao ler o cache de consultas: {e}", file=sys.stderr)
+            return loader()
+
+        if value is not _MISSING:
+            return value
+
+        value = loader()
+        try:
+            self._backend.set(key, value)
+        except Exception as e:
+            print(f"Falha ao gravar o cache de consultas: {e}", file=sys.stderr)
+        return value
+
+
+query_cache = QueryCache()
+
+
+def cached_query(name):
+    # Para métodos de serviço que devolvem dados simples (dicts/listas), nunca objetos da sessão
+    def wrapper(fn):
+        @wraps(fn)
+        def decorator(self, *args):
+            return query_cache.get_or_load(name, args, lambda: fn(self, *args))
+        return decorator
+    return wrapper
+
+
+@event.listens_for(Session, 'after_flush')
+def _mark_dirty(session, flush_context):
+    # Tabelas escritas sem passar pelos serviços que já chamam query_cache.invalidate()
+    if not query_cache._watched:
+        return
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, query_cache._watched):
+            session.info['query_cache_dirty'] = True
+            return
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_dirty(session):
+    if session.info.pop('query_cache_dirty', False):
+        query_cache.invalidate()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_dirty(session):
+    session.info.pop('query_cache_dirty', None)
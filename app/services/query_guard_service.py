@@ -0,0 +1,60 @@
+from functools import wraps
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+from app.exceptions.custom_exceptions import HttpQueryBudgetExceededError
+
+_SEM_LIMITE = object()
+
+
+class QueryGuard:
+    def init_app(self, app, engine):
+        if not app.config.get('SQL_QUERY_BUDGET'):
+            return
+
+        event.listen(engine, 'before_cursor_execute', self._count_statement)
+        app.after_request(self._report)
+
+    def _budget(self):
+        budget = g.get('sql_query_budget', _SEM_LIMITE)
+        if budget is _SEM_LIMITE:
+            return current_app.config['SQL_QUERY_BUDGET']
+        return budget
+
+    def _count_statement(self, conn, cursor, statement, parameters, context, executemany):
+        if not has_request_context():
+            return
+
+        g.sql_statements = g.get('sql_statements', 0) + 1
+        budget = self._budget()
+        if budget and g.sql_statements > budget and current_app.config['SQL_QUERY_BUDGET_STRICT']:
+            raise HttpQueryBudgetExceededError(
+                f'{g.sql_statements} comandos SQL nesta requisição (limite {budget}); verifique carregamentos N+1.'
+            )
+
+    def _report(self, response):
+        statements = g.get('sql_statements', 0)
+        response.headers['X-SQL-Statements'] = str(statements)
+        budget = self._budget()
+        if budget and statements > budget:
+            current_app.logger.warning('%s comandos SQL em %s (limite %s)', statements, request.path, budget)
+        return response
+
+
+query_guard = QueryGuard()
+
+
+def set_query_budget(limit):
+    # Ajusta o limite da requisição atual; None desativa a verificação (ex.: streaming, importação em lote)
+    g.sql_query_budget = limit
+
+
+def query_budget(limit):
+    def wrapper(fn):
+        @wraps(fn)
+        def decorator(*args, **kwargs):
+            set_query_budget(limit)
+            return fn(*args, **kwargs)
+        return decorator
+    return wrapper
@@ -0,0 +1,132 @@
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models.unidade_model import Unidade
+from app.models.modalidade_ensino_model import ModalidadeEnsino
+from app.models.profissao_model import Profissao
+from app.models.parecer_psicologico_model import ParecerPsicologico
+from app.models.status_model import Status
+from app.models.tipo_vinculo_model import TipoVinculo
+from app.repositories.reference_data_repository import ReferenceDataRepository
+from app.services.auth_service import remove_accents_py
+from app.services.query_cache_service import query_cache
+from threading import Lock
+import time
+
+# Tabelas carregadas no cache; escritas nelas pela sessão do SQLAlchemy recarregam o cache no commit
+REFERENCE_MODELS = (Unidade, ModalidadeEnsino, Profissao, ParecerPsicologico, Status, TipoVinculo)
+
+
+def normalize_city(cidade):
+    if not cidade:
+        return None
+    return remove_accents_py(str(cidade)).strip().casefold()
+
+
+class ReferenceDataService:
+    def __init__(self):
+        self.reference_data_repository = ReferenceDataRepository()
+        self._lock = Lock()
+        self._data = None
+        self._expires_at = 0.0
+        self._version = 0
+        self._loaded_version = -1
+
+    def bump_version(self):
+        with self._lock:
+            self._version += 1
+
+    def _is_stale(self):
+        # Chamado a cada consulta de descrição (várias por linha nas listagens e exportações):
+        # o prazo do TTL é calculado na carga para não ler a configuração aqui
+        return (
+            self._data is None
+            or self._loaded_version != self._version
+            or time.monotonic() > self._expires_at
+        )
+
+    def _load(self):
+        unidades = {}
+        unidades_por_cidade = {}
+        grafias_por_cidade = {}
+        for unidade in self.reference_data_repository.get_unidades():
+            unidades[unidade.id] = unidade
+            unidades_por_cidade.setdefault(normalize_city(unidade.cidade), []).append(unidade.id)
+            grafias_por_cidade.setdefault(normalize_city(unidade.cidade), set()).add(unidade.cidade)
+
+        return {
+            'profissao': dict(self.reference_data_repository.get_profissoes()),
+            'modalidade_ensino': dict(self.reference_data_repository.get_modalidades_ensino()),
+            'parecer_psicologico': dict(self.reference_data_repository.get_pareceres_psicologicos()),
+            'status': dict(self.reference_data_repository.get_status()),
+            'tipo_vinculo': dict(self.reference_data_repository.get_tipos_vinculo()),
+            'unidade': unidades,
+            'unidades_por_cidade': unidades_por_cidade,
+            'grafias_por_cidade': {chave: sorted(grafias) for chave, grafias in grafias_por_cidade.items() if chave}
+        }
+
+    def _get_data(self):
+        if self._is_stale():
+            with self._lock:
+                if self._is_stale():
+                    version = self._version
+                    self._data = self._load()
+                    self._expires_at = time.monotonic() + current_app.config.get('REFERENCE_DATA_TTL', 300)
+                    self._loaded_version = version
+        return self._data
+
+    def profissao(self, profissao_id):
+        return self._get_data()['profissao'].get(profissao_id)
+
+    def modalidade_ensino(self, modalidade_ensino_id):
+        return self._get_data()['modalidade_ensino'].get(modalidade_ensino_id)
+
+    def parecer_psicologico(self, parecer_psicologico_id):
+        return self._get_data()['parecer_psicologico'].get(parecer_psicologico_id)
+
+    def status(self, codigo):
+        return self._get_data()['status'].get(codigo)
+
+    def tipo_vinculo(self, tipo_vinculo_id):
+        return self._get_data()['tipo_vinculo'].get(tipo_vinculo_id)
+
+    def unidade(self, unidade_id):
+        return self._get_data()['unidade'].get(unidade_id)
+
+    def nome_instituicao(self, unidade_id):
+        unidade = self.unidade(unidade_id)
+        return unidade.nome_instituicao if unidade else None
+
+    def cidade(self, unidade_id):
+        unidade = self.unidade(unidade_id)
+        return unidade.cidade if unidade else None
+
+    def unidade_ids_by_city(self, cidade):
+        return self._get_data()['unidades_por_cidade'].get(normalize_city(cidade), [])
+
+    def city_names(self, cidade):
+        # Grafias de unidade.cidade com a mesma chave normalizada (sem acentos/caixa), para filtros indexados
+        return self._get_data()['grafias_por_cidade'].get(normalize_city(cidade), [])
+
+
+reference_data = ReferenceDataService()
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_reference_changes(session, flush_context):
+    if any(isinstance(instance, REFERENCE_MODELS) for instance in (*session.new, *session.dirty, *session.deleted)):
+        session.info['reference_data_alterada'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_reference_changes(session):
+    # Outros workers e alterações fora da sessão (SQL direto) continuam dependendo do REFERENCE_DATA_TTL
+    if session.info.pop('reference_data_alterada', False):
+        reference_data.bump_version()
+        # Consultas em cache que filtram por unidade/cidade (ex.: psicólogos por cidade)
+        query_cache.invalidate()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_reference_changes(session):
+    session.info.pop('reference_data_alterada', None)
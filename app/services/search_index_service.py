@@ -0,0 +1,235 @@
+from bisect import bisect_left, bisect_right, insort
+from itertools import accumulate, islice
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from threading import RLock
+import re
+import time
+
+from app.models.ator_model import Ator
+from app.repositories.ator_repository import AtorRepository
+from app.services.auth_service import remove_accents_py
+
+# Separador dos registros no texto de busca: não sobrevive à normalização das consultas
+_SEPARADOR = '\x1e'
+_ESPACOS = re.compile(r'\s+')
+_CONTROLE = re.compile(r'[\x00-\x1f]')
+# Escritas acumuladas antes de remontar os textos de busca
+_MAX_PENDENTES = 1000
+
+
+def normalize_search(text):
+    if not text:
+        return ''
+    text = _CONTROLE.sub(' ', remove_accents_py(str(text)))
+    return _ESPACOS.sub(' ', text).strip().casefold()
+
+
+def _scan(texto, inicios, termo):
+    # Índices dos registros que contêm o termo, uma vez cada, na ordem do texto
+    position = texto.find(termo)
+    while position != -1:
+        indice = bisect_right(inicios, position) - 1
+        yield indice
+        position = texto.find(termo, inicios[indice + 1])
+
+
+class SearchIndexService:
+    # Busca por nome/e-mail de atores ativos sem acento nem caixa, inteira em memória. Ordem do resultado:
+    # 1. nome começa com o termo      -> bisect na lista ordenada por nome
+    # 2. palavra do nome começa com ele, 3. nome contém -> str.find no texto com todos os nomes
+    # 4. e-mail começa com o termo    -> bisect na lista ordenada por e-mail
+    # 5. e-mail contém                -> str.find no texto com todos os e-mails
+    # Os textos seguem a ordem dos nomes, então cada faixa sai ordenada e a varredura para ao completar o limite.
+    # Escritas feitas pela sessão do SQLAlchemy atualizam o índice no commit: as listas ordenadas na hora e os
+    # textos por meio de um delta (registros novos/alterados e ids obsoletos) até _MAX_PENDENTES escritas.
+    # A importação em lote chama invalidate(); outros workers e alterações fora da API entram na recarga
+    # após SEARCH_INDEX_TTL.
+    def __init__(self):
+        self.ator_repository = AtorRepository()
+        self._lock = RLock()
+        self._registros = None
+        self._por_nome = []
+        self._por_email = []
+        self._textos = None
+        self._delta = {}
+        self._obsoletos = set()
+        self._loaded_at = 0.0
+
+    def _is_stale(self):
+        ttl = current_app.config.get('SEARCH_INDEX_TTL', 600)
+        return self._registros is None or time.monotonic() - self._loaded_at > ttl
+
+    def load(self, rows):
+        # rows: (id, nome, email) dos atores ativos
+        registros = {}
+        for ator_id, nome, email in rows:
+            registros[ator_id] = (normalize_search(nome), normalize_search(email), nome, email)
+        with self._lock:
+            self._registros = registros
+            self._por_nome = sorted((registro[0], ator_id) for ator_id, registro in registros.items())
+            self._por_email = sorted((registro[1], ator_id) for ator_id, registro in registros.items())
+            self._textos = None
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        with self._lock:
+            self._registros = None
+
+    def _ensure_loaded(self):
+        # Verificação e carga na mesma posse do lock: invalidate() não pode zerar o índice no meio da busca
+        with self._lock:
+            if self._is_stale():
+                self.load(self.ator_repository.get_search_rows())
+
+    def upsert(self, ator_id, nome, email, status):
+        with self._lock:
+            if self._registros is None:
+                return
+            self._remove(ator_id)
+            if status == 2:
+                return
+            registro = (normalize_search(nome), normalize_search(email), nome, email)
+            self._registros[ator_id] = registro
+            insort(self._por_nome, (registro[0], ator_id))
+            insort(self._por_email, (registro[1], ator_id))
+            if self._textos is not None:
+                self._delta[ator_id] = registro
+                if len(self._delta) > _MAX_PENDENTES:
+                    self._textos = None
+
+    def remove(self, ator_id):
+        with self._lock:
+            if self._registros is not None:
+                self._remove(ator_id)
+
+    def _remove(self, ator_id):
+        registro = self._registros.pop(ator_id, None)
+        if registro is None:
+            return
+        for lista, chave in ((self._por_nome, registro[0]), (self._por_email, registro[1])):
+            position = bisect_left(lista, (chave, ator_id))
+            if position < len(lista) and lista[position] == (chave, ator_id):
+                del lista[position]
+        if self._textos is not None:
+            self._delta.pop(ator_id, None)
+            self._obsoletos.add(ator_id)
+            if len(self._obsoletos) > _MAX_PENDENTES:
+                self._textos = None
+
+    def _get_textos(self):
+        if self._textos is None:
+            self._delta = {}
+            self._obsoletos = set()
+            ids = [ator_id for _, ator_id in self._por_nome]
+            nomes = [self._registros[ator_id][0] for ator_id in ids]
+            emails = [self._registros[ator_id][1] for ator_id in ids]
+            self._textos = (
+                ids,
+                _SEPARADOR.join(nomes) + _SEPARADOR,
+                list(accumulate((len(nome) + 1 for nome in nomes), initial=0)),
+                _SEPARADOR.join(emails) + _SEPARADOR,
+                list(accumulate((len(email) + 1 for email in emails), initial=0))
+            )
+        return self._textos
+
+    def _prefixed(self, lista, termo, escolhidos, quantidade):
+        encontrados = []
+        for chave, ator_id in islice(lista, bisect_left(lista, (termo,)), None):
+            if len(encontrados) == quantidade or not chave.startswith(termo):
+                break
+            if ator_id not in escolhidos:
+                encontrados.append(ator_id)
+        return encontrados
+
+    def _scan_ids(self, ids, texto, inicios, termo, escolhidos):
+        for indice in _scan(texto, inicios, termo):
+            ator_id = ids[indice]
+            if ator_id not in escolhidos and ator_id not in self._obsoletos:
+                yield ator_id
+
+    def _by_nome(self, ator_ids):
+        # Junta o que veio do texto (já ordenado) com o delta, na ordem (nome normalizado, id)
+        if not self._delta:
+            return ator_ids
+        return sorted(ator_ids, key=lambda ator_id: (self._registros[ator_id][0], ator_id))
+
+    def search(self, termo, limit=20):
+        termo = normalize_search(termo)
+        if not termo:
+            return []
+
+        with self._lock:
+            self._ensure_loaded()
+            resultado = self._prefixed(self._por_nome, termo, (), limit)
+            if len(resultado) < limit:
+                ids, nomes, inicios_nomes, emails, inicios_emails = self._get_textos()
+                escolhidos = set(resultado)
+                faltam = limit - len(resultado)
+
+                inicio_palavra, meio = [], []
+                for ator_id in self._scan_ids(ids, nomes, inicios_nomes, termo, escolhidos):
+                    if ' ' + termo in self._registros[ator_id][0]:
+                        inicio_palavra.append(ator_id)
+                        if len(inicio_palavra) == faltam:
+                            break
+                    else:
+                        meio.append(ator_id)
+                for ator_id, registro in self._delta.items():
+                    if ator_id not in escolhidos and termo in registro[0]:
+                        (inicio_palavra if ' ' + termo in registro[0] else meio).append(ator_id)
+                resultado.extend((self._by_nome(inicio_palavra) + self._by_nome(meio))[:faltam])
+
+                if len(resultado) < limit:
+                    escolhidos.update(resultado)
+                    resultado.extend(self._prefixed(self._por_email, termo, escolhidos, limit - len(resultado)))
+
+                if len(resultado) < limit:
+                    escolhidos.update(resultado)
+                    faltam = limit - len(resultado)
+                    trechos = []
+                    for ator_id in self._scan_ids(ids, emails, inicios_emails, termo, escolhidos):
+                        trechos.append(ator_id)
+                        if len(trechos) == faltam:
+                            break
+                    trechos.extend(
+                        ator_id for ator_id, registro in self._delta.items()
+                        if ator_id not in escolhidos and termo in registro[1]
+                    )
+                    resultado.extend(self._by_nome(trechos)[:faltam])
+
+            return [self._item(ator_id) for ator_id in resultado]
+
+    def _item(self, ator_id):
+        registro = self._registros[ator_id]
+        return {'id': ator_id, 'nome': registro[2], 'email': registro[3]}
+
+
+search_index = SearchIndexService()
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_ator_changes(session, flush_context):
+    for instance in (*session.new, *session.dirty):
+        if isinstance(instance, Ator):
+            pendentes = session.info.setdefault('search_index_pendentes', {})
+            pendentes[instance.id] = (instance.nome, instance.email, instance.status)
+    for instance in session.deleted:
+        if isinstance(instance, Ator):
+            pendentes = session.info.setdefault('search_index_pendentes', {})
+            pendentes[instance.id] = None
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_ator_changes(session):
+    for ator_id, dados in session.info.pop('search_index_pendentes', {}).items():
+        if dados is None:
+            search_index.remove(ator_id)
+        else:
+            search_index.upsert(ator_id, *dados)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_ator_changes(session):
+    session.info.pop('search_index_pendentes', None)
@@ -0,0 +1,207 @@
+from collections import Counter
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from threading import Lock, RLock
+import time
+
+from app.models.ator_model import Ator
+from app.models.quadro_psicopedagogico_model import QuadroPsicopedagogico
+from app.repositories.ator_repository import AtorRepository
+from app.services.reference_data_service import reference_data
+
+ALUNO_PROFISSAO_ID = 1
+
+
+class AtorStatsService:
+    # Contadores do painel sobre os atores ativos (status != 2): total, alunos e totais por unidade,
+    # modalidade, profissão e parecer psicológico (atores distintos com o parecer em algum quadro).
+    # Guarda em memória o estado de cada ator e o parecer de cada quadro para aplicar só a diferença de cada
+    # escrita, no commit da sessão do SQLAlchemy; reaplicar a mesma escrita não muda os contadores.
+    # Inserções em lote, outros workers e alterações fora da API entram na recarga completa após STATS_TTL
+    # ou em rebuild().
+    def __init__(self):
+        self.ator_repository = AtorRepository()
+        self._lock = RLock()
+        self._load_lock = Lock()
+        self._atores = None
+        self._quadros = {}
+        self._pareceres = {}
+        self._contadores = {}
+        self._pendentes = None
+        self._invalidado = False
+        self._loaded_at = 0.0
+        self._atualizado_em = None
+
+    def _is_stale(self):
+        ttl = current_app.config.get('STATS_TTL', 300)
+        return self._atores is None or self._invalidado or time.monotonic() - self._loaded_at > ttl
+
+    def load(self, ator_rows, quadro_rows):
+        # ator_rows: (id, profissao_id, unidade_id, modalidade_ensino_id) dos atores ativos
+        # quadro_rows: (id, ator_id, parecer_psicologico_id) de todos os quadros psicopedagógicos
+        atores = {ator_id: (profissao_id, unidade_id, modalidade_id) for ator_id, profissao_id, unidade_id, modalidade_id in ator_rows}
+        quadros = {quadro_id: (ator_id, parecer_id) for quadro_id, ator_id, parecer_id in quadro_rows}
+        pareceres = {}
+        for ator_id, parecer_id in quadros.values():
+            pareceres.setdefault(ator_id, Counter())[parecer_id] += 1
+
+        contadores = {
+            'profissao': Counter(estado[0] for estado in atores.values()),
+            'unidade': Counter(estado[1] for estado in atores.values()),
+            'modalidade': Counter(estado[2] for estado in atores.values()),
+            'parecer': Counter(
+                parecer_id for ator_id, por_parecer in pareceres.items() if ator_id in atores for parecer_id in por_parecer
+            ),
+        }
+        with self._lock:
+            self._atores = atores
+            self._quadros = quadros
+            self._pareceres = pareceres
+            self._contadores = contadores
+            self._loaded_at = time.monotonic()
+            self._atualizado_em = datetime.now()
+
+    def invalidate(self):
+        # Os contadores atuais seguem valendo para quem já os está lendo até a próxima recarga
+        with self._lock:
+            self._invalidado = True
+
+    def _reload(self, force=False):
+        # Chamado com _load_lock. A consulta roda fora do lock dos contadores; escritas confirmadas
+        # enquanto ela roda são reaplicadas sobre a carga e uma invalidação feita durante ela vale
+        # para a próxima recarga.
+        with self._lock:
+            if not force and not self._is_stale():
+                return
+            self._pendentes = []
+            self._invalidado = False
+        try:
+            rows = self.ator_repository.get_stats_rows()
+        except Exception:
+            with self._lock:
+                self._pendentes = None
+                self._invalidado = True
+            raise
+        with self._lock:
+            self.load(*rows)
+            pendentes, self._pendentes = self._pendentes, None
+            for operacao in pendentes:
+                self._apply(*operacao)
+
+    def rebuild(self):
+        with self._load_lock:
+            self._reload(force=True)
+        return self.summary()
+
+    def _ensure_loaded(self):
+        # Enquanto outra thread recarrega, os contadores anteriores continuam valendo
+        if self._is_stale() and self._load_lock.acquire(blocking=self._atores is None):
+            try:
+                self._reload()
+            finally:
+                self._load_lock.release()
+
+    def _count(self, estado, pareceres, sinal):
+        self._contadores['profissao'][estado[0]] += sinal
+        self._contadores['unidade'][estado[1]] += sinal
+        self._contadores['modalidade'][estado[2]] += sinal
+        for parecer_id in pareceres or ():
+            self._contadores['parecer'][parecer_id] += sinal
+
+    def _upsert_ator(self, ator_id, dados):
+        # dados: (profissao_id, unidade_id, modalidade_ensino_id, status) ou None para ator excluído
+        estado = self._atores.pop(ator_id, None)
+        if estado is not None:
+            self._count(estado, self._pareceres.get(ator_id), -1)
+        if dados is None or dados[3] == 2:
+            return
+        estado = dados[:3]
+        self._atores[ator_id] = estado
+        self._count(estado, self._pareceres.get(ator_id), 1)
+
+    def _change_parecer(self, ator_id, parecer_id, sinal):
+        por_parecer = self._pareceres.setdefault(ator_id, Counter())
+        antes = por_parecer[parecer_id] > 0
+        por_parecer[parecer_id] += sinal
+        depois = por_parecer[parecer_id] > 0
+        if not depois:
+            del por_parecer[parecer_id]
+        # O ator conta uma vez por parecer, mesmo com vários quadros iguais
+        if ator_id in self._atores and antes != depois:
+            self._contadores['parecer'][parecer_id] += 1 if depois else -1
+
+    def _set_quadro(self, quadro_id, dados):
+        # dados: (ator_id, parecer_psicologico_id) atuais do quadro ou None para quadro excluído
+        anterior = self._quadros.pop(quadro_id, None)
+        if anterior is not None:
+            self._change_parecer(*anterior, -1)
+        if dados is not None:
+            self._quadros[quadro_id] = dados
+            self._change_parecer(*dados, 1)
+
+    def _apply(self, tipo, chave, dados):
+        if tipo == 'ator':
+            self._upsert_ator(chave, dados)
+        else:
+            self._set_quadro(chave, dados)
+
+    def apply(self, operacoes):
+        # Operações ('ator', id, dados) e ('quadro', id, dados), na ordem do commit
+        with self._lock:
+            for operacao in operacoes:
+                if self._pendentes is not None:
+                    self._pendentes.append(operacao)
+                if self._atores is not None:
+                    self._apply(*operacao)
+
+    def _items(self, dimensao, descricao):
+        return [
+            {'id': chave, 'descricao': descricao(chave) if chave is not None else None, 'total': total}
+            for chave, total in sorted(
+                self._contadores[dimensao].items(), key=lambda item: (item[0] is None, item[0] or 0)
+            )
+            if total > 0
+        ]
+
+    def summary(self):
+        self._ensure_loaded()
+        with self._lock:
+            return {
+                'total': len(self._atores),
+                'alunos': self._contadores['profissao'][ALUNO_PROFISSAO_ID],
+                'por_unidade': self._items('unidade', reference_data.nome_instituicao),
+                'por_modalidade': self._items('modalidade', reference_data.modalidade_ensino),
+                'por_profissao': self._items('profissao', reference_data.profissao),
+                'por_parecer': self._items('parecer', reference_data.parecer_psicologico),
+                'atualizado_em': self._atualizado_em.isoformat(timespec='seconds')
+            }
+
+
+ator_stats = AtorStatsService()
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_stats_changes(session, flush_context):
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, Ator):
+            dados = None if instance in session.deleted else (
+                instance.profissao_id, instance.unidade_id, instance.modalidade_ensino_id, instance.status
+            )
+            session.info.setdefault('ator_stats_operacoes', []).append(('ator', instance.id, dados))
+        elif isinstance(instance, QuadroPsicopedagogico):
+            dados = None if instance in session.deleted else (instance.ator_id, instance.parecer_psicologico_id)
+            session.info.setdefault('ator_stats_operacoes', []).append(('quadro', instance.id, dados))
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_stats_changes(session):
+    operacoes = session.info.pop('ator_stats_operacoes', None)
+    if operacoes:
+        ator_stats.apply(operacoes)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_stats_changes(session):
+    session.info.pop('ator_stats_operacoes', None)
@@ -0,0 +1,52 @@
+# Conta os comandos SQL enviados ao banco por AtorService.create_ator (SQLite em memória).
+# Uso: python -m benchmarks.create_ator_roundtrips
+import os
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+os.environ.setdefault('MAIL_PORT', '25')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+os.environ.setdefault('JWT_SECRET_KEY', 'benchmark')
+
+from datetime import date
+from sqlalchemy import event
+
+from app import create_app, db
+from app.dtos.ator_dto import AtorCreateDTO
+from app.services.ator_service import AtorService
+
+
+def _payload(index, com_responsavel):
+    payload = {
+        'nome': f'Aluno {index}', 'email': f'aluno{index}@example.com', 'usuario': f'aluno{index}',
+        'senha': 'senha', 'grupo_usuario': 1, 'cpf': f'{index:011d}', 'profissao_id': 1,
+        'unidade_id': 1, 'status': 2, 'data_nascimento': date(2016, 1, 1).isoformat()
+    }
+    if com_responsavel:
+        payload.update({
+            'TIPO_VINCULO': 1, 'NOMER': f'Responsável {index}', 'EMAILR': f'resp{index}@example.com',
+            'TELEFONECEL': '82999999999', 'LOGINR': f'resp{index}', 'SENHAR': 'senha'
+        })
+    return payload
+
+
+def main():
+    app = create_app()
+    statements = []
+
+    with app.app_context():
+        @event.listens_for(db.engine, 'before_cursor_execute')
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.split(None, 1)[0].upper())
+
+        service = AtorService()
+        for index, com_responsavel in enumerate((False, True), start=1):
+            statements.clear()
+            service.create_ator(AtorCreateDTO.from_dict(_payload(index, com_responsavel)), 'http://localhost/')
+            db.session.remove()
+            resumo = {kind: statements.count(kind) for kind in sorted(set(statements))}
+            descricao = 'com responsável' if com_responsavel else 'sem responsável'
+            print(f'create_ator ({descricao}): {len(statements)} comandos {resumo}')
+
+
+if __name__ == '__main__':
+    main()
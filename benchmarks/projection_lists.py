@@ -0,0 +1,73 @@
+# Memória e latência das listagens de atores (alunos DI) com entidades do ORM x projeção de colunas.
+# Uso: python -m benchmarks.projection_lists [quantidade]
+import os
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+os.environ.setdefault('MAIL_PORT', '25')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+os.environ.setdefault('JWT_SECRET_KEY', 'benchmark')
+
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+from sqlalchemy import insert
+from sqlalchemy.orm import raiseload
+
+from app import create_app, db
+from app.models.ator_model import Ator
+from app.repositories.ator_repository import ATOR_CAMPOS, AtorRepository
+
+
+def _seed(quantidade):
+    rows = [{
+        'id': index, 'nome': f'Aluno {index:06d}', 'email': f'aluno{index}@example.com', 'cpf': f'{index:011d}',
+        'ano_sessao': '2025', 'data_nascimento': date(2015, 1 + index % 12, 1), 'data_inicio_intervencao': date(2025, 1, 1),
+        'endereco': 'Rua das Flores, 123 - Centro', 'cidade': 'Maceió', 'estado': 'AL', 'pais': 'Brasil',
+        'hexadecimal_foto': f'/src/assets/temp/{index}foto_do_aluno.jpg', 'telefone_cel': '82999999999',
+        'unidade_id': 1 + index % 40, 'profissao_id': 1, 'modalidade_ensino_id': 1 + index % 9, 'status': 1
+    } for index in range(1, quantidade + 1)]
+    db.session.execute(insert(Ator), rows)
+    db.session.commit()
+
+
+def _entities():
+    # Implementação anterior de get_all_students_di
+    return [a.to_dict() for a in Ator.query.options(raiseload('*')).filter(Ator.profissao_id == 1, Ator.status != 2)
+            .order_by(Ator.nome).all()]
+
+
+def _measure(fn):
+    db.session.expunge_all()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, len(result)
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    app = create_app()
+    repository = AtorRepository()
+
+    with app.app_context():
+        _seed(quantidade)
+        # O repositório não passa pelo cache de consultas (aplicado nos serviços)
+        print(f'{quantidade} alunos DI (SQLite em memória):')
+        for nome, fn in (
+            ('entidades ORM + to_dict (anterior)', _entities),
+            ('projeção, todas as colunas', lambda: repository.get_all_students_di(ATOR_CAMPOS)),
+            ('projeção id,nome (dicts)', lambda: repository.get_all_students_di(('id', 'nome'))),
+            ('projeção id,nome (Rows)', lambda: repository.project_atores(
+                ('id', 'nome'), Ator.profissao_id == 1, Ator.status != 2)),
+        ):
+            elapsed, peak, linhas = _measure(fn)
+            print(f'  {nome:<36} {elapsed * 1000:8.1f} ms  pico {peak / 1024 / 1024:7.1f} MiB  ({linhas} linhas)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+# Latência da busca de atores (search_index_service) com 100k registros sintéticos em memória.
+# Uso: python -m benchmarks.search_index [quantidade]
+import os
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+os.environ.setdefault('MAIL_PORT', '25')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+os.environ.setdefault('JWT_SECRET_KEY', 'benchmark')
+
+import random
+import sys
+import time
+
+from app import create_app
+from app.services.search_index_service import SearchIndexService
+
+PRENOMES = ('João', 'Maria', 'José', 'Ana', 'Antônio', 'Francisca', 'Luís', 'Letícia', 'Gabriel', 'Cecília', 'Conceição')
+SOBRENOMES = ('Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Araújo', 'Gonçalves', 'Conceição', 'Ribeiro', 'Simões')
+CONSULTAS = ('a', 'jo', 'joão', 'maria s', 'conceicao', 'GONÇALVES', 'ila', 'aluno77', '@escola', 'xyzw')
+
+
+def _rows(quantidade):
+    rng = random.Random(42)
+    for ator_id in range(1, quantidade + 1):
+        nome = f'{rng.choice(PRENOMES)} {rng.choice(PRENOMES)} {rng.choice(SOBRENOMES)} {rng.choice(SOBRENOMES)}'
+        yield ator_id, nome.upper() if ator_id % 5 == 0 else nome, f'aluno{ator_id}@escola.example.com'
+
+
+def _ms(fn):
+    started = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    app = create_app()
+    index = SearchIndexService()
+
+    with app.app_context():
+        elapsed, _ = _ms(lambda: index.load(_rows(quantidade)))
+        print(f'carga de {quantidade} atores: {elapsed:.1f} ms')
+        elapsed, _ = _ms(lambda: index.search('zzz'))
+        print(f'primeira busca por trecho (monta o texto normalizado): {elapsed:.1f} ms')
+
+        for consulta in CONSULTAS:
+            tempos = []
+            for _ in range(20):
+                elapsed, resultado = _ms(lambda: index.search(consulta, 20))
+                tempos.append(elapsed)
+            tempos.sort()
+            print(f'  {consulta!r:<14} mediana {tempos[10]:6.2f} ms  pior {tempos[-1]:6.2f} ms  ({len(resultado)} resultados)')
+
+        elapsed, _ = _ms(lambda: index.upsert(quantidade + 1, 'Zélia Nova', 'zelia@escola.example.com', 1))
+        print(f'upsert: {elapsed:.2f} ms')
+        elapsed, resultado = _ms(lambda: index.search('zelia'))
+        print(f'busca após escrita (texto base + delta): {elapsed:.1f} ms -> {resultado}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# Custo de serialização de 10k linhas do grid de atores em cada caminho disponível.
+# Uso: python -m benchmarks.serialization_grid [quantidade]
+import os
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('MAIL_PORT', '25')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+os.environ.setdefault('JWT_SECRET_KEY', 'benchmark')
+
+import json
+import sys
+import time
+from datetime import date
+
+from flask_restx import marshal
+
+from app.controllers.ator_controller import ator_filtered_grid_item_model
+from app.dtos.ator_dto import AtorFilteredGridItemDTO
+from app.dtos.serializers import row_encoder
+
+GRID_COLUMNS = (
+    ('id', 'int'), ('nome', 'str'), ('idade', 'int'), ('foto', 'str'), ('dados_ator', 'str'),
+    ('modalidade', 'str'), ('tipo', 'str'), ('instituicao', 'str'), ('municipio', 'str'),
+    ('parecer', 'str'), ('status', 'str'),
+)
+encode_grid_row = row_encoder('benchmark_grid_row', GRID_COLUMNS)
+
+
+def _rows(quantidade):
+    return [
+        (index, f'Aluno {index} João', 6 + index % 10, f'/api/ator/{index}/foto/arquivo' if index % 3 else None,
+         f'Aluno {index} João - 2015', f'{1 + index % 9} Ano', 'Aluno', 'Escola Municipal', 'Maceió',
+         None if index % 4 else 'Bom', 'Ativo')
+        for index in range(quantidade)
+    ]
+
+
+def _reflective_to_dict(dto):
+    # Implementação anterior dos DTOs: percorre __dataclass_fields__ a cada objeto
+    data_dict = {}
+    for field_name in dto.__dataclass_fields__.keys():
+        value = getattr(dto, field_name)
+        if isinstance(value, date):
+            data_dict[field_name] = value.isoformat()
+        elif value is not None:
+            data_dict[field_name] = value
+    return data_dict
+
+
+def _legacy(rows):
+    dtos = [AtorFilteredGridItemDTO(*row) for row in rows]
+    return json.dumps(marshal([_reflective_to_dict(dto) for dto in dtos], ator_filtered_grid_item_model)).encode()
+
+
+def _marshal(rows):
+    dtos = [AtorFilteredGridItemDTO(*row) for row in rows]
+    return json.dumps(marshal(dtos, ator_filtered_grid_item_model)).encode()
+
+
+def _compiled_to_dict(rows):
+    return json.dumps([AtorFilteredGridItemDTO(*row).to_dict() for row in rows]).encode()
+
+
+def _row_encoder(rows):
+    return b'[' + b','.join(encode_grid_row(row) for row in rows) + b']'
+
+
+def _measure(fn, rows, repeticoes=5):
+    best = None
+    for _ in range(repeticoes):
+        started = time.perf_counter()
+        fn(rows)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rows = _rows(quantidade)
+    # O JSON do encoder compilado precisa ser equivalente ao de json.dumps (nulos explícitos)
+    esperado = [dict(zip([key for key, kind in GRID_COLUMNS], row)) for row in rows]
+    assert json.loads(_row_encoder(rows)) == esperado
+
+    print(f'{quantidade} linhas do grid (melhor de 5):')
+    for nome, fn in (
+        ('to_dict reflexivo + marshal + json.dumps', _legacy),
+        ('DTO + marshal + json.dumps', _marshal),
+        ('to_dict compilado + json.dumps', _compiled_to_dict),
+        ('row_encoder (Row -> bytes)', _row_encoder),
+    ):
+        elapsed = _measure(fn, rows)
+        print(f'  {nome:<42} {elapsed * 1000:8.1f} ms  ({elapsed * 1e6 / quantidade:.2f} us/linha)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+import base64
+import os
+import random
+from datetime import date
+
+# app.config lê o ambiente na importação: banco SQLite em memória e e-mail sem fila nem servidor
+os.environ['DATABASE_URL'] = 'sqlite://'
+os.environ['MAIL_QUEUE_ENABLED'] = 'False'
+os.environ.setdefault('MAIL_PORT', '25')
+os.environ.setdefault('SECRET_KEY', 'testes')
+os.environ.setdefault('JWT_SECRET_KEY', 'testes-testes-testes-testes-testes')
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app, db
+from app.models.ator_model import Ator
+from app.models.ator_vinculo_model import AtorVinculo
+from app.models.modalidade_ensino_model import ModalidadeEnsino
+from app.models.parecer_psicologico_model import ParecerPsicologico
+from app.models.profissao_model import Profissao
+from app.models.quadro_psicopedagogico_model import QuadroPsicopedagogico
+from app.models.status_model import Status
+from app.models.tipo_vinculo_model import TipoVinculo
+from app.models.unidade_model import Unidade
+from app.models.user_model import Usuario
+
+ADMIN_ID = 1
+ADMIN_EMAIL = 'admin@cognivox.test'
+ADMIN_SENHA = '123'
+
+
+def _seed():
+    db.session.add_all([
+        Unidade(id=1, nome_instituicao='Escola Municipal A', cidade='Maceió', estado='AL'),
+        Unidade(id=2, nome_instituicao='Escola Estadual B', cidade='Recife', estado='PE'),
+        *[Profissao(id=chave, descricao=descricao) for chave, descricao in (
+            (1, 'Aluno DI'), (2, 'Interacional'), (3, 'Psicólogo'), (4, 'Professor'), (28, 'Responsável'),
+            (100, 'Administrador'),
+        )],
+        ModalidadeEnsino(id=1, descricao='1º Ano'), ModalidadeEnsino(id=2, descricao='2º Ano'),
+        Status(codigo=1, descricao='Ativo'), Status(codigo=2, descricao='Inativo'),
+        TipoVinculo(id=1, descricao='Mãe'),
+        ParecerPsicologico(id=1, descricao='Favorável'), ParecerPsicologico(id=2, descricao='Desfavorável'),
+    ])
+    admin = Ator(id=ADMIN_ID, nome='Administrador', email=ADMIN_EMAIL, profissao_id=100, unidade_id=1, status=1)
+    admin.usuario = Usuario(
+        usuario='admin', senha=base64.b64encode(ADMIN_SENHA.encode()).decode(), email=ADMIN_EMAIL, cod_grupo_usuario=1
+    )
+    db.session.add_all([
+        admin,
+        Ator(id=2, nome='Psicóloga Joana', email='joana@cognivox.test', profissao_id=3, unidade_id=1, status=1,
+             cidade='Maceió'),
+        Ator(id=3, nome='Interacional Ana', email='ana@cognivox.test', profissao_id=2, unidade_id=1, status=1),
+        Ator(id=4, nome='Responsável Maria', email='maria@cognivox.test', profissao_id=28, unidade_id=1, status=1),
+    ])
+    for ator_id in range(10, 20):
+        db.session.add(Ator(
+            id=ator_id, nome=f'Aluno {ator_id:03d}', email=f'aluno{ator_id}@cognivox.test', cpf=f'{ator_id:011d}',
+            profissao_id=1, unidade_id=1 + ator_id % 2, modalidade_ensino_id=1 + ator_id % 2, status=1,
+            data_nascimento=date(2015, 1 + ator_id % 12, 1), ano_sessao='2025'
+        ))
+        db.session.add(AtorVinculo(ator_id=4, ator_di_id=ator_id, tipo_vinculo_id=1))
+        db.session.add(QuadroPsicopedagogico(ator_id=ator_id, parecer_psicologico_id=1))
+    db.session.commit()
+
+
+@pytest.fixture(scope='session')
+def app():
+    app = create_app()
+    with app.app_context():
+        _seed()
+    return app
+
+
+@pytest.fixture(scope='session')
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture(scope='session')
+def auth_headers(client):
+    resposta = client.post('/api/auth/login', json={'usuario': 'admin', 'senha': ADMIN_SENHA})
+    return {'Authorization': f"Bearer {resposta.get_json()['access_token']}"}
+
+
+@pytest.fixture
+def sql_statements(app):
+    # Comandos SQL enviados ao banco enquanto o teste roda
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', count)
+    yield statements
+    event.remove(engine, 'before_cursor_execute', count)
+
+
+@pytest.fixture
+def random_writes(app):
+    # Executa operações sorteadas pela sessão; cerca de 10% terminam em flush + rollback e as demais em commit,
+    # seguido de verificar(passo). Cada operação recebe (rng, passo).
+    def run(operacoes, verificar, passos=200, seed=0):
+        rng = random.Random(seed)
+        with app.app_context():
+            for passo in range(passos):
+                rng.choice(operacoes)(rng, passo)
+                if rng.random() < 0.1:
+                    db.session.flush()
+                    db.session.rollback()
+                else:
+                    db.session.commit()
+                    verificar(passo)
+    return run
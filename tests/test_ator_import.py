@@ -0,0 +1,53 @@
+import json
+
+from sqlalchemy import insert
+
+from app import db
+from app.models.ator_model import Ator
+
+from app.services.membership_index_service import membership_index
+
+
+def test_import_updates_membership_index(app, client, auth_headers):
+    with app.app_context():
+        # Índice já carregado antes da importação
+        assert 'Responsável Importada' not in [membro['nome'] for membro in membership_index.chat_members(2)]
+        membership_index.interacionais()
+
+    linha = {
+        'nome': 'Aluno Importado', 'email': 'importado@cognivox.test', 'usuario': 'importado', 'senha': 'segredo',
+        'data_nascimento': '2016-03-01', 'profissao_id': 1, 'unidade_id': 2, 'modalidade_ensino_id': 1, 'status': 1,
+        'grupo_usuario': 13, 'TIPO_VINCULO': 1, 'NOMER': 'Responsável Importada',
+        'EMAILR': 'responsavel.importada@cognivox.test', 'TELEFONECEL': '82999990000', 'LOGINR': 'resp.importada',
+        'SENHAR': 'segredo',
+    }
+    resposta = client.post(
+        '/api/ator/importacao', data=json.dumps(linha) + '\n', content_type='application/x-ndjson', headers=auth_headers
+    )
+    assert resposta.get_json()['importados'] == 1
+
+    with app.app_context():
+        assert 'Responsável Importada' in [membro['nome'] for membro in membership_index.chat_members(2)]
+        assert 'Responsável Importada' in [membro['nome'] for membro in membership_index.interacionais()]
+
+
+def test_invalidate_during_reload_forces_another_reload(app, monkeypatch):
+    carregar = membership_index.ator_repository.get_vinculo_rows
+
+    def importacao_durante_a_carga():
+        # Os atores já foram lidos quando a importação grava e invalida; só na primeira carga
+        rows = carregar()
+        monkeypatch.undo()
+        db.session.execute(insert(Ator), [{
+            'id': 2999, 'nome': 'Responsável Importada Durante a Carga', 'email': 'importada.carga@cognivox.test',
+            'profissao_id': 28, 'unidade_id': 2, 'status': 1,
+        }])
+        db.session.commit()
+        membership_index.invalidate()
+        return rows
+
+    monkeypatch.setattr(membership_index.ator_repository, 'get_vinculo_rows', importacao_durante_a_carga)
+    with app.app_context():
+        membership_index.invalidate()
+        membership_index.chat_members(2)
+        assert 'Responsável Importada Durante a Carga' in [membro['nome'] for membro in membership_index.chat_members(2)]
@@ -0,0 +1,36 @@
+from app import db
+from app.models.ator_model import Ator
+from app.repositories import versao_dados_repository
+from app.services.data_version_service import data_version
+
+
+def test_actor_write_changes_only_its_tokens(app):
+    with app.app_context():
+        antes = (data_version.atores_token([10]), data_version.atores_token([12]), data_version.unidades_token(1))
+        db.session.get(Ator, 10).telefone_cel = '82988887777'
+        db.session.commit()
+        depois = (data_version.atores_token([10]), data_version.atores_token([12]), data_version.unidades_token(1))
+
+    assert depois[0] != antes[0]
+    assert depois[1] == antes[1]
+    assert depois[2] != antes[2]
+
+
+def test_unsupported_dialect_skips_versions(app, monkeypatch):
+    monkeypatch.setattr(versao_dados_repository, '_UPSERTS', {})
+    monkeypatch.setattr(data_version, '_disponivel', {})
+    with app.app_context():
+        db.session.get(Ator, 12).telefone_cel = '82977776666'
+        db.session.commit()
+        assert db.session.get(Ator, 12).telefone_cel == '82977776666'
+        assert data_version.atores_token([12]) is None
+        assert data_version.unidades_token() is None
+
+
+def test_missing_table_skips_versions(app, monkeypatch):
+    monkeypatch.setattr(data_version.repository, 'table_exists', lambda session: False)
+    monkeypatch.setattr(data_version, '_disponivel', {})
+    with app.app_context():
+        db.session.get(Ator, 14).telefone_cel = '82966665555'
+        db.session.commit()
+        assert data_version.atores_token([14]) is None
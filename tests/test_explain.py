@@ -0,0 +1,12 @@
+import pytest
+
+from app import db
+from app.cli import EXPLAIN_CHECKS, explain_problems
+
+
+# Roda contra o SQLite dos testes, criado com os índices de __table_args__ dos models:
+# remover um índice usado por estas consultas faz o teste falhar
+@pytest.mark.parametrize('name, check', EXPLAIN_CHECKS, ids=[name for name, _ in EXPLAIN_CHECKS])
+def test_repository_queries_use_indexes(app, name, check):
+    with app.app_context(), db.engine.connect() as connection:
+        assert explain_problems(name, check, connection) == []
@@ -0,0 +1,27 @@
+import pytest
+
+
+@pytest.mark.parametrize('url', ['/api/ator/grid-filtro', '/api/ator/filtro-caderno-atividades'])
+def test_envelope_without_paging_params(client, auth_headers, url):
+    corpo = client.get(f'{url}?unidade_id=1&profissao_id=1', headers=auth_headers).get_json()
+    assert set(corpo) == {'items', 'page', 'size', 'total'}
+    assert (corpo['page'], corpo['size'], corpo['total']) == (1, 50, 5)
+    assert len(corpo['items']) == 5
+
+
+@pytest.mark.parametrize('url', ['/api/ator/grid-filtro', '/api/ator/filtro-caderno-atividades'])
+def test_envelope_page(client, auth_headers, url):
+    corpo = client.get(f'{url}?unidade_id=1&profissao_id=1&page=2&size=2&sort=-nome', headers=auth_headers).get_json()
+    assert (corpo['page'], corpo['size'], corpo['total']) == (2, 2, 5)
+    assert [item['id'] for item in corpo['items']] == [14, 12]
+
+
+def test_legacy_flag_returns_bare_list(client, auth_headers):
+    envelope = client.get('/api/ator/grid-filtro?unidade_id=1&profissao_id=1', headers=auth_headers).get_json()
+    lista = client.get('/api/ator/grid-filtro?unidade_id=1&profissao_id=1&legado=true', headers=auth_headers).get_json()
+    assert lista == envelope['items']
+
+
+def test_legacy_flag_rejects_paging(client, auth_headers):
+    resposta = client.get('/api/ator/grid-filtro?legado=true&page=1', headers=auth_headers)
+    assert resposta.status_code == 400
@@ -0,0 +1,100 @@
+from app import db
+from app.models.ator_model import Ator
+from app.models.ator_vinculo_model import AtorVinculo
+from app.services.membership_index_service import MembershipIndexService, membership_index
+
+# Atores do teste: ids de 1000 a 1999, nas unidades 3 e 4 (fora das usadas pelos demais testes)
+UNIDADES = (1, 2, 3, 4)
+NOMES = ('Ana', 'ana', 'Álvaro', 'Alvaro', 'Zé', 'Bruno', 'Érica')
+
+
+def _estado(indice):
+    return {unidade_id: indice.chat_members(unidade_id) for unidade_id in UNIDADES}, indice.interacionais()
+
+
+def _atores():
+    return Ator.query.filter(Ator.id.between(1000, 1999)).order_by(Ator.id).all()
+
+
+def _vinculos():
+    return AtorVinculo.query.filter(AtorVinculo.ator_di_id.between(1000, 1999)).order_by(AtorVinculo.id).all()
+
+
+def _novo_ator(rng, passo):
+    db.session.add(Ator(
+        id=1000 + passo, nome=rng.choice(NOMES), email=f'membro{passo}@cognivox.test',
+        profissao_id=rng.choice((1, 2, 3, 28, 100)), unidade_id=rng.choice((3, 4)), status=rng.choice((1, 1, 2))
+    ))
+
+
+def _altera_ator(rng, passo):
+    atores = _atores()
+    if not atores:
+        return _novo_ator(rng, passo)
+    ator = rng.choice(atores)
+    campo, valores = rng.choice((
+        ('nome', NOMES), ('profissao_id', (1, 2, 3, 4, 28, 100)), ('unidade_id', (3, 4)), ('status', (1, 2)),
+    ))
+    setattr(ator, campo, rng.choice(valores))
+
+
+def _exclui_ator(rng, passo):
+    # Os vínculos do ator ficam com ator_id nulo (relacionamento sem cascade)
+    atores = _atores()
+    if atores:
+        db.session.delete(rng.choice(atores))
+
+
+def _novo_vinculo(rng, passo):
+    atores = _atores()
+    if len(atores) < 2:
+        return _novo_ator(rng, passo)
+    responsavel, aluno = rng.sample(atores, 2)
+    db.session.add(AtorVinculo(ator_id=responsavel.id, ator_di_id=aluno.id, tipo_vinculo_id=1))
+
+
+def _move_vinculo(rng, passo):
+    vinculos, atores = _vinculos(), _atores()
+    if vinculos and atores:
+        rng.choice(vinculos).ator_id = rng.choice(atores).id
+
+
+def _exclui_vinculo(rng, passo):
+    vinculos = _vinculos()
+    if vinculos:
+        db.session.delete(rng.choice(vinculos))
+
+
+def test_incremental_index_matches_fresh_load(app, random_writes):
+    with app.app_context():
+        _estado(membership_index)
+
+    def verificar(passo):
+        assert _estado(membership_index) == _estado(MembershipIndexService()), f'passo {passo}'
+
+    random_writes(
+        (_novo_ator, _novo_ator, _altera_ator, _altera_ator, _exclui_ator, _novo_vinculo, _novo_vinculo,
+         _move_vinculo, _exclui_vinculo),
+        verificar, passos=300, seed=18
+    )
+
+
+def test_writes_committed_during_reload_are_replayed(app, monkeypatch):
+    carregar_vinculos = membership_index.ator_repository.get_vinculo_rows
+
+    def commit_durante_a_carga():
+        # Os atores já foram lidos: sem a reaplicação o responsável novo ficaria de fora até a próxima recarga
+        rows = carregar_vinculos()
+        db.session.add(Ator(
+            id=1999, nome='Responsável Durante a Carga', email='durante.carga@cognivox.test',
+            profissao_id=28, unidade_id=3, status=1
+        ))
+        db.session.commit()
+        return rows
+
+    monkeypatch.setattr(membership_index.ator_repository, 'get_vinculo_rows', commit_durante_a_carga)
+    with app.app_context():
+        membership_index.invalidate()
+        assert 'Responsável Durante a Carga' in [membro['nome'] for membro in membership_index.chat_members(3)]
+        monkeypatch.undo()
+        assert _estado(membership_index) == _estado(MembershipIndexService())
@@ -0,0 +1,35 @@
+import pytest
+
+from app.services.query_cache_service import query_cache
+
+
+def _statements(client, auth_headers, sql_statements, url):
+    # A primeira chamada aquece o grupo do usuário e os dados de referência; a contada sai sem cache de consultas
+    assert client.get(url, headers=auth_headers).status_code == 200
+    query_cache.invalidate()
+    sql_statements.clear()
+    resposta = client.get(url, headers=auth_headers)
+    assert resposta.status_code == 200
+    return resposta, len(sql_statements)
+
+
+@pytest.mark.parametrize('url', [
+    # ator e usuario num único SELECT (joinedload); os demais relacionamentos ficam em raiseload
+    '/api/ator/1',  # administrador do seed, que tem usuário
+    '/api/ator?limit=3',
+    '/api/ator/combo',
+    '/api/ator/combo-all',
+])
+def test_read_endpoints_issue_one_statement(client, auth_headers, sql_statements, url):
+    _, total = _statements(client, auth_headers, sql_statements, url)
+    assert total == 1
+
+
+def test_keyset_next_page_issues_one_statement(client, auth_headers, sql_statements):
+    resposta = client.get('/api/ator?limit=3', headers=auth_headers)
+    cursor = resposta.headers['X-Next-Cursor']
+
+    resposta, total = _statements(client, auth_headers, sql_statements, f'/api/ator?limit=3&after={cursor}')
+    assert total == 1
+    assert [ator['id'] for ator in resposta.get_json()] != [ator['id'] for ator in client.get(
+        '/api/ator?limit=3', headers=auth_headers).get_json()]
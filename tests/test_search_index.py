@@ -0,0 +1,95 @@
+import threading
+
+from app import db
+from app.models.ator_model import Ator
+from app.services import search_index_service
+from app.services.search_index_service import SearchIndexService, search_index
+
+# Atores do teste: ids de 3000 a 3999
+PALAVRAS = ('ana', 'Ana', 'joão', 'jose', 'Maria', 'anabel', 'silva', 'lima', 'ilana', 'São', 'Zé')
+TERMOS = ('a', 'an', 'ana', 'jo', 'jose', 'joao', 'il', 'lima', 'sao', 'ze', 'x.com', '@', '1', 'jo s', 'cognivox')
+
+
+def _nome(rng):
+    return ' '.join(rng.choice(PALAVRAS) for _ in range(rng.randint(1, 3)))
+
+
+def _email(rng, passo):
+    return f'{rng.choice(PALAVRAS).lower()}{passo}@busca{rng.randint(0, 9)}.x.com'
+
+
+def _estado(indice):
+    return {termo: indice.search(termo, 60) for termo in TERMOS}
+
+
+def _atores():
+    return Ator.query.filter(Ator.id.between(3000, 3999)).order_by(Ator.id).all()
+
+
+def _novo_ator(rng, passo):
+    db.session.add(Ator(
+        id=3000 + passo, nome=_nome(rng), email=_email(rng, passo), profissao_id=1, unidade_id=5,
+        status=rng.choice((1, 1, 2))
+    ))
+
+
+def _altera_ator(rng, passo):
+    atores = _atores()
+    if not atores:
+        return _novo_ator(rng, passo)
+    ator = rng.choice(atores)
+    campo = rng.choice(('nome', 'email', 'status'))
+    if campo == 'nome':
+        ator.nome = _nome(rng)
+    elif campo == 'email':
+        ator.email = _email(rng, passo)
+    else:
+        ator.status = rng.choice((1, 2))
+
+
+def _exclui_ator(rng, passo):
+    atores = _atores()
+    if atores:
+        db.session.delete(rng.choice(atores))
+
+
+def test_incremental_index_matches_fresh_load(app, random_writes, monkeypatch):
+    # Poucas escritas pendentes para que a remontagem dos textos de busca também aconteça durante o teste
+    monkeypatch.setattr(search_index_service, '_MAX_PENDENTES', 7)
+    with app.app_context():
+        _estado(search_index)
+
+    def verificar(passo):
+        assert _estado(search_index) == _estado(SearchIndexService()), f'passo {passo}'
+
+    random_writes(
+        (_novo_ator, _novo_ator, _altera_ator, _altera_ator, _altera_ator, _exclui_ator),
+        verificar, passos=300, seed=20
+    )
+
+
+def test_invalidate_reloads_on_next_search(app):
+    with app.app_context():
+        search_index.search('ana')
+        search_index.invalidate()
+        assert _estado(search_index) == _estado(SearchIndexService())
+
+
+def test_invalidate_during_search_waits_for_it(app, monkeypatch):
+    # Outra thread chama invalidate() logo depois da verificação de carga: ela precisa esperar a busca terminar
+    ensure_loaded = search_index._ensure_loaded
+    invalidacoes = []
+
+    def invalida_depois_da_carga():
+        ensure_loaded()
+        invalidacoes.append(threading.Thread(target=search_index.invalidate))
+        invalidacoes[-1].start()
+        invalidacoes[-1].join(0.2)
+
+    with app.app_context():
+        search_index.search('ana')
+        monkeypatch.setattr(search_index, '_ensure_loaded', invalida_depois_da_carga)
+        resultado = search_index.search('ana', 60)
+        monkeypatch.undo()
+        invalidacoes[0].join()
+        assert resultado == SearchIndexService().search('ana', 60)
@@ -0,0 +1,135 @@
+from sqlalchemy import insert
+
+from app import db
+from app.models.ator_model import Ator
+from app.models.quadro_psicopedagogico_model import QuadroPsicopedagogico
+from app.services.stats_service import AtorStatsService, ator_stats
+
+# Atores do teste: ids de 5000 a 5999
+PROFISSOES = (1, 2, 3, 4, None)
+UNIDADES = (1, 2, 5, None)
+MODALIDADES = (1, 2, None)
+PARECERES = (1, 2, None)
+
+
+def _estado(estatisticas):
+    resumo = estatisticas.summary()
+    resumo.pop('atualizado_em')
+    return resumo
+
+
+def _atores():
+    return Ator.query.filter(Ator.id.between(5000, 5999)).order_by(Ator.id).all()
+
+
+def _quadros():
+    return QuadroPsicopedagogico.query.filter(QuadroPsicopedagogico.ator_id.between(5000, 5999)).order_by(
+        QuadroPsicopedagogico.id
+    ).all()
+
+
+def _novo_ator(rng, passo):
+    ator_id = 5000 + passo
+    db.session.add(Ator(
+        id=ator_id, nome=f'Aluno Painel {passo}', email=f'painel{passo}@cognivox.test',
+        profissao_id=rng.choice(PROFISSOES), unidade_id=rng.choice(UNIDADES),
+        modalidade_ensino_id=rng.choice(MODALIDADES), status=rng.choice((1, 1, 2))
+    ))
+    if rng.random() < 0.5:
+        db.session.add(QuadroPsicopedagogico(ator_id=ator_id, parecer_psicologico_id=rng.choice(PARECERES)))
+
+
+def _altera_ator(rng, passo):
+    atores = _atores()
+    if not atores:
+        return _novo_ator(rng, passo)
+    campo, valores = rng.choice((
+        ('profissao_id', PROFISSOES), ('unidade_id', UNIDADES), ('modalidade_ensino_id', MODALIDADES),
+        ('status', (1, 2)),
+    ))
+    setattr(rng.choice(atores), campo, rng.choice(valores))
+
+
+def _exclui_ator(rng, passo):
+    # Os quadros do ator ficam com ator_id nulo (relacionamento sem cascade)
+    atores = _atores()
+    if atores:
+        db.session.delete(rng.choice(atores))
+
+
+def _novo_quadro(rng, passo):
+    atores = _atores()
+    if atores:
+        db.session.add(QuadroPsicopedagogico(ator_id=rng.choice(atores).id, parecer_psicologico_id=rng.choice(PARECERES)))
+
+
+def _altera_quadro(rng, passo):
+    quadros, atores = _quadros(), _atores()
+    if not quadros:
+        return _novo_quadro(rng, passo)
+    quadro = rng.choice(quadros)
+    if rng.random() < 0.5 or not atores:
+        quadro.parecer_psicologico_id = rng.choice(PARECERES)
+    else:
+        quadro.ator_id = rng.choice(atores).id
+
+
+def _exclui_quadro(rng, passo):
+    quadros = _quadros()
+    if quadros:
+        db.session.delete(rng.choice(quadros))
+
+
+def test_incremental_counters_match_fresh_load(app, random_writes):
+    with app.app_context():
+        _estado(ator_stats)
+
+    def verificar(passo):
+        assert _estado(ator_stats) == _estado(AtorStatsService()), f'passo {passo}'
+
+    random_writes(
+        (_novo_ator, _novo_ator, _altera_ator, _altera_ator, _exclui_ator, _novo_quadro, _novo_quadro,
+         _altera_quadro, _altera_quadro, _exclui_quadro),
+        verificar, passos=400, seed=24
+    )
+
+
+def test_writes_committed_during_reload_are_replayed(app, monkeypatch):
+    carregar = ator_stats.ator_repository.get_stats_rows
+
+    def commit_durante_a_carga():
+        rows = carregar()
+        db.session.add(Ator(
+            id=5998, nome='Aluno Durante a Carga', email='painel.carga@cognivox.test', profissao_id=1, unidade_id=5,
+            modalidade_ensino_id=1, status=1
+        ))
+        db.session.add(QuadroPsicopedagogico(ator_id=5998, parecer_psicologico_id=2))
+        db.session.commit()
+        return rows
+
+    monkeypatch.setattr(ator_stats.ator_repository, 'get_stats_rows', commit_durante_a_carga)
+    with app.app_context():
+        ator_stats.rebuild()
+        monkeypatch.undo()
+        assert _estado(ator_stats) == _estado(AtorStatsService())
+
+
+def test_invalidate_during_reload_forces_another_reload(app, monkeypatch):
+    carregar = ator_stats.ator_repository.get_stats_rows
+
+    def importacao_durante_a_carga():
+        # Como a importação em lote: insert sem eventos da sessão, seguido de invalidate(); só na primeira carga
+        rows = carregar()
+        monkeypatch.undo()
+        db.session.execute(insert(Ator), [{
+            'id': 5999, 'nome': 'Aluno Importado Durante a Carga', 'email': 'painel.importado@cognivox.test',
+            'profissao_id': 1, 'unidade_id': 5, 'status': 1,
+        }])
+        db.session.commit()
+        ator_stats.invalidate()
+        return rows
+
+    monkeypatch.setattr(ator_stats.ator_repository, 'get_stats_rows', importacao_durante_a_carga)
+    with app.app_context():
+        ator_stats.rebuild()
+        assert _estado(ator_stats) == _estado(AtorStatsService())